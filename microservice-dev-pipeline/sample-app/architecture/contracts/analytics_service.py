@@ -10,7 +10,7 @@ from typing import List
 
 from pydantic import BaseModel, Field
 
-from architecture.contracts.common import UrlAccessedEvent
+from architecture.contracts.common import UrlAccessCountedEvent, UrlAccessedEvent
 
 
 # --- Request/Response DTOs ---
@@ -57,8 +57,17 @@ class IAnalyticsService(ABC):
         """
         ...
 
+    @abstractmethod
+    async def handle_url_access_counted(self, event: UrlAccessCountedEvent) -> None:
+        """
+        Process a UrlAccessCountedEvent: add the window's count to the access counter for the URL.
+
+        Triggered by: UrlAccessCountedEvent from url-management (async, via message broker)
+        """
+        ...
+
 
 # --- Event Routing Declarations ---
 
 EVENTS_PUBLISHED = []
-EVENTS_CONSUMED = [UrlAccessedEvent]
+EVENTS_CONSUMED = [UrlAccessedEvent, UrlAccessCountedEvent]
@@ -6,6 +6,7 @@ They represent the asynchronous communication contracts between services.
 """
 
 from datetime import datetime
+from uuid import uuid4
 
 from pydantic import BaseModel, Field
 
@@ -19,9 +20,35 @@ class UrlAccessedEvent(BaseModel):
     Consumer: analytics
     """
 
+    event_id: str = Field(
+        default_factory=lambda: uuid4().hex,
+        description="Unique event ID, unchanged when the event is redelivered",
+    )
     short_code: str = Field(..., description="The short URL code that was accessed")
     long_url: str = Field(..., description="The original long URL that was resolved")
     accessed_at: datetime = Field(
         default_factory=datetime.utcnow,
         description="Timestamp when the URL was accessed",
     )
+
+
+class UrlAccessCountedEvent(BaseModel):
+    """
+    Event published by url-management with the number of times a short URL
+    was resolved during an aggregation window, instead of one
+    UrlAccessedEvent per redirect.
+    Consumed by analytics to add the count to the URL's access count.
+
+    Publisher: url-management
+    Consumer: analytics
+    """
+
+    event_id: str = Field(
+        default_factory=lambda: uuid4().hex,
+        description="Unique event ID, unchanged when the event is redelivered",
+    )
+    short_code: str = Field(..., description="The short URL code that was accessed")
+    long_url: str = Field(..., description="The original long URL that was resolved")
+    count: int = Field(..., ge=1, description="Number of accesses during the window")
+    window_start: datetime = Field(..., description="Timestamp of the first access counted")
+    window_end: datetime = Field(..., description="Timestamp when the window was closed")
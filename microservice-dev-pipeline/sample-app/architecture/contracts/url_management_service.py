@@ -6,10 +6,11 @@ and event routing declarations.
 """
 
 from abc import ABC, abstractmethod
+from typing import List, Literal
 
 from pydantic import BaseModel, Field
 
-from architecture.contracts.common import UrlAccessedEvent
+from architecture.contracts.common import UrlAccessCountedEvent, UrlAccessedEvent
 
 
 # --- Request/Response DTOs ---
@@ -35,6 +36,31 @@ class ResolveUrlResponse(BaseModel):
     long_url: str = Field(..., description="The original long URL to redirect to")
 
 
+class BatchShortenUrlRequest(BaseModel):
+    """Request to shorten several long URLs at once."""
+
+    long_urls: List[str] = Field(..., description="The original long URLs to shorten")
+
+
+class BatchShortenUrlItem(BaseModel):
+    """Result for one URL of a batch shorten request."""
+
+    short_code: str = Field(..., description="The generated short URL code")
+    short_url: str = Field(..., description="The full short URL")
+    long_url: str = Field(..., description="The original long URL")
+    status: Literal["created", "existing"] = Field(
+        ..., description="Whether the mapping was created by this request or already existed"
+    )
+
+
+class BatchShortenUrlResponse(BaseModel):
+    """Response containing one result per requested URL, in request order."""
+
+    results: List[BatchShortenUrlItem] = Field(
+        ..., description="Shortened URLs in the same order as the request"
+    )
+
+
 # --- Service Interface ABC ---
 
 
@@ -52,6 +78,20 @@ class IUrlManagementService(ABC):
         """
         ...
 
+    @abstractmethod
+    async def shorten_urls_batch(
+        self, request: BatchShortenUrlRequest
+    ) -> BatchShortenUrlResponse:
+        """
+        Shorten several long URLs at once. Idempotent per URL, like shorten_url.
+        All URLs are validated before any is stored.
+
+        Endpoint: POST /api/v1/urls:batch
+        HTTP Status: 200 OK
+        Raises: InvalidUrlError if any URL is invalid
+        """
+        ...
+
     @abstractmethod
     async def resolve_url(self, short_code: str) -> ResolveUrlResponse:
         """
@@ -66,5 +106,5 @@ class IUrlManagementService(ABC):
 
 # --- Event Routing Declarations ---
 
-EVENTS_PUBLISHED = [UrlAccessedEvent]
+EVENTS_PUBLISHED = [UrlAccessedEvent, UrlAccessCountedEvent]
 EVENTS_CONSUMED = []
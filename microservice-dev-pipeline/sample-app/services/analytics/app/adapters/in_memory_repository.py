@@ -17,9 +17,10 @@ class InMemoryAnalyticsRepository(IAnalyticsRepository):
     def __init__(self) -> None:
         self._store: Dict[str, Dict] = {}
         self._id_counter: int = 0
+        self._processed: Dict[str, datetime] = {}
 
     async def increment_access_count(
-        self, short_code: str, long_url: str
+        self, short_code: str, long_url: str, count: int = 1
     ) -> UrlAccessStats:
         """
         Increment access count for a URL in memory.
@@ -27,6 +28,7 @@ class InMemoryAnalyticsRepository(IAnalyticsRepository):
         Args:
             short_code: The short URL code.
             long_url: The original long URL.
+            count: Number of accesses to add.
 
         Returns:
             The updated or newly created UrlAccessStats record.
@@ -34,7 +36,7 @@ class InMemoryAnalyticsRepository(IAnalyticsRepository):
         now = datetime.now(timezone.utc)
 
         if short_code in self._store:
-            self._store[short_code]["access_count"] += 1
+            self._store[short_code]["access_count"] += count
             self._store[short_code]["last_accessed_at"] = now
         else:
             self._id_counter += 1
@@ -42,7 +44,7 @@ class InMemoryAnalyticsRepository(IAnalyticsRepository):
                 "id": self._id_counter,
                 "short_code": short_code,
                 "long_url": long_url,
-                "access_count": 1,
+                "access_count": count,
                 "last_accessed_at": now,
             }
 
@@ -55,6 +57,36 @@ class InMemoryAnalyticsRepository(IAnalyticsRepository):
         stats.last_accessed_at = data["last_accessed_at"]
         return stats
 
+    async def mark_processed(self, event_id: str) -> bool:
+        """
+        Record the event ID in memory unless it is already recorded.
+
+        Args:
+            event_id: The ID of the consumed event.
+
+        Returns:
+            False if the event was already processed, True otherwise.
+        """
+        if event_id in self._processed:
+            return False
+        self._processed[event_id] = datetime.now(timezone.utc)
+        return True
+
+    async def prune_processed(self, older_than: datetime) -> int:
+        """
+        Forget processed event IDs recorded before the given time.
+
+        Args:
+            older_than: Records older than this are deleted.
+
+        Returns:
+            The number of records deleted.
+        """
+        expired = [event_id for event_id, at in self._processed.items() if at < older_than]
+        for event_id in expired:
+            del self._processed[event_id]
+        return len(expired)
+
     async def get_top_urls(self, limit: int) -> List[UrlAccessStats]:
         """
         Return the most accessed URLs ordered by access count descending.
@@ -0,0 +1,112 @@
+"""
+Connection pool instrumentation.
+
+SQLAlchemy pools report how many connections are checked out or idle, but
+not how long requests wait for one. The instrumented pool times every
+checkout and counts the callers currently waiting, so pool exhaustion under
+bursts shows up as rising acquire latency and waiting counts instead of
+silently queued requests.
+"""
+
+import time
+from collections import deque
+from typing import Deque, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, PoolProxiedConnection
+
+# Number of recent acquire latencies kept for the percentiles
+LATENCY_WINDOW = 1024
+
+
+class PoolMetrics:
+    """Checkout counters and recent acquire latencies of one connection pool."""
+
+    def __init__(self) -> None:
+        self.waiting = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.acquire_seconds_total = 0.0
+        self.acquire_seconds_max = 0.0
+        self._recent: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, seconds: float) -> None:
+        """Record one successful checkout."""
+        self.acquired += 1
+        self.acquire_seconds_total += seconds
+        self.acquire_seconds_max = max(self.acquire_seconds_max, seconds)
+        self._recent.append(seconds)
+
+    def percentile(self, fraction: float) -> float:
+        """Return a percentile of the recent acquire latencies in seconds."""
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class PoolInstrumentation:
+    """
+    Mixin for QueuePool subclasses that times checkouts into a PoolMetrics.
+
+    The timing covers everything a caller waits for: queueing for a free
+    connection, opening a new one and the pre-ping, if enabled.
+    """
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self) -> PoolProxiedConnection:
+        self.metrics.waiting += 1
+        started = time.perf_counter()
+        try:
+            connection = super().connect()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.waiting -= 1
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+    def recreate(self) -> Pool:
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedAsyncAdaptedQueuePool(PoolInstrumentation, AsyncAdaptedQueuePool):
+    """The asyncio queue pool used by create_async_engine, with checkout metrics."""
+
+
+def pool_stats(pool: Pool) -> Dict[str, object]:
+    """Return a snapshot of a QueuePool's occupancy and, if instrumented, its acquire metrics."""
+    stats: Dict[str, object] = {
+        "size": pool.size(),  # type: ignore[attr-defined]
+        "checked_out": pool.checkedout(),  # type: ignore[attr-defined]
+        "idle": pool.checkedin(),  # type: ignore[attr-defined]
+        "overflow": pool.overflow(),  # type: ignore[attr-defined]
+    }
+    metrics = getattr(pool, "metrics", None)
+    if isinstance(metrics, PoolMetrics):
+        stats.update(
+            {
+                "waiting": metrics.waiting,
+                "acquired": metrics.acquired,
+                "timeouts": metrics.timeouts,
+                "acquire_seconds_total": metrics.acquire_seconds_total,
+                "acquire_seconds_max": metrics.acquire_seconds_max,
+                "acquire_seconds_p50": metrics.percentile(0.50),
+                "acquire_seconds_p99": metrics.percentile(0.99),
+            }
+        )
+    return stats
+
+
+def engine_pool_stats(engine: AsyncEngine) -> Dict[str, object]:
+    """Return pool_stats() for the pool currently used by an async engine."""
+    return pool_stats(engine.sync_engine.pool)
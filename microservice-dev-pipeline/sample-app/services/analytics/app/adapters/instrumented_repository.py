@@ -0,0 +1,68 @@
+"""
+Timing decorator for the analytics repository port.
+
+Records the duration of every repository call, and counts the calls that
+raise, in the repository metrics. The labelled metric children are
+resolved once at import, so a call costs two clock reads and a histogram
+observation.
+"""
+
+import time
+from datetime import datetime
+from typing import Awaitable, Dict, List, Tuple, TypeVar
+
+from app.metrics import CounterChild, HistogramChild, repository_call_duration, repository_call_errors
+from app.models.url_access_stats import UrlAccessStats
+from app.ports.repository import IAnalyticsRepository
+
+T = TypeVar("T")
+
+_OPERATIONS = ("increment_access_count", "mark_processed", "prune_processed", "get_top_urls", "commit")
+_METRICS: Dict[str, Tuple[HistogramChild, CounterChild]] = {
+    operation: (repository_call_duration.labels(operation), repository_call_errors.labels(operation))
+    for operation in _OPERATIONS
+}
+
+
+async def _timed(operation: str, call: Awaitable[T]) -> T:
+    """Await a repository call, recording its duration and any error."""
+    duration, errors = _METRICS[operation]
+    started = time.perf_counter()
+    try:
+        return await call
+    except Exception:
+        errors.inc()
+        raise
+    finally:
+        duration.observe(time.perf_counter() - started)
+
+
+class InstrumentedAnalyticsRepository(IAnalyticsRepository):
+    """IAnalyticsRepository decorator that times every call to the wrapped repository."""
+
+    def __init__(self, inner: IAnalyticsRepository):
+        self._inner = inner
+
+    async def increment_access_count(
+        self, short_code: str, long_url: str, count: int = 1
+    ) -> UrlAccessStats:
+        """Delegate to the wrapped repository, timing the call."""
+        return await _timed(
+            "increment_access_count", self._inner.increment_access_count(short_code, long_url, count)
+        )
+
+    async def mark_processed(self, event_id: str) -> bool:
+        """Delegate to the wrapped repository, timing the call."""
+        return await _timed("mark_processed", self._inner.mark_processed(event_id))
+
+    async def prune_processed(self, older_than: datetime) -> int:
+        """Delegate to the wrapped repository, timing the call."""
+        return await _timed("prune_processed", self._inner.prune_processed(older_than))
+
+    async def get_top_urls(self, limit: int) -> List[UrlAccessStats]:
+        """Delegate to the wrapped repository, timing the call."""
+        return await _timed("get_top_urls", self._inner.get_top_urls(limit))
+
+    async def commit(self) -> None:
+        """Delegate to the wrapped repository, timing the call."""
+        await _timed("commit", self._inner.commit())
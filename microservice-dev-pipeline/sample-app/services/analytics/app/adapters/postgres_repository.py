@@ -8,9 +8,11 @@ import logging
 from datetime import datetime, timezone
 from typing import List
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.processed_event import ProcessedEvent
 from app.models.url_access_stats import UrlAccessStats
 from app.ports.repository import IAnalyticsRepository
 
@@ -24,7 +26,7 @@ class PostgresAnalyticsRepository(IAnalyticsRepository):
         self._session = session
 
     async def increment_access_count(
-        self, short_code: str, long_url: str
+        self, short_code: str, long_url: str, count: int = 1
     ) -> UrlAccessStats:
         """
         Increment access count for a URL, creating a new record if it does not exist.
@@ -32,6 +34,7 @@ class PostgresAnalyticsRepository(IAnalyticsRepository):
         Args:
             short_code: The short URL code.
             long_url: The original long URL.
+            count: Number of accesses to add.
 
         Returns:
             The updated or newly created UrlAccessStats record.
@@ -43,7 +46,7 @@ class PostgresAnalyticsRepository(IAnalyticsRepository):
         stats = result.scalar_one_or_none()
 
         if stats is not None:
-            stats.access_count += 1
+            stats.access_count += count
             stats.last_accessed_at = datetime.now(timezone.utc)
             logger.info(
                 "Incremented access count",
@@ -56,7 +59,7 @@ class PostgresAnalyticsRepository(IAnalyticsRepository):
             stats = UrlAccessStats(
                 short_code=short_code,
                 long_url=long_url,
-                access_count=1,
+                access_count=count,
                 last_accessed_at=datetime.now(timezone.utc),
             )
             self._session.add(stats)
@@ -67,6 +70,43 @@ class PostgresAnalyticsRepository(IAnalyticsRepository):
 
         return stats
 
+    async def mark_processed(self, event_id: str) -> bool:
+        """
+        Insert the event ID unless it is already recorded.
+
+        A concurrent delivery of the same event waits on the unique key until
+        the first one commits, then finds it recorded.
+
+        Args:
+            event_id: The ID of the consumed event.
+
+        Returns:
+            False if the event was already processed, True otherwise.
+        """
+        stmt = (
+            insert(ProcessedEvent)
+            .values(event_id=event_id, processed_at=datetime.now(timezone.utc))
+            .on_conflict_do_nothing(index_elements=[ProcessedEvent.event_id])
+            .returning(ProcessedEvent.event_id)
+        )
+        result = await self._session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+    async def prune_processed(self, older_than: datetime) -> int:
+        """
+        Delete processed event IDs recorded before the given time.
+
+        Args:
+            older_than: Records older than this are deleted.
+
+        Returns:
+            The number of records deleted.
+        """
+        result = await self._session.execute(
+            delete(ProcessedEvent).where(ProcessedEvent.processed_at < older_than)
+        )
+        return result.rowcount
+
     async def get_top_urls(self, limit: int) -> List[UrlAccessStats]:
         """
         Return the most accessed URLs ordered by access count descending.
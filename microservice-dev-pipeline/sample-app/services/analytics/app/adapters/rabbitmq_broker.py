@@ -1,26 +1,43 @@
 """
 RabbitMQ adapter for the message broker port.
 
-Implements the consumer pattern for subscribing to events.
+Implements the consumer pattern for subscribing to events. Trace context
+propagated in the message headers is continued: the time a message spent
+in the queue is recorded as a span, and handling it runs in a child span
+of the publisher's span.
 """
 
 import json
 import logging
-from typing import Callable, Type
+import time
+from typing import Callable, Optional, Type
 
 import aio_pika
 from pydantic import BaseModel
 
+from app.metrics import broker_consume_duration, events_processed
 from app.ports.message_broker import IMessageBroker
+from app.tracing import parse_traceparent, tracer
 
 logger = logging.getLogger(__name__)
 
 # Map event class names to routing keys
 ROUTING_KEY_MAP = {
     "UrlAccessedEvent": "url.accessed",
+    "UrlAccessCountedEvent": "url.access_counted",
 }
 
 
+def _header_timestamp(value: object) -> Optional[float]:
+    """Return the epoch timestamp carried in a message header, if it is valid."""
+    if isinstance(value, bytes):
+        value = value.decode("latin-1")
+    try:
+        return float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
 class RabbitMQBroker(IMessageBroker):
     """RabbitMQ implementation of the message broker for event consumption."""
 
@@ -68,11 +85,24 @@ class RabbitMQBroker(IMessageBroker):
         )
         await queue.bind(exchange, routing_key=routing_key)
 
+        consume_duration = broker_consume_duration.labels(event_type.__name__)
+        processed = events_processed.labels(event_type.__name__, "success")
+        failed = events_processed.labels(event_type.__name__, "error")
+
         async def on_message(message: aio_pika.IncomingMessage) -> None:
             async with message.process():
+                started = time.perf_counter()
+                headers = message.headers or {}
+                parent = parse_traceparent(headers.get("traceparent"))
+                span_attributes = {"event_type": event_type.__name__, "queue": queue_name}
+                published_at = _header_timestamp(headers.get("x-published-at"))
+                if published_at is not None:
+                    tracer.record_span("queue_wait", published_at, time.time(), parent, span_attributes)
                 try:
-                    event = event_type(**json.loads(message.body.decode()))
-                    await handler(event)
+                    with tracer.start_span("handle", parent, span_attributes):
+                        event = event_type(**json.loads(message.body.decode()))
+                        await handler(event)
+                    processed.inc()
                     logger.info(
                         "Processed event",
                         extra={
@@ -81,6 +111,7 @@ class RabbitMQBroker(IMessageBroker):
                         },
                     )
                 except Exception as e:
+                    failed.inc()
                     logger.error(
                         f"Error processing event: {e}",
                         exc_info=True,
@@ -89,6 +120,8 @@ class RabbitMQBroker(IMessageBroker):
                             "queue": queue_name,
                         },
                     )
+                finally:
+                    consume_duration.observe(time.perf_counter() - started)
 
         await queue.consume(on_message)
         logger.info(
@@ -0,0 +1,57 @@
+"""
+Request latency metrics middleware.
+
+Times every HTTP request from the moment it reaches the application until
+its response has been sent, and records it in the request duration
+histogram under its route template rather than its concrete path, so
+that path parameters do not explode the label space.
+"""
+
+import time
+from typing import Callable, Dict, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import http_request_duration
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware that records request latency per method, route and status."""
+
+    def __init__(self, app: ASGIApp):
+        self._app = app
+        self._route_paths: Optional[Dict[Callable, str]] = None
+
+    def _route(self, scope: Scope) -> str:
+        """Return the template of the route a request was served by."""
+        if self._route_paths is None:
+            self._route_paths = {
+                route.endpoint: route.path for route in scope["app"].routes if hasattr(route, "endpoint")
+            }
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        return self._route_paths.get(endpoint, UNMATCHED_ROUTE)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self._app(scope, receive, send_with_status)
+        finally:
+            http_request_duration.labels(scope["method"], self._route(scope), str(status)).observe(
+                time.perf_counter() - started
+            )
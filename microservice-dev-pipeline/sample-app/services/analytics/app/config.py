@@ -4,6 +4,8 @@ Configuration settings for the analytics service.
 Uses pydantic-settings for environment-aware configuration.
 """
 
+from typing import Dict, Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -15,6 +17,34 @@ class Settings(BaseSettings):
     rabbitmq_exchange: str = "url_shortener"
     service_name: str = "analytics"
 
+    # Database connection pool
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout_seconds: float = 30.0
+    database_pool_recycle_seconds: int = -1
+    database_pool_pre_ping: bool = False
+    database_statement_cache_size: int = 100
+
+    # Logging: records are formatted and written by a background thread;
+    # sample rates (JSON, by logger name) thin out high-volume info logs
+    log_level: str = "INFO"
+    log_format: Literal["json", "text"] = "json"
+    log_sample_rates: Dict[str, float] = {}
+    log_queue_max_size: int = 10_000
+
+    # Tracing: spans are appended as JSON lines to the export path (unset
+    # disables tracing); the sample rate applies to traces started here
+    tracing_export_path: Optional[str] = None
+    tracing_sample_rate: float = 1.0
+
+    # Deduplication: IDs of counted events are kept this long so that
+    # redeliveries are not counted twice, and pruned at this interval.
+    # Redeliveries follow within seconds to minutes (confirm retries,
+    # requeues, replays right after an outage), so an hour covers them
+    # while keeping the table to an hour of events
+    event_dedup_retention_seconds: float = 3600.0
+    event_dedup_prune_interval_seconds: float = 300.0
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
@@ -4,7 +4,7 @@ Dependency injection wiring for the analytics service.
 Provides FastAPI Depends callables for injecting service dependencies.
 """
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict
 
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -13,15 +13,32 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from app.config import settings
+from app.adapters.instrumented_repository import InstrumentedAnalyticsRepository
+from app.adapters.instrumented_pool import InstrumentedAsyncAdaptedQueuePool, engine_pool_stats
 from app.adapters.postgres_repository import PostgresAnalyticsRepository
 from app.services.analytics_service import AnalyticsService
 
-engine = create_async_engine(settings.database_url, echo=False)
+engine = create_async_engine(
+    settings.database_url,
+    echo=False,
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    pool_timeout=settings.database_pool_timeout_seconds,
+    pool_recycle=settings.database_pool_recycle_seconds,
+    pool_pre_ping=settings.database_pool_pre_ping,
+    connect_args={"prepared_statement_cache_size": settings.database_statement_cache_size},
+)
 async_session_factory = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
 
+def get_pool_stats() -> Dict[str, Dict[str, object]]:
+    """Report the connection pool metrics of the database engine."""
+    return {"primary": engine_pool_stats(engine)}
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Provide a database session with automatic cleanup."""
     async with async_session_factory() as session:
@@ -38,5 +55,5 @@ async def get_repository(
 async def get_analytics_service() -> AsyncGenerator[AnalyticsService, None]:
     """Provide an analytics service instance with injected dependencies."""
     async with async_session_factory() as session:
-        repository = PostgresAnalyticsRepository(session)
+        repository = InstrumentedAnalyticsRepository(PostgresAnalyticsRepository(session))
         yield AnalyticsService(repository=repository)
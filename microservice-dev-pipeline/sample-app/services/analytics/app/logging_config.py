@@ -0,0 +1,140 @@
+"""
+Non-blocking, sampled, structured logging for the analytics service.
+
+Log calls on the event consumer and request paths only create a LogRecord and put it on an
+in-memory queue; a QueueListener thread formats the records as JSON and
+writes them, so neither formatting nor I/O runs on the event loop. When
+the queue is full, records are dropped and counted rather than blocking.
+
+High-volume info logs can be sampled per logger: a rate of 0.01 for
+"app.adapters.rabbitmq_broker" keeps about one in a hundred of its records
+at INFO and below. Warnings and errors are never sampled.
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Mapping, Optional
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line, including its `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, object] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a configured fraction of the INFO and lower records of selected loggers.
+
+    The rate of the most specific configured logger name applies, so a rate
+    for "app.adapters" also covers "app.adapters.rabbitmq_broker".
+    """
+
+    def __init__(self, rates: Mapping[str, float]):
+        super().__init__()
+        for name, rate in rates.items():
+            if not 0 <= rate <= 1:
+                raise ValueError(f"Log sample rate for {name!r} must be between 0 and 1")
+        self._rates = dict(rates)
+        self._resolved: Dict[str, Optional[float]] = {}
+        self.sampled_out = 0
+
+    def _rate(self, name: str) -> Optional[float]:
+        if name not in self._resolved:
+            candidate: Optional[str] = name
+            while candidate and candidate not in self._rates:
+                candidate = candidate.rpartition(".")[0]
+            self._resolved[name] = self._rates.get(candidate) if candidate else None
+        return self._resolved[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        rate = self._rate(record.name)
+        if rate is None or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves all formatting to the listener thread.
+
+    The standard handler renders the message on the calling thread; this one
+    enqueues the record untouched, so message arguments are formatted later
+    and must not be mutated after the log call. Records that do not fit in
+    the queue are dropped.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(
+    level: str = "INFO",
+    json_format: bool = True,
+    sample_rates: Optional[Mapping[str, float]] = None,
+    queue_max_size: int = 10_000,
+) -> logging.handlers.QueueListener:
+    """
+    Route all application logging through a queue to a background writer thread.
+
+    Args:
+        level: Minimum level of the root logger.
+        json_format: Write JSON lines if True, plain text otherwise.
+        sample_rates: Fraction of INFO and lower records kept, by logger name.
+        queue_max_size: Records buffered before new ones are dropped.
+
+    Returns:
+        The started listener; stop it on shutdown to flush the queue.
+    """
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(
+        JsonFormatter() if json_format else logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+    )
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_max_size)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -4,32 +4,65 @@ FastAPI application entry point for the analytics service.
 Configures the application, exception handlers, and lifespan events.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
-from architecture.contracts.common import UrlAccessedEvent
+from architecture.contracts.common import UrlAccessCountedEvent, UrlAccessedEvent
+from app.adapters.instrumented_repository import InstrumentedAnalyticsRepository
 from app.adapters.postgres_repository import PostgresAnalyticsRepository
 from app.adapters.rabbitmq_broker import RabbitMQBroker
+from app.api.metrics_middleware import MetricsMiddleware
 from app.api.stats import router as stats_router
 from app.config import settings
-from app.dependencies import async_session_factory, engine
+from app.dependencies import async_session_factory, engine, get_pool_stats
 from app.exceptions.analytics_exceptions import InvalidLimitError
+from app.logging_config import configure_logging
+from app.metrics import CONTENT_TYPE, registry
 from app.models.url_access_stats import Base
 from app.services.analytics_service import AnalyticsService
+from app.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
 
+async def prune_processed_events() -> None:
+    """Background loop: delete processed event IDs older than the retention."""
+    retention = timedelta(seconds=settings.event_dedup_retention_seconds)
+    while True:
+        try:
+            async with async_session_factory() as session:
+                repository = InstrumentedAnalyticsRepository(PostgresAnalyticsRepository(session))
+                pruned = await repository.prune_processed(datetime.now(timezone.utc) - retention)
+                await repository.commit()
+            logger.info("Pruned processed event IDs", extra={"count": pruned})
+        except Exception as e:
+            logger.warning("Failed to prune processed event IDs", extra={"error": str(e)})
+        await asyncio.sleep(settings.event_dedup_prune_interval_seconds)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Application lifespan handler.
 
-    Connects to RabbitMQ and subscribes to UrlAccessedEvent on startup.
+    Connects to RabbitMQ and subscribes to UrlAccessedEvent and
+    UrlAccessCountedEvent on startup. IDs of processed events older than the
+    deduplication retention are pruned in the background.
+    Logging and, when configured, span export are handed to background
+    writer threads for the lifetime of the application.
     """
+    log_listener = configure_logging(
+        level=settings.log_level,
+        json_format=settings.log_format == "json",
+        sample_rates=settings.log_sample_rates,
+        queue_max_size=settings.log_queue_max_size,
+    )
+    tracer.configure(settings.service_name, settings.tracing_export_path, settings.tracing_sample_rate)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created")
@@ -46,11 +79,19 @@ async def lifespan(app: FastAPI):
         async def handle_event(event: UrlAccessedEvent) -> None:
             """Handle incoming URL accessed events with a fresh session."""
             async with async_session_factory() as session:
-                repository = PostgresAnalyticsRepository(session)
+                repository = InstrumentedAnalyticsRepository(PostgresAnalyticsRepository(session))
                 service = AnalyticsService(repository=repository)
                 await service.handle_url_accessed(event)
 
+        async def handle_counted_event(event: UrlAccessCountedEvent) -> None:
+            """Handle incoming aggregated URL access events with a fresh session."""
+            async with async_session_factory() as session:
+                repository = InstrumentedAnalyticsRepository(PostgresAnalyticsRepository(session))
+                service = AnalyticsService(repository=repository)
+                await service.handle_url_access_counted(event)
+
         await broker.subscribe(UrlAccessedEvent, handle_event)
+        await broker.subscribe(UrlAccessCountedEvent, handle_counted_event)
         logger.info("Analytics service started, listening for events")
     except Exception as e:
         logger.warning(
@@ -59,9 +100,18 @@ async def lifespan(app: FastAPI):
             extra={"error": str(e)},
         )
 
+    pruning = asyncio.create_task(prune_processed_events())
+
     yield
 
     logger.info("Analytics service shutting down")
+    pruning.cancel()
+    try:
+        await pruning
+    except asyncio.CancelledError:
+        pass
+    tracer.shutdown()
+    log_listener.stop()
 
 
 app = FastAPI(
@@ -71,6 +121,8 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(stats_router)
 
 
@@ -80,6 +132,18 @@ async def health() -> dict:
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def metrics() -> Response:
+    """Expose request, repository and event consumption metrics in Prometheus text format."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/internal/pools")
+async def pool_stats() -> dict:
+    """Report checked-out, idle and waiting connections and acquire latency per pool."""
+    return get_pool_stats()
+
+
 @app.exception_handler(InvalidLimitError)
 async def invalid_limit_error_handler(
     request: Request, exc: InvalidLimitError
@@ -0,0 +1,224 @@
+"""
+Runtime metrics for the analytics service, in Prometheus text format.
+
+Recording is meant to stay on at full event rate, so the primitives are
+deliberately minimal: a labelled child is looked up once per label set and
+cached, counters are plain integers, and histograms keep a preallocated
+list of bucket counts that an observation increments after one bisect.
+All recording happens on the event loop thread, so no locks are needed;
+cumulative bucket counts are only computed when /metrics is scraped.
+"""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Dict, Generic, List, Sequence, Tuple, TypeVar
+
+# Upper bounds in seconds, from sub-millisecond cache hits to slow requests
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+C = TypeVar("C")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC, Generic[C]):
+    """Named metric family with one child per label value combination."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._children: Dict[Tuple[str, ...], C] = {}
+
+    def labels(self, *values: str) -> C:
+        """Return the child for a label value combination, creating it on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self) -> C:
+        """Create the child holding the value of one label set."""
+        ...
+
+    @abstractmethod
+    def _samples(self, values: Tuple[str, ...], child: C) -> List[str]:
+        """Render the sample lines of one child in the text exposition format."""
+        ...
+
+    def render(self) -> List[str]:
+        """Return the exposition lines of this metric family."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            lines.extend(self._samples(values, child))
+        return lines
+
+
+class CounterChild:
+    """Monotonic counter of one label set."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        """Add to the counter."""
+        self.value += amount
+
+
+class Counter(_Metric[CounterChild]):
+    """Counter metric family."""
+
+    kind = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def _samples(self, values: Tuple[str, ...], child: CounterChild) -> List[str]:
+        return [f"{self.name}_total{_format_labels(self.label_names, values)} {child.value}"]
+
+
+class HistogramChild:
+    """Bucketed distribution of observations of one label set."""
+
+    __slots__ = ("upper_bounds", "bucket_counts", "sum", "count")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.bucket_counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.bucket_counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric[HistogramChild]):
+    """Histogram metric family with fixed bucket upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self._upper_bounds = tuple(sorted(buckets))
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self._upper_bounds)
+
+    def _samples(self, values: Tuple[str, ...], child: HistogramChild) -> List[str]:
+        names = self.label_names + ("le",)
+        lines = []
+        cumulative = 0
+        for upper_bound, bucket_count in zip(self._upper_bounds + (float("inf"),), child.bucket_counts):
+            cumulative += bucket_count
+            labels = _format_labels(names, values + (_format_value(upper_bound),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.label_names, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        metric = Counter(name, documentation, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        metric = Histogram(name, documentation, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to serve an HTTP request, by method, route template and status code.",
+    ("method", "route", "status"),
+)
+repository_call_duration = registry.histogram(
+    "repository_call_duration_seconds",
+    "Time spent in analytics repository calls, by operation.",
+    ("operation",),
+)
+repository_call_errors = registry.counter(
+    "repository_call_errors",
+    "Analytics repository calls that raised, by operation.",
+    ("operation",),
+)
+broker_consume_duration = registry.histogram(
+    "broker_consume_duration_seconds",
+    "Time to decode and handle a consumed event, by event type.",
+    ("event_type",),
+)
+events_processed = registry.counter(
+    "events_processed",
+    "Consumed events, by event type and outcome (success or error).",
+    ("event_type", "outcome"),
+)
+events_deduplicated = registry.counter(
+    "events_deduplicated",
+    "Redelivered events skipped because they were already counted, by event type.",
+    ("event_type",),
+)
+event_freshness_lag = registry.histogram(
+    "event_freshness_lag_seconds",
+    "Time from a URL access to its counter update being committed, by event type.",
+    ("event_type",),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
@@ -0,0 +1,26 @@
+"""
+SQLAlchemy model for processed event IDs.
+
+Records the ID of every event whose counts have been committed, so that a
+redelivered event is recognized and not counted again.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, String, TIMESTAMP
+
+from app.models.url_access_stats import Base
+
+
+class ProcessedEvent(Base):
+    """ID of an event already applied to the access statistics."""
+
+    __tablename__ = "processed_events"
+
+    event_id = Column(String, primary_key=True)
+    processed_at = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        index=True,
+        default=lambda: datetime.now(timezone.utc),
+    )
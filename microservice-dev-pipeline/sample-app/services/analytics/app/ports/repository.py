@@ -5,6 +5,7 @@ Defines the abstract interface for accessing URL access statistics.
 """
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List
 
 from app.models.url_access_stats import UrlAccessStats
@@ -15,23 +16,50 @@ class IAnalyticsRepository(ABC):
 
     @abstractmethod
     async def increment_access_count(
-        self, short_code: str, long_url: str
+        self, short_code: str, long_url: str, count: int = 1
     ) -> UrlAccessStats:
         """
         Increment the access count for a URL.
 
-        If the short_code does not exist, create a new record with count=1.
-        If it exists, increment the existing count.
+        If the short_code does not exist, create a new record with the count.
+        If it exists, add the count to the existing count.
 
         Args:
             short_code: The short URL code.
             long_url: The original long URL.
+            count: Number of accesses to add.
 
         Returns:
             The updated or created UrlAccessStats record.
         """
         ...
 
+    @abstractmethod
+    async def mark_processed(self, event_id: str) -> bool:
+        """
+        Record that an event is applied in the current transaction.
+
+        Args:
+            event_id: The ID of the consumed event.
+
+        Returns:
+            False if the event was already processed, True otherwise.
+        """
+        ...
+
+    @abstractmethod
+    async def prune_processed(self, older_than: datetime) -> int:
+        """
+        Forget processed event IDs recorded before the given time.
+
+        Args:
+            older_than: Records older than this are deleted.
+
+        Returns:
+            The number of records deleted.
+        """
+        ...
+
     @abstractmethod
     async def get_top_urls(self, limit: int) -> List[UrlAccessStats]:
         """
@@ -6,15 +6,19 @@ Implements URL access tracking and statistics retrieval.
 """
 
 import logging
+from datetime import datetime, timezone
+from typing import Union
 
 from architecture.contracts.analytics_service import (
     IAnalyticsService,
     TopUrlsResponse,
     UrlAccessStatsResponse,
 )
-from architecture.contracts.common import UrlAccessedEvent
+from architecture.contracts.common import UrlAccessCountedEvent, UrlAccessedEvent
 from app.exceptions.analytics_exceptions import InvalidLimitError
+from app.metrics import event_freshness_lag, events_deduplicated
 from app.ports.repository import IAnalyticsRepository
+from app.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -60,17 +64,67 @@ class AnalyticsService(IAnalyticsService):
 
         Increments the counter for the URL identified by the event's short_code.
         If the URL is not yet tracked, creates a new record with count=1.
-        Commits the transaction to persist changes.
+        A redelivered event, recognized by its event_id, is skipped; the ID is
+        recorded in the same transaction as the increment.
+        Commits the transaction to persist changes, then records the
+        freshness lag: the time from the access to its count being durable.
 
         Args:
             event: The URL accessed event containing short_code and long_url.
         """
+        if not await self._first_delivery(event):
+            return
         await self._repository.increment_access_count(
             short_code=event.short_code,
             long_url=event.long_url,
         )
-        await self._repository.commit()
+        await self._commit(type(event).__name__, event.accessed_at)
         logger.info(
             "Handled URL accessed event",
             extra={"short_code": event.short_code},
         )
+
+    async def handle_url_access_counted(self, event: UrlAccessCountedEvent) -> None:
+        """
+        Process a UrlAccessCountedEvent by adding its count to the access counter.
+
+        One increment by the window's count replaces one increment per
+        access. The freshness lag is measured from the start of the window,
+        i.e. from the oldest access the event counts.
+
+        Args:
+            event: The aggregated event containing short_code, long_url and count.
+        """
+        if not await self._first_delivery(event):
+            return
+        await self._repository.increment_access_count(
+            short_code=event.short_code,
+            long_url=event.long_url,
+            count=event.count,
+        )
+        await self._commit(type(event).__name__, event.window_start)
+        logger.info(
+            "Handled URL access counted event",
+            extra={"short_code": event.short_code, "count": event.count},
+        )
+
+    async def _first_delivery(self, event: Union[UrlAccessedEvent, UrlAccessCountedEvent]) -> bool:
+        """Record the event as processed; return False if it was already counted."""
+        if await self._repository.mark_processed(event.event_id):
+            return True
+        events_deduplicated.labels(type(event).__name__).inc()
+        logger.info(
+            "Skipped redelivered event",
+            extra={"event_id": event.event_id, "short_code": event.short_code},
+        )
+        return False
+
+    async def _commit(self, event_type: str, accessed_at: datetime) -> None:
+        """Commit the increment and record the freshness lag since the access."""
+        with tracer.start_span("commit") as span:
+            await self._repository.commit()
+            if accessed_at.tzinfo is None:
+                accessed_at = accessed_at.replace(tzinfo=timezone.utc)
+            lag = (datetime.now(timezone.utc) - accessed_at).total_seconds()
+            span.set_attribute("freshness_lag_seconds", lag)
+        event_freshness_lag.labels(event_type).observe(lag)
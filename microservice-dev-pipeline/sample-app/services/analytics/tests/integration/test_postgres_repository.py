@@ -227,3 +227,32 @@ async def test_event_handler_persists_changes(engine):
         assert found.short_code == "event_test"
         assert found.long_url == "https://event-test.com"
         assert found.access_count == 1
+
+
+@pytest.mark.asyncio
+async def test_redelivered_event_is_counted_once(engine):
+    """
+    Verify that a redelivered event is skipped once its ID was committed.
+
+    Each delivery is handled in its own session, as by the event consumer.
+    """
+    session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    event = UrlAccessedEvent(
+        short_code="redelivered",
+        long_url="https://redelivered.com",
+        accessed_at=datetime.now(timezone.utc),
+    )
+
+    for _ in range(2):
+        async with session_maker() as session:
+            service = AnalyticsService(repository=PostgresAnalyticsRepository(session))
+            await service.handle_url_accessed(event)
+
+    async with session_maker() as new_session:
+        stmt = select(UrlAccessStats).where(
+            UrlAccessStats.short_code == "redelivered"
+        )
+        result = await new_session.execute(stmt)
+        assert result.scalar_one().access_count == 1
@@ -7,7 +7,7 @@ Uses InMemoryAnalyticsRepository to test business logic without database.
 import pytest
 from datetime import datetime, timezone
 
-from architecture.contracts.common import UrlAccessedEvent
+from architecture.contracts.common import UrlAccessCountedEvent, UrlAccessedEvent
 from app.adapters.in_memory_repository import InMemoryAnalyticsRepository
 from app.exceptions.analytics_exceptions import InvalidLimitError
 from app.services.analytics_service import AnalyticsService
@@ -119,10 +119,10 @@ async def test_handle_multiple_events_same_url(
     service: AnalyticsService,
 ) -> None:
     """Multiple events for the same URL should increment the counter each time."""
-    event = _make_event(short_code="repeat", long_url="https://repeat.com")
-
     for _ in range(5):
-        await service.handle_url_accessed(event)
+        await service.handle_url_accessed(
+            _make_event(short_code="repeat", long_url="https://repeat.com")
+        )
 
     result = await service.get_top_urls(limit=10)
     assert len(result.urls) == 1
@@ -130,6 +130,60 @@ async def test_handle_multiple_events_same_url(
     assert result.urls[0].access_count == 5
 
 
+@pytest.mark.asyncio
+async def test_handle_counted_event_adds_count(service: AnalyticsService) -> None:
+    """An aggregated event should add its count in one increment, on top of per-access events."""
+    now = datetime.now(timezone.utc)
+    counted = UrlAccessCountedEvent(
+        short_code="batch1",
+        long_url="https://batch.com",
+        count=7,
+        window_start=now,
+        window_end=now,
+    )
+
+    await service.handle_url_access_counted(counted)
+    await service.handle_url_accessed(_make_event(short_code="batch1", long_url="https://batch.com"))
+
+    result = await service.get_top_urls(limit=10)
+    assert len(result.urls) == 1
+    assert result.urls[0].long_url == "https://batch.com"
+    assert result.urls[0].access_count == 8
+
+
+@pytest.mark.asyncio
+async def test_redelivered_events_are_counted_once(service: AnalyticsService) -> None:
+    """An event delivered again with the same event_id should not be counted twice."""
+    now = datetime.now(timezone.utc)
+    counted = UrlAccessCountedEvent(
+        short_code="dup001",
+        long_url="https://dup.com",
+        count=4,
+        window_start=now,
+        window_end=now,
+    )
+    accessed = _make_event(short_code="dup001", long_url="https://dup.com")
+
+    for _ in range(2):
+        await service.handle_url_access_counted(counted)
+        await service.handle_url_accessed(accessed)
+
+    result = await service.get_top_urls(limit=10)
+    assert result.urls[0].access_count == 5
+
+
+@pytest.mark.asyncio
+async def test_prune_processed_forgets_old_event_ids(repository: InMemoryAnalyticsRepository) -> None:
+    """Pruned event IDs are accepted again; recent ones are kept."""
+    assert await repository.mark_processed("old")
+    cutoff = datetime.now(timezone.utc)
+    assert await repository.mark_processed("new")
+
+    assert await repository.prune_processed(cutoff) == 1
+    assert await repository.mark_processed("old")
+    assert not await repository.mark_processed("new")
+
+
 @pytest.mark.asyncio
 async def test_get_top_urls_invalid_limit(service: AnalyticsService) -> None:
     """Requesting top URLs with a non-positive limit should raise InvalidLimitError."""
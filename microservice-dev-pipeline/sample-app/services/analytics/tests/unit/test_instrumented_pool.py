@@ -0,0 +1,85 @@
+"""
+Unit tests for the connection pool instrumentation.
+
+Applies the instrumentation mixin to a synchronous QueuePool over SQLite
+connections, which shares its checkout logic with the asyncio pool.
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from app.adapters.instrumented_pool import PoolInstrumentation, pool_stats
+
+
+class InstrumentedQueuePool(PoolInstrumentation, QueuePool):
+    """Synchronous queue pool with checkout metrics."""
+
+
+@pytest.fixture
+def pool() -> InstrumentedQueuePool:
+    """Provide a pool of one connection with a short timeout."""
+    return InstrumentedQueuePool(
+        lambda: sqlite3.connect(":memory:", check_same_thread=False),
+        pool_size=1,
+        max_overflow=0,
+        timeout=0.2,
+    )
+
+
+def test_stats_report_checked_out_and_idle(pool: InstrumentedQueuePool) -> None:
+    """Checked-out and idle counts follow checkouts and returns."""
+    connection = pool.connect()
+    stats = pool_stats(pool)
+    assert stats["checked_out"] == 1
+    assert stats["idle"] == 0
+
+    connection.close()
+    stats = pool_stats(pool)
+    assert stats["checked_out"] == 0
+    assert stats["idle"] == 1
+    assert stats["acquired"] == 1
+
+
+def test_waiting_callers_and_latency_are_recorded(pool: InstrumentedQueuePool) -> None:
+    """A caller blocked on an exhausted pool is counted as waiting and its wait is timed."""
+    held = pool.connect()
+    acquired = threading.Event()
+
+    def acquire() -> None:
+        pool.connect().close()
+        acquired.set()
+
+    waiter = threading.Thread(target=acquire)
+    waiter.start()
+    time.sleep(0.05)
+    assert pool_stats(pool)["waiting"] == 1
+
+    held.close()
+    waiter.join()
+    assert acquired.is_set()
+    stats = pool_stats(pool)
+    assert stats["waiting"] == 0
+    assert stats["acquire_seconds_max"] >= 0.05
+
+
+def test_timeouts_are_counted(pool: InstrumentedQueuePool) -> None:
+    """Checkouts that time out on an exhausted pool are counted."""
+    held = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    held.close()
+
+    assert pool_stats(pool)["timeouts"] == 1
+
+
+def test_metrics_survive_pool_recreation(pool: InstrumentedQueuePool) -> None:
+    """Disposing an engine recreates its pool; the counters carry over."""
+    pool.connect().close()
+    recreated = pool.recreate()
+
+    assert pool_stats(recreated)["acquired"] == 1
@@ -0,0 +1,85 @@
+"""
+Unit tests for the queue-based, sampled logging pipeline.
+"""
+
+import json
+import logging
+import queue
+import threading
+
+import pytest
+
+from app.logging_config import JsonFormatter, NonBlockingQueueHandler, SamplingFilter, configure_logging
+
+
+def _record(name: str, level: int = logging.INFO, **extra: object) -> logging.LogRecord:
+    record = logging.LogRecord(name, level, __file__, 1, "Received %s", ("abc12345",), None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields() -> None:
+    """Messages are rendered with their arguments and extra fields become JSON keys."""
+    entry = json.loads(JsonFormatter().format(_record("app.adapters.rabbitmq_broker", short_code="abc12345")))
+
+    assert entry["message"] == "Received abc12345"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "app.adapters.rabbitmq_broker"
+    assert entry["short_code"] == "abc12345"
+    assert "args" not in entry
+
+
+def test_sampling_applies_most_specific_rate_to_info_only() -> None:
+    """Sampled loggers lose INFO records, while warnings and other loggers pass."""
+    sampling = SamplingFilter({"app": 1.0, "app.adapters": 0.0})
+
+    assert sampling.filter(_record("app.services.analytics_service"))
+    assert not sampling.filter(_record("app.adapters.rabbitmq_broker"))
+    assert sampling.filter(_record("app.adapters.rabbitmq_broker", level=logging.WARNING))
+    assert sampling.filter(_record("uvicorn.error"))
+    assert sampling.sampled_out == 1
+
+
+def test_sampling_rejects_invalid_rates() -> None:
+    """Rates outside [0, 1] are a configuration error."""
+    with pytest.raises(ValueError):
+        SamplingFilter({"app": 2.0})
+
+
+def test_queue_handler_defers_formatting_and_drops_when_full() -> None:
+    """Records are enqueued unformatted and dropped rather than blocking when the queue is full."""
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=1)
+    handler = NonBlockingQueueHandler(log_queue)
+
+    first = _record("app.adapters.rabbitmq_broker")
+    handler.handle(first)
+    handler.handle(_record("app.adapters.rabbitmq_broker"))
+
+    assert log_queue.get_nowait() is first
+    assert first.args == ("abc12345",)
+    assert handler.dropped == 1
+
+
+def test_configure_logging_writes_from_listener_thread(capsys: pytest.CaptureFixture) -> None:
+    """Records logged on the caller are written as JSON by the listener thread."""
+    root = logging.getLogger()
+    previous_handlers, previous_level = root.handlers[:], root.level
+    threads = []
+
+    class ThreadRecorder(logging.Filter):
+        def filter(self, record: logging.LogRecord) -> bool:
+            threads.append(threading.current_thread())
+            return True
+
+    listener = configure_logging(level="INFO", json_format=True)
+    try:
+        listener.handlers[0].addFilter(ThreadRecorder())
+        logging.getLogger("app.adapters.rabbitmq_broker").info("Received %s", "abc12345", extra={"short_code": "abc12345"})
+    finally:
+        listener.stop()
+        root.handlers = previous_handlers
+        root.setLevel(previous_level)
+
+    entry = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert entry["message"] == "Received abc12345"
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,83 @@
+"""
+Unit tests for the metrics primitives, the request metrics middleware and
+the instrumented repository decorator.
+"""
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+from app.adapters.in_memory_repository import InMemoryAnalyticsRepository
+from app.adapters.instrumented_repository import InstrumentedAnalyticsRepository
+from app.api.metrics_middleware import MetricsMiddleware
+from app.metrics import (
+    CONTENT_TYPE,
+    MetricsRegistry,
+    http_request_duration,
+    registry,
+    repository_call_duration,
+)
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    """Observations land in the first bucket whose bound is not below them."""
+    metrics = MetricsRegistry()
+    histogram = metrics.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    child = histogram.labels("/a")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        child.observe(value)
+
+    lines = metrics.render().splitlines()
+
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+
+
+def test_counter_renders_total() -> None:
+    """Counters are exposed with the _total suffix."""
+    metrics = MetricsRegistry()
+    metrics.counter("events_processed", "Events.", ("outcome",)).labels("error").inc()
+
+    assert 'events_processed_total{outcome="error"} 1' in metrics.render().splitlines()
+
+
+@pytest.mark.asyncio
+async def test_middleware_labels_requests_by_route_template() -> None:
+    """Requests are recorded under the template of the route that served them."""
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str) -> dict:
+        return {"item_id": item_id}
+
+    @app.get("/metrics")
+    async def metrics() -> Response:
+        return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+    app.add_middleware(MetricsMiddleware)
+    before = http_request_duration.labels("GET", "/items/{item_id}", "200").count
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/items/1")
+        await client.get("/items/2")
+        response = await client.get("/metrics")
+
+    assert http_request_duration.labels("GET", "/items/{item_id}", "200").count == before + 2
+    assert 'route="/items/{item_id}"' in response.text
+
+
+@pytest.mark.asyncio
+async def test_instrumented_repository_times_calls() -> None:
+    """Every repository call is observed under its operation."""
+    repository = InstrumentedAnalyticsRepository(InMemoryAnalyticsRepository())
+    before = repository_call_duration.labels("increment_access_count").count
+
+    await repository.increment_access_count("abc123", "https://example.com")
+    await repository.commit()
+
+    assert repository_call_duration.labels("increment_access_count").count == before + 1
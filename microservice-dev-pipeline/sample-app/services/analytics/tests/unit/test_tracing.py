@@ -0,0 +1,64 @@
+"""
+Unit tests for continuing propagated traces and measuring event freshness.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from architecture.contracts.common import UrlAccessedEvent
+from app.adapters.in_memory_repository import InMemoryAnalyticsRepository
+from app.adapters.rabbitmq_broker import _header_timestamp
+from app.metrics import event_freshness_lag
+from app.services.analytics_service import AnalyticsService
+from app.tracing import parse_traceparent, tracer
+
+PUBLISHER_TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def span_file(tmp_path: Path) -> Iterator[Path]:
+    """Enable tracing into a temporary JSON lines file for one test."""
+    path = tmp_path / "spans.jsonl"
+    tracer.configure("analytics", str(path))
+    yield path
+    tracer.shutdown()
+
+
+def test_header_timestamp_accepts_text_and_bytes() -> None:
+    """Publish times are read from string or bytes headers; anything else is ignored."""
+    assert _header_timestamp("1700000000.25") == 1700000000.25
+    assert _header_timestamp(b"1700000000.25") == 1700000000.25
+    assert _header_timestamp("soon") is None
+    assert _header_timestamp(None) is None
+
+
+@pytest.mark.asyncio
+async def test_handling_continues_publisher_trace(span_file: Path) -> None:
+    """Queue wait, handle and commit spans join the publisher's trace and carry the freshness lag."""
+    lag_histogram = event_freshness_lag.labels("UrlAccessedEvent")
+    observed_before = lag_histogram.count
+    service = AnalyticsService(repository=InMemoryAnalyticsRepository())
+    event = UrlAccessedEvent(
+        short_code="abc123",
+        long_url="https://example.com",
+        accessed_at=datetime.now(timezone.utc) - timedelta(seconds=2),
+    )
+    parent = parse_traceparent(PUBLISHER_TRACEPARENT)
+
+    tracer.record_span("queue_wait", 1700000000.0, 1700000000.5, parent)
+    with tracer.start_span("handle", parent):
+        await service.handle_url_accessed(event)
+    tracer.shutdown()
+    spans = {span["name"]: span for span in map(json.loads, span_file.read_text().splitlines())}
+
+    assert {span["trace_id"] for span in spans.values()} == {parent.trace_id}
+    assert spans["queue_wait"]["parent_span_id"] == parent.span_id
+    assert spans["queue_wait"]["duration_ms"] == pytest.approx(500)
+    assert spans["handle"]["parent_span_id"] == parent.span_id
+    assert spans["commit"]["parent_span_id"] == spans["handle"]["span_id"]
+    assert spans["commit"]["attributes"]["freshness_lag_seconds"] >= 2
+    assert lag_histogram.count == observed_before + 1
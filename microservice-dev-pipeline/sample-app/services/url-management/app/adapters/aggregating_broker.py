@@ -0,0 +1,207 @@
+"""
+Access-aggregating message broker decorator.
+
+A popular short URL produces one UrlAccessedEvent per redirect, and
+analytics turns each of them into one database increment. This decorator
+counts accesses in memory per short code instead, and a background task
+publishes one UrlAccessCountedEvent per short code at the end of every
+window, or as soon as the window holds max_keys short codes. Other events
+pass straight through to the wrapped broker. Each aggregate carries the
+trace context of the first access it counts.
+
+Accesses counted but not yet published live only in memory: a crash loses
+at most one window. When publishing a window fails, its events are kept and
+published again, unchanged, with the next window. Part of the failed batch
+may already have been delivered; since the retried events keep their
+event_id, analytics counts those only once.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from architecture.contracts.common import UrlAccessCountedEvent, UrlAccessedEvent
+from app.ports.message_broker import IMessageBroker
+from app.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+ROUTING_KEY = "url.access_counted"
+
+
+class AccessCount:
+    """Accesses of one short code counted during the current window."""
+
+    __slots__ = ("long_url", "count", "window_start", "traceparent")
+
+    def __init__(self, long_url: str, count: int, window_start: datetime, traceparent: Optional[str]):
+        self.long_url = long_url
+        self.count = count
+        self.window_start = window_start
+        self.traceparent = traceparent
+
+
+class AggregatingBroker(IMessageBroker):
+    """IMessageBroker decorator that publishes per-window access counts instead of per-access events."""
+
+    def __init__(self, inner: IMessageBroker, window_seconds: float = 1.0, max_keys: int = 10_000):
+        if window_seconds <= 0:
+            raise ValueError("The aggregation window must be positive")
+        if max_keys < 1:
+            raise ValueError("The aggregation window needs room for at least one short code")
+        self._inner = inner
+        self._window_seconds = window_seconds
+        self._max_keys = max_keys
+        self._counts: Dict[str, AccessCount] = {}
+        self._unsent: List[Tuple[UrlAccessCountedEvent, str]] = []
+        self._flush_requested = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.accesses = 0
+        self.published = 0
+        self.flushes = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        """Start the background task that closes windows."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def connect(self) -> None:
+        """Start closing windows, then connect the wrapped broker."""
+        self.start()
+        await self._inner.connect()
+
+    async def publish(self, event: BaseModel, routing_key: str) -> None:
+        """Count a UrlAccessedEvent in the current window; publish any other event directly."""
+        if not isinstance(event, UrlAccessedEvent):
+            await self._inner.publish(event, routing_key)
+            return
+        self._count(event)
+
+    async def publish_batch(self, events: Sequence[Tuple[BaseModel, str]]) -> None:
+        """Count the UrlAccessedEvents of the batch and publish the others as one batch."""
+        passthrough: List[Tuple[BaseModel, str]] = []
+        for event, routing_key in events:
+            if isinstance(event, UrlAccessedEvent):
+                self._count(event)
+            else:
+                passthrough.append((event, routing_key))
+        if passthrough:
+            await self._inner.publish_batch(passthrough)
+
+    def _count(self, event: UrlAccessedEvent) -> None:
+        if self._task is None:
+            self.start()
+        traceparent = tracer.attached_traceparent(event) or tracer.current_traceparent()
+        self._add(event.short_code, event.long_url, event.accessed_at, traceparent)
+        self.accesses += 1
+        if len(self._counts) >= self._max_keys:
+            self._flush_requested.set()
+
+    def _add(self, short_code: str, long_url: str, accessed_at: datetime, traceparent: Optional[str]) -> None:
+        entry = self._counts.get(short_code)
+        if entry is None:
+            self._counts[short_code] = AccessCount(long_url, 1, accessed_at, traceparent)
+            return
+        entry.count += 1
+        if accessed_at < entry.window_start:
+            entry.window_start = accessed_at
+
+    async def _run(self) -> None:
+        """Background loop: close a window when it elapses or fills up."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self._window_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            if not await self.flush():
+                # Back off for a window rather than retrying a full window at once
+                await asyncio.sleep(self._window_seconds)
+
+    async def flush(self) -> bool:
+        """
+        Close the current window and publish one UrlAccessCountedEvent per short code.
+
+        Events of earlier windows that could not be published are sent
+        again in the same batch.
+
+        Returns:
+            False if publishing failed; the events are then kept for the
+            next flush.
+        """
+        if not self._counts and not self._unsent:
+            return True
+        counts, self._counts = self._counts, {}
+        window_end = datetime.now(timezone.utc)
+        events = self._unsent + [
+            (self._aggregate(short_code, entry, window_end), ROUTING_KEY)
+            for short_code, entry in counts.items()
+        ]
+        self._unsent = []
+        try:
+            await self._inner.publish_batch(events)
+        except asyncio.CancelledError:
+            # Interrupted by close(), which publishes the events again
+            self._unsent = events
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.warning(
+                "Failed to publish aggregated accesses, retrying them with the next window",
+                extra={"short_codes": len(events), "error": str(e)},
+            )
+            self._unsent = events
+            return False
+        self.flushes += 1
+        self.published += len(events)
+        return True
+
+    @staticmethod
+    def _aggregate(short_code: str, entry: AccessCount, window_end: datetime) -> UrlAccessCountedEvent:
+        event = UrlAccessCountedEvent(
+            short_code=short_code,
+            long_url=entry.long_url,
+            count=entry.count,
+            window_start=entry.window_start,
+            window_end=window_end,
+        )
+        tracer.attach_traceparent(event, entry.traceparent)
+        return event
+
+    def _pending_accesses(self) -> int:
+        unsent = sum(event.count for event, _ in self._unsent)
+        return unsent + sum(entry.count for entry in self._counts.values())
+
+    async def close(self) -> None:
+        """Stop closing windows, publish the last one, then close the wrapped broker."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if not await self.flush():
+            logger.error(
+                "Dropped aggregated accesses on shutdown",
+                extra={"accesses": self._pending_accesses()},
+            )
+            self._unsent = []
+        await self._inner.close()
+
+    def stats(self) -> Dict[str, object]:
+        """Return the window settings, the accesses of the open window and the publishing counters."""
+        return {
+            "window_seconds": self._window_seconds,
+            "max_keys": self._max_keys,
+            "pending_short_codes": len(self._counts),
+            "pending_accesses": self._pending_accesses(),
+            "accesses": self.accesses,
+            "published": self.published,
+            "flushes": self.flushes,
+            "failed": self.failed,
+        }
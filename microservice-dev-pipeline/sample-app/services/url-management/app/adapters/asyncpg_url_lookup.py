@@ -0,0 +1,92 @@
+"""
+Raw asyncpg read path for redirects.
+
+Resolving a short code needs a single column of a single row, so this path
+bypasses SQLAlchemy sessions and ORM hydration entirely: it keeps its own
+asyncpg pool and runs one SELECT that asyncpg prepares once per connection
+and reuses from its statement cache. Writes and all other lookups keep
+going through the wrapped repository. With lookup batching enabled, the
+batch loader fetches its ANY(...) queries from this pool instead.
+"""
+
+import logging
+from typing import Dict, Optional, Sequence
+
+import asyncpg
+
+from app.adapters.delegating_repository import DelegatingUrlRepository
+from app.ports.repository import IUrlRepository
+
+logger = logging.getLogger(__name__)
+
+FIND_LONG_URL_SQL = "SELECT long_url FROM url_mappings WHERE short_code = $1"
+
+FIND_LONG_URLS_SQL = "SELECT short_code, long_url FROM url_mappings WHERE short_code = ANY($1::text[])"
+
+
+class AsyncpgUrlLookup:
+    """Process-wide asyncpg pool serving long URL lookups by short code."""
+
+    def __init__(
+        self, dsn: str, min_size: int = 1, max_size: int = 10, statement_cache_size: int = 100
+    ):
+        self._dsn = dsn
+        self._min_size = min_size
+        self._max_size = max_size
+        self._statement_cache_size = statement_cache_size
+        self._pool: Optional[asyncpg.Pool] = None
+
+    async def connect(self) -> None:
+        """Create the connection pool."""
+        if self._pool is not None:
+            return
+        self._pool = await asyncpg.create_pool(
+            self._dsn,
+            min_size=self._min_size,
+            max_size=self._max_size,
+            statement_cache_size=self._statement_cache_size,
+        )
+        logger.info(
+            "Lookup pool connected",
+            extra={"min_size": self._min_size, "max_size": self._max_size},
+        )
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+            logger.info("Lookup pool closed")
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the pool's occupancy."""
+        if self._pool is None:
+            return {"size": 0, "checked_out": 0, "idle": 0}
+        size = self._pool.get_size()
+        idle = self._pool.get_idle_size()
+        return {"size": size, "checked_out": size - idle, "idle": idle}
+
+    async def find_long_url(self, short_code: str) -> Optional[str]:
+        """Return the long URL stored under the short code, or None."""
+        if self._pool is None:
+            raise RuntimeError("Lookup pool is not connected. Call connect() first.")
+        return await self._pool.fetchval(FIND_LONG_URL_SQL, short_code)
+
+    async def find_long_urls(self, short_codes: Sequence[str]) -> Dict[str, str]:
+        """Return the long URLs stored under the short codes that exist, keyed by short code."""
+        if self._pool is None:
+            raise RuntimeError("Lookup pool is not connected. Call connect() first.")
+        rows = await self._pool.fetch(FIND_LONG_URLS_SQL, list(short_codes))
+        return {row["short_code"]: row["long_url"] for row in rows}
+
+
+class AsyncpgLookupRepository(DelegatingUrlRepository):
+    """IUrlRepository decorator that serves find_long_url from an AsyncpgUrlLookup."""
+
+    def __init__(self, inner: IUrlRepository, lookup: AsyncpgUrlLookup):
+        super().__init__(inner)
+        self._lookup = lookup
+
+    async def find_long_url(self, short_code: str) -> Optional[str]:
+        """Look the long URL up on the raw asyncpg pool."""
+        return await self._lookup.find_long_url(short_code)
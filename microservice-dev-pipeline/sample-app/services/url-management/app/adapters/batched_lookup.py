@@ -0,0 +1,150 @@
+"""
+Micro-batched short code lookups (DataLoader style).
+
+Under high redirect concurrency every request would issue its own
+single-row SELECT. The batch loader instead collects the keys requested
+within a short window (or until a batch is full), fetches them with one
+WHERE short_code = ANY(...) query, and fans the results back out to the
+waiting callers. Duplicate keys within a batch are fetched once.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Generic, List, Optional, Sequence, Set, Tuple, TypeVar
+
+from app.adapters.delegating_repository import DelegatingUrlRepository
+from app.models.url_mapping import UrlMapping
+from app.ports.repository import IUrlRepository
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[V]):
+    """
+    Process-wide collector that turns concurrent single-key loads into bulk loads.
+
+    load_many receives the distinct keys of a batch and returns the values
+    found, keyed by key; keys it omits resolve to None.
+    """
+
+    def __init__(
+        self,
+        load_many: Callable[[List[str]], Awaitable[Dict[str, V]]],
+        window_seconds: float = 0.0005,
+        max_batch_size: int = 100,
+    ):
+        if max_batch_size <= 0:
+            raise ValueError("Batch max_batch_size must be a positive integer")
+        self._load_many = load_many
+        self._window_seconds = window_seconds
+        self._max_batch_size = max_batch_size
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.loads = 0
+        self.batches = 0
+        self.keys_loaded = 0
+
+    async def load(self, key: str) -> Optional[V]:
+        """Return the value for a key, fetched together with concurrent loads."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        self.loads += 1
+
+        if len(self._pending) >= self._max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window_seconds, self._dispatch)
+        return await future
+
+    def _dispatch(self) -> None:
+        """Hand the pending keys to a background fetch and start a new batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        task = asyncio.create_task(self._fetch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, batch: Dict[str, List[asyncio.Future]]) -> None:
+        """Run one bulk load and resolve every waiting caller."""
+        try:
+            found = await self._load_many(list(batch))
+        except Exception as e:
+            logger.warning("Batched lookup failed", extra={"keys": len(batch), "error": str(e)})
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.keys_loaded += len(batch)
+        for key, futures in batch.items():
+            value = found.get(key)
+            for future in futures:
+                if not future.done():
+                    future.set_result(value)
+
+    def stats(self) -> Dict[str, float]:
+        """Return a snapshot of the batching counters."""
+        return {
+            "loads": self.loads,
+            "batches": self.batches,
+            "keys_loaded": self.keys_loaded,
+            "average_batch_size": self.keys_loaded / self.batches if self.batches else 0.0,
+        }
+
+
+class BatchedLookupUrlRepository(DelegatingUrlRepository):
+    """
+    IUrlRepository decorator that serves short code lookups through batch loaders.
+
+    The loaders read committed data on their own sessions, so once this
+    repository has written, its lookups go to the wrapped repository to see
+    the uncommitted rows. Everything else is delegated.
+    """
+
+    def __init__(
+        self,
+        inner: IUrlRepository,
+        mapping_loader: BatchLoader[UrlMapping],
+        long_url_loader: BatchLoader[str],
+    ):
+        super().__init__(inner)
+        self._mapping_loader = mapping_loader
+        self._long_url_loader = long_url_loader
+        self._wrote = False
+
+    async def save(self, url_mapping: UrlMapping) -> UrlMapping:
+        """Delegate to the wrapped repository."""
+        self._wrote = True
+        return await self._inner.save(url_mapping)
+
+    async def insert_if_absent(self, url_mapping: UrlMapping) -> Tuple[UrlMapping, bool]:
+        """Delegate to the wrapped repository."""
+        self._wrote = True
+        return await self._inner.insert_if_absent(url_mapping)
+
+    async def insert_many_if_absent(self, url_mappings: Sequence[UrlMapping]) -> Set[str]:
+        """Delegate to the wrapped repository."""
+        self._wrote = True
+        return await self._inner.insert_many_if_absent(url_mappings)
+
+    async def find_by_short_code(self, short_code: str) -> Optional[UrlMapping]:
+        """Look up the mapping as part of the next batch."""
+        if self._wrote:
+            return await self._inner.find_by_short_code(short_code)
+        return await self._mapping_loader.load(short_code)
+
+    async def find_long_url(self, short_code: str) -> Optional[str]:
+        """Look up the long URL as part of the next batch."""
+        if self._wrote:
+            return await self._inner.find_long_url(short_code)
+        return await self._long_url_loader.load(short_code)
@@ -0,0 +1,351 @@
+"""
+Bloom filter guard for short code lookups.
+
+Bots scanning random short codes make every redirect miss cost a database
+query. A per-worker Bloom filter of all existing short codes answers
+definite misses in memory: a code absent from the filter cannot exist, so
+the lookup returns None without reaching the cache or the database. Codes
+present in the filter (true hits and the configured fraction of false
+positives) go through the normal lookup.
+
+The filter is built in the background at startup by paging short codes out
+of the database, and rebuilt periodically so its size keeps up with the
+table. Codes created by this worker are added immediately; codes created by
+other workers are picked up by an incremental refresh. A filter miss is
+only trusted after a refresh that started after the lookup, so a code
+committed before its first redirect is always found. Refreshes start at
+most once per refresh interval and every miss in between waits for the next
+one, so a scan of random codes costs one query per interval rather than
+one per request.
+
+Refreshes select rows by created_at rather than by ID, because rows become
+visible in commit order, not in ID or created_at order. Each refresh
+re-reads the rows created within the visibility window before the previous
+refresh started, which must exceed the longest insert transaction plus the
+clock skew between workers.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from app.adapters.delegating_repository import DelegatingUrlRepository
+from app.models.url_mapping import UrlMapping
+from app.ports.repository import IUrlRepository
+
+logger = logging.getLogger(__name__)
+
+ShortCodePageLoader = Callable[
+    [int, int, Optional[datetime]], Awaitable[Sequence[Tuple[int, str]]]
+]
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings using double hashing over BLAKE2b."""
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        if capacity <= 0:
+            raise ValueError("Bloom filter capacity must be a positive integer")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("Bloom filter false positive rate must be between 0 and 1")
+        self.capacity = capacity
+        self.target_false_positive_rate = false_positive_rate
+        self.size_bits = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.size_bits + 7) // 8)
+        self.items_added = 0
+
+    def _positions(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size_bits for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter."""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.items_added += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self._bits)
+
+    def fill_ratio(self) -> float:
+        """Fraction of bits set."""
+        return int.from_bytes(self._bits, "little").bit_count() / self.size_bits
+
+    def estimated_false_positive_rate(self) -> float:
+        """Current false positive probability, estimated from the fill ratio."""
+        return self.fill_ratio() ** self.hash_count
+
+
+class ShortCodeFilter:
+    """
+    Process-wide Bloom filter of existing short codes, kept in sync with the database.
+
+    Until the first build completes every code is reported as possibly
+    present, so lookups behave exactly as without the filter.
+    """
+
+    def __init__(
+        self,
+        load_page: ShortCodePageLoader,
+        capacity: int,
+        false_positive_rate: float,
+        page_size: int = 10_000,
+        visibility_window_seconds: float = 30.0,
+        refresh_interval_seconds: float = 0.25,
+        rebuild_interval_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self._load_page = load_page
+        self._capacity = capacity
+        self._false_positive_rate = false_positive_rate
+        self._page_size = page_size
+        self._visibility_window = timedelta(seconds=visibility_window_seconds)
+        self._refresh_interval_seconds = refresh_interval_seconds
+        self._rebuild_interval_seconds = rebuild_interval_seconds
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._filter: Optional[BloomFilter] = None
+        self._loaded_since: Optional[datetime] = None
+        self._refreshes_started = 0
+        self._refreshes_completed = 0
+        self._last_refresh_started: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._pending_adds: Optional[List[str]] = None
+        self._task: Optional[asyncio.Task] = None
+        self.rejected = 0
+        self.passed = 0
+        self.refreshes = 0
+        self.rebuilds = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether the filter has been built and is answering lookups."""
+        return self._filter is not None
+
+    def add(self, short_code: str) -> None:
+        """Record a short code created by this worker."""
+        if self._filter is not None:
+            self._filter.add(short_code)
+        if self._pending_adds is not None:
+            self._pending_adds.append(short_code)
+
+    async def might_contain(self, short_code: str) -> bool:
+        """
+        Return False only if the short code definitely does not exist.
+
+        A miss waits for a refresh that started after the lookup, so codes
+        committed by other workers before the lookup are found; that may take
+        up to one refresh interval.
+        """
+        if self._filter is None or short_code in self._filter:
+            self.passed += 1
+            return True
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning("Short code filter refresh failed", extra={"error": str(e)})
+            self.passed += 1
+            return True
+        if short_code in self._filter:
+            self.passed += 1
+            return True
+        self.rejected += 1
+        return False
+
+    async def refresh(self) -> None:
+        """
+        Add short codes created since the last build or refresh started.
+
+        Returns once a refresh that started after this call has completed.
+        A refresh starts no sooner than one refresh interval after the
+        previous one, and every caller arriving until then shares it.
+        """
+        requested = self._refreshes_started
+        async with self._lock:
+            if self._filter is None or self._refreshes_completed > requested:
+                return
+            if self._last_refresh_started is not None:
+                delay = self._last_refresh_started + self._refresh_interval_seconds - self._clock()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            self._last_refresh_started = self._clock()
+            self._refreshes_started += 1
+            generation = self._refreshes_started
+            started = self._wall_clock()
+            assert self._loaded_since is not None
+            await self._load(self._loaded_since - self._visibility_window, self._add_new)
+            self._loaded_since = started
+            self._refreshes_completed = generation
+            self.refreshes += 1
+
+    def _add_new(self, short_code: str) -> None:
+        # Rows re-read within the visibility window are mostly known already
+        if self._filter is not None and short_code not in self._filter:
+            self.add(short_code)
+
+    async def rebuild(self) -> None:
+        """
+        Build a fresh filter from all stored short codes and swap it in.
+
+        The new filter is sized for twice the current number of codes (at
+        least the configured capacity) so that it stays near the target false
+        positive rate until the next rebuild. Lookups keep using the previous
+        filter while the new one is loaded.
+        """
+        self._pending_adds = []
+        try:
+            started = self._clock()
+            loaded_since = self._wall_clock()
+            capacity = self._capacity
+            if self._filter is not None:
+                capacity = max(capacity, 2 * self._filter.items_added)
+            bloom = BloomFilter(capacity, self._false_positive_rate)
+            await self._load(None, bloom.add)
+            if bloom.items_added * 2 > capacity:
+                # Grew past the planned headroom while loading: size up once more
+                loaded_since = self._wall_clock()
+                bloom = BloomFilter(2 * bloom.items_added, self._false_positive_rate)
+                await self._load(None, bloom.add)
+
+            async with self._lock:
+                # Codes added locally or by refreshes while loading
+                for short_code in self._pending_adds:
+                    bloom.add(short_code)
+                self._filter = bloom
+                self._loaded_since = loaded_since
+        finally:
+            self._pending_adds = None
+
+        self.rebuilds += 1
+        logger.info(
+            "Short code filter rebuilt",
+            extra={
+                "items": bloom.items_added,
+                "memory_bytes": bloom.memory_bytes,
+                "estimated_false_positive_rate": bloom.estimated_false_positive_rate(),
+                "duration_seconds": self._clock() - started,
+            },
+        )
+
+    def start(self) -> None:
+        """Start the background task that builds the filter and rebuilds it periodically."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, object]:
+        """Return a snapshot of the filter's size, accuracy and counters."""
+        stats: Dict[str, object] = {
+            "ready": self.ready,
+            "rejected": self.rejected,
+            "passed": self.passed,
+            "refreshes": self.refreshes,
+            "rebuilds": self.rebuilds,
+            "target_false_positive_rate": self._false_positive_rate,
+        }
+        if self._filter is not None:
+            stats.update(
+                {
+                    "items": self._filter.items_added,
+                    "capacity": self._filter.capacity,
+                    "size_bits": self._filter.size_bits,
+                    "hash_count": self._filter.hash_count,
+                    "memory_bytes": self._filter.memory_bytes,
+                    "fill_ratio": self._filter.fill_ratio(),
+                    "estimated_false_positive_rate": self._filter.estimated_false_positive_rate(),
+                }
+            )
+        return stats
+
+    async def _run(self) -> None:
+        """Background loop: build now, then rebuild every rebuild interval."""
+        while True:
+            try:
+                await self.rebuild()
+                delay = self._rebuild_interval_seconds
+            except Exception as e:
+                logger.error("Failed to build short code filter", extra={"error": str(e)})
+                delay = min(self._rebuild_interval_seconds, 30.0)
+            await asyncio.sleep(delay)
+
+    async def _load(self, created_after: Optional[datetime], add: Callable[[str], None]) -> None:
+        """Page through the short codes created after created_after (all if None), passing each to add."""
+        last_id = 0
+        while True:
+            rows = await self._load_page(last_id, self._page_size, created_after)
+            for row_id, short_code in rows:
+                add(short_code)
+                last_id = max(last_id, row_id)
+            if len(rows) < self._page_size:
+                return
+
+
+class BloomGuardedUrlRepository(DelegatingUrlRepository):
+    """
+    IUrlRepository decorator that answers definite short code misses from a ShortCodeFilter.
+
+    Mappings inserted through the decorator are added to the filter right
+    away; all other operations are delegated to the wrapped repository.
+    """
+
+    def __init__(self, inner: IUrlRepository, short_code_filter: ShortCodeFilter):
+        super().__init__(inner)
+        self._filter = short_code_filter
+
+    async def save(self, url_mapping: UrlMapping) -> UrlMapping:
+        """Persist via the wrapped repository and add the short code to the filter."""
+        saved = await self._inner.save(url_mapping)
+        self._filter.add(url_mapping.short_code)
+        return saved
+
+    async def insert_if_absent(self, url_mapping: UrlMapping) -> Tuple[UrlMapping, bool]:
+        """Insert via the wrapped repository and add a new short code to the filter."""
+        stored, created = await self._inner.insert_if_absent(url_mapping)
+        if created:
+            self._filter.add(url_mapping.short_code)
+        return stored, created
+
+    async def insert_many_if_absent(self, url_mappings: Sequence[UrlMapping]) -> Set[str]:
+        """Insert via the wrapped repository and add the new short codes to the filter."""
+        inserted = await self._inner.insert_many_if_absent(url_mappings)
+        for short_code in inserted:
+            self._filter.add(short_code)
+        return inserted
+
+    async def find_by_short_code(self, short_code: str) -> Optional[UrlMapping]:
+        """Return None for definite misses, otherwise delegate."""
+        if not await self._filter.might_contain(short_code):
+            return None
+        return await self._inner.find_by_short_code(short_code)
+
+    async def find_long_url(self, short_code: str) -> Optional[str]:
+        """Return None for definite misses, otherwise delegate."""
+        if not await self._filter.might_contain(short_code):
+            return None
+        return await self._inner.find_long_url(short_code)
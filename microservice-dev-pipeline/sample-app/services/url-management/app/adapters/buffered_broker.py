@@ -0,0 +1,216 @@
+"""
+Buffered message broker decorator.
+
+Takes event publishing off the request path: publish() only enqueues the
+event on a bounded in-process queue, and a background task drains the queue
+in batches to the wrapped broker. What happens when the queue is full is
+governed by the overflow policy:
+
+- drop:  the event is discarded and counted.
+- block: the caller waits for free space (backpressure on the request).
+- spill: the event is appended to a local spill journal and replayed once
+         the queue is idle again.
+"""
+
+import asyncio
+import logging
+from typing import List, Optional, Sequence
+
+from pydantic import BaseModel
+
+from app.adapters.spill_journal import QueuedEvent, SpillJournal
+from app.ports.message_broker import IMessageBroker
+from app.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop", "block", "spill")
+
+
+class BufferedBroker(IMessageBroker):
+    """IMessageBroker decorator that batches publishes through a background task."""
+
+    def __init__(
+        self,
+        inner: IMessageBroker,
+        max_queue_size: int,
+        flush_size: int,
+        flush_interval_seconds: float,
+        overflow_policy: str = "drop",
+        spill_path: Optional[str] = None,
+        drain_timeout_seconds: float = 10.0,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        if overflow_policy == "spill" and not spill_path:
+            raise ValueError("The spill overflow policy requires a spill_path")
+
+        self._inner = inner
+        self._max_queue_size = max_queue_size
+        self._flush_size = flush_size
+        self._flush_interval_seconds = flush_interval_seconds
+        self._overflow_policy = overflow_policy
+        self._drain_timeout_seconds = drain_timeout_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._journal = SpillJournal(spill_path) if spill_path else None
+        self._spill_pending = self._journal is not None and self._journal.pending
+        self.enqueued = 0
+        self.published = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.failed = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of events waiting to be published."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Create the queue and start the background drain task."""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def connect(self) -> None:
+        """Start draining, then connect the wrapped broker."""
+        self.start()
+        await self._inner.connect()
+
+    async def publish(self, event: BaseModel, routing_key: str) -> None:
+        """Enqueue the event, applying the overflow policy if the queue is full."""
+        if self._queue is None:
+            self.start()
+        assert self._queue is not None
+
+        # Published from the drain task, outside the request's trace
+        tracer.attach(event)
+        self.enqueued += 1
+        try:
+            self._queue.put_nowait((event, routing_key))
+            return
+        except asyncio.QueueFull:
+            pass
+
+        if self._overflow_policy == "block":
+            await self._queue.put((event, routing_key))
+        elif self._overflow_policy == "spill":
+            self._spill([(event, routing_key)])
+        else:
+            self.dropped += 1
+
+    async def close(self) -> None:
+        """Drain pending events within the drain timeout, then close the wrapped broker."""
+        if self._task is not None and self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), self._drain_timeout_seconds)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Timed out draining event queue",
+                    extra={"pending": self._queue.qsize()},
+                )
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+            leftover: List[QueuedEvent] = []
+            while not self._queue.empty():
+                leftover.append(self._queue.get_nowait())
+            if leftover:
+                self._handle_failed_batch(leftover)
+
+        if self._journal is not None:
+            await self._journal.close()
+
+        await self._inner.close()
+
+    def stats(self) -> dict:
+        """Return a snapshot of the publishing counters."""
+        return {
+            "queue_depth": self.queue_depth,
+            "enqueued": self.enqueued,
+            "published": self.published,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "failed": self.failed,
+        }
+
+    async def _run(self) -> None:
+        """Background loop: collect batches and publish them."""
+        while True:
+            batch = await self._collect_batch()
+            if batch:
+                await self._flush(batch)
+            elif self._spill_pending:
+                await self._replay_spill()
+
+    async def _collect_batch(self) -> List[QueuedEvent]:
+        """Wait for a first event, then gather more until the batch is full or the interval ends."""
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+
+        idle_timeout = self._flush_interval_seconds if self._spill_pending else None
+        try:
+            first = await asyncio.wait_for(self._queue.get(), idle_timeout)
+        except asyncio.TimeoutError:
+            return []
+
+        batch = [first]
+        deadline = loop.time() + self._flush_interval_seconds
+        while len(batch) < self._flush_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush(self, batch: List[QueuedEvent]) -> None:
+        """Publish a batch through the wrapped broker and mark the items done."""
+        assert self._queue is not None
+        try:
+            await self._inner.publish_batch(batch)
+            self.published += len(batch)
+        except Exception as e:
+            logger.error(
+                "Failed to publish event batch",
+                extra={"count": len(batch), "error": str(e)},
+            )
+            self._handle_failed_batch(batch)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _handle_failed_batch(self, batch: Sequence[QueuedEvent]) -> None:
+        """Keep unpublished events in the spill file, or count them as lost."""
+        if self._overflow_policy == "spill":
+            self._spill(batch)
+        else:
+            self.failed += len(batch)
+
+    def _spill(self, events: Sequence[QueuedEvent]) -> None:
+        """Append events to the spill journal."""
+        assert self._journal is not None
+        self._journal.append(events)
+        self.spilled += len(events)
+        self._spill_pending = True
+
+    async def _replay_spill(self) -> None:
+        """Publish spilled events in order; keep whatever could not be published."""
+        assert self._journal is not None
+        try:
+            self.published += await self._journal.replay(self._inner.publish_batch, self._flush_size)
+        except Exception as e:
+            logger.warning("Spill replay interrupted", extra={"error": str(e)})
+            await asyncio.sleep(self._flush_interval_seconds)
+            return
+        self._spill_pending = self._journal.pending
@@ -0,0 +1,140 @@
+"""
+Caching decorator for the URL repository port.
+
+Short code mappings are immutable once created, so the long URL lookups
+behind redirects can be served from a bounded, process-wide TTL/LRU cache
+instead of a database round trip. Unknown codes are cached too (negative caching) with
+a shorter TTL so that bots probing random codes do not reach the database.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Sequence, Set, Tuple
+
+from app.adapters.delegating_repository import DelegatingUrlRepository
+from app.models.url_mapping import UrlMapping
+from app.ports.repository import IUrlRepository
+
+_MISSING = object()
+
+
+class ShortCodeCache:
+    """
+    Bounded LRU cache of short code lookups with per-entry expiry.
+
+    Positive entries hold the resolved long URL, negative entries hold None.
+    The cache is shared by all requests of a worker process; it relies on the
+    single-threaded event loop and therefore needs no locking.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size <= 0:
+            raise ValueError("Cache max_size must be a positive integer")
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Optional[str]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, short_code: str) -> object:
+        """
+        Return the cached value for a short code.
+
+        Returns the long URL for positive entries, None for negative entries,
+        or the module-level missing sentinel when nothing valid is cached.
+        """
+        entry = self._entries.get(short_code)
+        if entry is None:
+            self.misses += 1
+            return _MISSING
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[short_code]
+            self.misses += 1
+            return _MISSING
+
+        self._entries.move_to_end(short_code)
+        self.hits += 1
+        return value
+
+    def put(self, short_code: str, value: Optional[str]) -> None:
+        """Store a lookup result, evicting the least recently used entry if full."""
+        ttl = self._ttl_seconds if value is not None else self._negative_ttl_seconds
+        if ttl <= 0:
+            return
+
+        self._entries[short_code] = (self._clock() + ttl, value)
+        self._entries.move_to_end(short_code)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, short_code: str) -> None:
+        """Drop any cached entry for the given short code."""
+        self._entries.pop(short_code, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the cache counters."""
+        return {
+            "size": len(self._entries),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class CachedUrlRepository(DelegatingUrlRepository):
+    """
+    IUrlRepository decorator that serves find_long_url from a ShortCodeCache.
+
+    All other operations are delegated to the wrapped repository. Writing a
+    mapping invalidates any (negative) entry for its short code; the new
+    long URL is cached on its next lookup, once it has been committed.
+    """
+
+    def __init__(self, inner: IUrlRepository, cache: ShortCodeCache):
+        super().__init__(inner)
+        self._cache = cache
+
+    async def save(self, url_mapping: UrlMapping) -> UrlMapping:
+        """Persist via the wrapped repository and invalidate the cached entry."""
+        saved = await self._inner.save(url_mapping)
+        self._cache.invalidate(url_mapping.short_code)
+        return saved
+
+    async def insert_if_absent(self, url_mapping: UrlMapping) -> Tuple[UrlMapping, bool]:
+        """Insert via the wrapped repository and invalidate the cached entry."""
+        result = await self._inner.insert_if_absent(url_mapping)
+        self._cache.invalidate(url_mapping.short_code)
+        return result
+
+    async def insert_many_if_absent(self, url_mappings: Sequence[UrlMapping]) -> Set[str]:
+        """Insert via the wrapped repository and invalidate the cached entries."""
+        inserted = await self._inner.insert_many_if_absent(url_mappings)
+        for url_mapping in url_mappings:
+            self._cache.invalidate(url_mapping.short_code)
+        return inserted
+
+    async def find_long_url(self, short_code: str) -> Optional[str]:
+        """Return the cached long URL, falling back to the wrapped repository."""
+        cached = self._cache.get(short_code)
+        if cached is not _MISSING:
+            return cached  # type: ignore[return-value]
+
+        long_url = await self._inner.find_long_url(short_code)
+        self._cache.put(short_code, long_url)
+        return long_url
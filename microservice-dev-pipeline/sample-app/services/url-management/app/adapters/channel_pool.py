@@ -0,0 +1,212 @@
+"""
+Pool of RabbitMQ channels for concurrent publishing.
+
+Publishing every event through one channel funnels all concurrent
+redirects into one ordered frame stream. The pool opens several channels,
+optionally spread over several connections (each with its own socket),
+and hands each publish to one of them:
+
+- round_robin: channels take turns.
+- least_busy:  the channel with the fewest publishes awaiting a confirm,
+               which steers traffic away from a slow channel.
+
+A channel found closed is skipped and reopened by a background task, so
+publishers move to the remaining channels instead of waiting for it.
+Events published on different channels may reach the exchange out of
+order.
+"""
+
+import asyncio
+import itertools
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import aio_pika
+
+logger = logging.getLogger(__name__)
+
+SELECTION_POLICIES = ("round_robin", "least_busy")
+
+Connect = Callable[[str], Awaitable[aio_pika.abc.AbstractRobustConnection]]
+
+
+class PooledChannel:
+    """One channel of the pool with its exchange handle and publish counters."""
+
+    __slots__ = ("index", "connection", "channel", "exchange", "in_flight", "published", "recoveries", "recovery")
+
+    def __init__(self, index: int, connection: aio_pika.abc.AbstractRobustConnection):
+        self.index = index
+        self.connection = connection
+        self.channel: Optional[aio_pika.abc.AbstractChannel] = None
+        self.exchange: Optional[aio_pika.abc.AbstractExchange] = None
+        self.in_flight = 0
+        self.published = 0
+        self.recoveries = 0
+        self.recovery: Optional[asyncio.Task] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the channel can take publishes."""
+        return self.exchange is not None and self.channel is not None and not self.channel.is_closed
+
+
+class ChannelPool:
+    """Publishes on a fixed set of confirm-mode channels, reopening those that close."""
+
+    def __init__(
+        self,
+        rabbitmq_url: str,
+        exchange_name: str,
+        connections: int = 1,
+        channels_per_connection: int = 4,
+        selection: str = "round_robin",
+        recovery_backoff_seconds: float = 1.0,
+        connect: Connect = aio_pika.connect_robust,
+    ):
+        if selection not in SELECTION_POLICIES:
+            raise ValueError(f"Unknown channel selection policy: {selection}")
+        if connections < 1 or channels_per_connection < 1:
+            raise ValueError("The channel pool needs at least one connection and one channel")
+        self._rabbitmq_url = rabbitmq_url
+        self._exchange_name = exchange_name
+        self._connection_count = connections
+        self._channels_per_connection = channels_per_connection
+        self._selection = selection
+        self._recovery_backoff_seconds = recovery_backoff_seconds
+        self._connect = connect
+        self._connections: List[aio_pika.abc.AbstractRobustConnection] = []
+        self._channels: List[PooledChannel] = []
+        self._turn = itertools.count()
+        self._closing = False
+
+    @property
+    def connected(self) -> bool:
+        """Whether connect() has opened the pool."""
+        return bool(self._channels)
+
+    async def connect(self) -> None:
+        """
+        Open the connections and their channels, declaring the exchange on each channel.
+
+        Does nothing if the pool is already connected. If any connection or
+        channel cannot be opened, the connections opened so far are closed
+        and the pool stays disconnected.
+        """
+        if self._channels:
+            return
+        connections: List[aio_pika.abc.AbstractRobustConnection] = []
+        channels: List[PooledChannel] = []
+        try:
+            for _ in range(self._connection_count):
+                connections.append(await self._connect(self._rabbitmq_url))
+            for connection in connections:
+                for _ in range(self._channels_per_connection):
+                    pooled = PooledChannel(len(channels), connection)
+                    await self._open(pooled)
+                    channels.append(pooled)
+        except BaseException:
+            for connection in connections:
+                try:
+                    await connection.close()
+                except Exception as e:
+                    logger.warning("Failed to close RabbitMQ connection", extra={"error": str(e)})
+            raise
+        self._closing = False
+        self._connections = connections
+        self._channels = channels
+
+    async def _open(self, pooled: PooledChannel) -> None:
+        pooled.channel = await pooled.connection.channel(publisher_confirms=True)
+        pooled.exchange = await pooled.channel.declare_exchange(
+            self._exchange_name, aio_pika.ExchangeType.TOPIC, durable=True
+        )
+
+    def _select(self) -> PooledChannel:
+        """Pick an open channel by the selection policy, scheduling recovery of closed ones."""
+        start = next(self._turn) % len(self._channels)
+        candidates = self._channels[start:] + self._channels[:start]
+        if self._selection == "least_busy":
+            candidates.sort(key=lambda pooled: pooled.in_flight)  # stable: ties keep their turn
+        for pooled in candidates:
+            if pooled.is_open:
+                return pooled
+            self._schedule_recovery(pooled)
+        raise RuntimeError("No open RabbitMQ channel is available")
+
+    def _schedule_recovery(self, pooled: PooledChannel) -> None:
+        if pooled.recovery is None and not self._closing:
+            pooled.recovery = asyncio.create_task(self._recover(pooled))
+
+    async def _recover(self, pooled: PooledChannel) -> None:
+        """Reopen a closed channel in the background, retrying until it is open again."""
+        try:
+            while not self._closing and not pooled.is_open:
+                try:
+                    await self._open(pooled)
+                    pooled.recoveries += 1
+                    logger.info("Reopened RabbitMQ channel", extra={"channel": pooled.index})
+                except Exception as e:
+                    logger.warning(
+                        "Failed to reopen RabbitMQ channel",
+                        extra={"channel": pooled.index, "error": str(e)},
+                    )
+                    await asyncio.sleep(self._recovery_backoff_seconds)
+        finally:
+            pooled.recovery = None
+
+    async def publish(self, message: aio_pika.Message, routing_key: str, timeout: Optional[float] = None) -> object:
+        """
+        Publish a message on one of the pooled channels.
+
+        Returns:
+            The broker's confirm of the message.
+
+        Raises:
+            RuntimeError: If the pool is not connected or no channel is open.
+        """
+        if not self._channels:
+            raise RuntimeError("Message broker is not connected. Call connect() first.")
+        pooled = self._select()
+        assert pooled.exchange is not None
+        pooled.in_flight += 1
+        try:
+            confirm = await pooled.exchange.publish(message, routing_key=routing_key, timeout=timeout)
+        except Exception:
+            if not pooled.is_open:
+                self._schedule_recovery(pooled)
+            raise
+        finally:
+            pooled.in_flight -= 1
+        pooled.published += 1
+        return confirm
+
+    async def close(self) -> None:
+        """Stop channel recovery, wait for it to wind down, then close the connections."""
+        self._closing = True
+        recoveries = [pooled.recovery for pooled in self._channels if pooled.recovery is not None]
+        for recovery in recoveries:
+            recovery.cancel()
+        await asyncio.gather(*recoveries, return_exceptions=True)
+        for connection in self._connections:
+            await connection.close()
+        self._connections = []
+        self._channels = []
+
+    def stats(self) -> Dict[str, object]:
+        """Return the selection policy and the state and counters of every channel."""
+        return {
+            "selection": self._selection,
+            "connections": len(self._connections),
+            "channels": [
+                {
+                    "channel": pooled.index,
+                    "connection": self._connections.index(pooled.connection),
+                    "open": pooled.is_open,
+                    "in_flight": pooled.in_flight,
+                    "published": pooled.published,
+                    "recoveries": pooled.recoveries,
+                }
+                for pooled in self._channels
+            ],
+        }
@@ -0,0 +1,168 @@
+"""
+Pipelined tracking of RabbitMQ publisher confirms.
+
+In confirm mode RabbitMQ acknowledges every message once it has taken
+responsibility for it (for persistent messages, once it is on disk), or
+nacks it if it could not. Waiting for each confirm before sending the next
+message costs a broker round trip per event; the pipeline instead keeps up
+to a bounded number of publishes outstanding and settles each one as its
+confirm arrives. A nacked publish, or one not confirmed in time, is sent
+again with exponential backoff, up to a retry limit, as is one whose
+channel closed under it, since the message may not have reached the broker.
+
+Delivery is at least once: a confirm lost in transit causes a retry of a
+message the broker may already hold, so consumers must tolerate duplicates;
+analytics skips events whose event_id it has already counted.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from aio_pika.exceptions import ChannelClosed, ChannelInvalidStateError, DeliveryError
+
+from app.metrics import (
+    broker_confirm_duration,
+    broker_publish_errors,
+    broker_publish_nacks,
+    broker_publishes_in_flight,
+)
+
+logger = logging.getLogger(__name__)
+
+# Failures worth sending the message again for, on another channel if its
+# own closed; anything else (e.g. no open channel at all) is left to the caller
+RETRYABLE_ERRORS = (DeliveryError, asyncio.TimeoutError, ChannelClosed, ChannelInvalidStateError)
+
+_in_flight_gauge = broker_publishes_in_flight.labels()
+
+
+class ConfirmPipeline:
+    """
+    Bounded set of publishes awaiting their publisher confirms.
+
+    publish() waits for the confirm of its message, while submit() only
+    waits for a free slot and leaves the confirm to be tracked in the
+    background; when all slots are taken both wait, which applies
+    backpressure to the caller.
+    """
+
+    def __init__(self, max_in_flight: int = 1000, max_retries: int = 3, retry_backoff_seconds: float = 0.05):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._max_retries = max_retries
+        self._retry_backoff_seconds = retry_backoff_seconds
+        self._background: Set[asyncio.Task] = set()
+        self.in_flight = 0
+        self.confirmed = 0
+        self.nacked = 0
+        self.retried = 0
+        self.failed = 0
+
+    async def publish(self, send: Callable[[], Awaitable[object]], routing_key: str) -> None:
+        """
+        Send a message and wait until it is confirmed.
+
+        Args:
+            send: Sends the message and resolves with its confirm; called
+                again for every retry.
+            routing_key: Routing key of the message, for metrics.
+
+        Raises:
+            DeliveryError: If the message was still nacked after the last retry.
+            asyncio.TimeoutError: If the last retry was not confirmed in time.
+        """
+        await self._slots.acquire()
+        try:
+            await self._confirm(send, routing_key)
+        finally:
+            self._slots.release()
+
+    async def submit(
+        self,
+        send: Callable[[], Awaitable[object]],
+        routing_key: str,
+        on_failure: Optional[Callable[[Exception], None]] = None,
+    ) -> None:
+        """
+        Send a message and track its confirm in the background.
+
+        Returns once a slot is free and the publish has started. A message
+        that cannot be confirmed within the retry limit is logged, counted
+        as a publish error and handed to on_failure, which must take it back
+        since the caller has already moved on.
+        """
+        await self._slots.acquire()
+        task = asyncio.create_task(self._confirm_in_background(send, routing_key, on_failure))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def drain(self) -> None:
+        """Wait until every background publish has been confirmed or has failed."""
+        while self._background:
+            await asyncio.gather(*self._background)
+
+    async def _confirm_in_background(
+        self,
+        send: Callable[[], Awaitable[object]],
+        routing_key: str,
+        on_failure: Optional[Callable[[Exception], None]],
+    ) -> None:
+        try:
+            await self._confirm(send, routing_key)
+        except Exception as e:
+            broker_publish_errors.labels(routing_key).inc()
+            logger.error(
+                "Event was not confirmed by the broker",
+                extra={"routing_key": routing_key, "error": str(e)},
+            )
+            if on_failure is not None:
+                on_failure(e)
+        finally:
+            self._slots.release()
+
+    async def _confirm(self, send: Callable[[], Awaitable[object]], routing_key: str) -> None:
+        """Send until confirmed, backing off between retries of nacked or timed out publishes."""
+        attempt = 0
+        while True:
+            self.in_flight += 1
+            _in_flight_gauge.inc()
+            started = time.perf_counter()
+            try:
+                await send()
+            except RETRYABLE_ERRORS as e:
+                self.nacked += 1
+                broker_publish_nacks.labels(routing_key).inc()
+                if attempt >= self._max_retries:
+                    self.failed += 1
+                    raise
+                logger.warning(
+                    "Publish not confirmed, retrying",
+                    extra={"routing_key": routing_key, "attempt": attempt, "error": str(e)},
+                )
+            except Exception:
+                self.failed += 1
+                raise
+            else:
+                broker_confirm_duration.labels(routing_key).observe(time.perf_counter() - started)
+                self.confirmed += 1
+                return
+            finally:
+                self.in_flight -= 1
+                _in_flight_gauge.dec()
+            self.retried += 1
+            await asyncio.sleep(self._retry_backoff_seconds * 2**attempt)
+            attempt += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the confirm counters."""
+        return {
+            "in_flight": self.in_flight,
+            "background": len(self._background),
+            "confirmed": self.confirmed,
+            "nacked": self.nacked,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
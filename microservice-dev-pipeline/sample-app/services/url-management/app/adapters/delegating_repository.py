@@ -0,0 +1,58 @@
+"""
+Base class for decorators of the URL repository port.
+
+Every method delegates to the wrapped repository, including find_long_url,
+whose port default would otherwise bypass the layers inside the decorator.
+Decorators subclass it and override only the operations they change, so a
+new port method reaches every layer without touching each decorator.
+"""
+
+from typing import Dict, Optional, Sequence, Set, Tuple
+
+from app.models.url_mapping import UrlMapping
+from app.ports.repository import IUrlRepository
+
+
+class DelegatingUrlRepository(IUrlRepository):
+    """IUrlRepository that passes every operation to the wrapped repository."""
+
+    def __init__(self, inner: IUrlRepository):
+        self._inner = inner
+
+    async def save(self, url_mapping: UrlMapping) -> UrlMapping:
+        """Delegate to the wrapped repository."""
+        return await self._inner.save(url_mapping)
+
+    async def insert_if_absent(self, url_mapping: UrlMapping) -> Tuple[UrlMapping, bool]:
+        """Delegate to the wrapped repository."""
+        return await self._inner.insert_if_absent(url_mapping)
+
+    async def insert_many_if_absent(self, url_mappings: Sequence[UrlMapping]) -> Set[str]:
+        """Delegate to the wrapped repository."""
+        return await self._inner.insert_many_if_absent(url_mappings)
+
+    async def find_by_short_code(self, short_code: str) -> Optional[UrlMapping]:
+        """Delegate to the wrapped repository."""
+        return await self._inner.find_by_short_code(short_code)
+
+    async def find_long_url(self, short_code: str) -> Optional[str]:
+        """Delegate to the wrapped repository."""
+        return await self._inner.find_long_url(short_code)
+
+    async def find_many_by_short_codes(
+        self, short_codes: Sequence[str]
+    ) -> Dict[str, UrlMapping]:
+        """Delegate to the wrapped repository."""
+        return await self._inner.find_many_by_short_codes(short_codes)
+
+    async def find_by_long_url(self, long_url: str) -> Optional[UrlMapping]:
+        """Delegate to the wrapped repository."""
+        return await self._inner.find_by_long_url(long_url)
+
+    async def find_many_by_long_urls(self, long_urls: Sequence[str]) -> Dict[str, UrlMapping]:
+        """Delegate to the wrapped repository."""
+        return await self._inner.find_many_by_long_urls(long_urls)
+
+    async def commit(self) -> None:
+        """Delegate to the wrapped repository."""
+        await self._inner.commit()
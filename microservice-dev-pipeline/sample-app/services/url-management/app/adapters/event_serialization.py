@@ -0,0 +1,27 @@
+"""
+Serialization helpers for events stored outside the message broker.
+
+Events that are buffered on disk or in the database are stored as JSON
+together with their type name, and rebuilt into contract models before
+being published.
+"""
+
+from typing import Dict, Type
+
+from pydantic import BaseModel
+
+from architecture.contracts.url_management_service import EVENTS_PUBLISHED
+
+EVENT_TYPES: Dict[str, Type[BaseModel]] = {
+    event_type.__name__: event_type for event_type in EVENTS_PUBLISHED
+}
+
+
+def event_from_json(event_type: str, payload: str) -> BaseModel:
+    """
+    Rebuild a published event from its type name and JSON payload.
+
+    Raises:
+        KeyError: If the event type is not published by this service.
+    """
+    return EVENT_TYPES[event_type].model_validate_json(payload)
@@ -0,0 +1,22 @@
+"""
+In-memory ID block allocator for testing.
+
+Leases consecutive blocks from a local counter.
+"""
+
+from app.ports.id_block_allocator import IIdBlockAllocator
+
+
+class InMemoryIdBlockAllocator(IIdBlockAllocator):
+    """In-memory implementation of the ID block allocator port for testing."""
+
+    def __init__(self, start: int = 1) -> None:
+        self._next_id = start
+        self.blocks_allocated = 0
+
+    async def allocate_block(self, size: int) -> int:
+        """Return the next block from the local counter."""
+        start = self._next_id
+        self._next_id += size
+        self.blocks_allocated += 1
+        return start
@@ -5,7 +5,7 @@ Used in unit tests to avoid database dependencies. Stores URL mappings
 in dictionaries for fast lookup by short code or long URL.
 """
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence, Set, Tuple
 
 from app.models.url_mapping import UrlMapping
 from app.ports.repository import IUrlRepository
@@ -27,14 +27,48 @@ class InMemoryUrlRepository(IUrlRepository):
         self._by_long_url[url_mapping.long_url] = url_mapping
         return url_mapping
 
+    async def insert_if_absent(self, url_mapping: UrlMapping) -> Tuple[UrlMapping, bool]:
+        """Store a URL mapping in memory unless its short code exists."""
+        existing = self._by_short_code.get(url_mapping.short_code)
+        if existing is not None:
+            return existing, False
+        return await self.save(url_mapping), True
+
+    async def insert_many_if_absent(self, url_mappings: Sequence[UrlMapping]) -> Set[str]:
+        """Store several URL mappings in memory, skipping existing short codes."""
+        inserted = set()
+        for url_mapping in url_mappings:
+            _, created = await self.insert_if_absent(url_mapping)
+            if created:
+                inserted.add(url_mapping.short_code)
+        return inserted
+
     async def find_by_short_code(self, short_code: str) -> Optional[UrlMapping]:
         """Look up a URL mapping by short code in memory."""
         return self._by_short_code.get(short_code)
 
+    async def find_many_by_short_codes(
+        self, short_codes: Sequence[str]
+    ) -> Dict[str, UrlMapping]:
+        """Look up several URL mappings by short code in memory."""
+        return {
+            short_code: self._by_short_code[short_code]
+            for short_code in short_codes
+            if short_code in self._by_short_code
+        }
+
     async def find_by_long_url(self, long_url: str) -> Optional[UrlMapping]:
         """Look up a URL mapping by long URL in memory."""
         return self._by_long_url.get(long_url)
 
+    async def find_many_by_long_urls(self, long_urls: Sequence[str]) -> Dict[str, UrlMapping]:
+        """Look up several URL mappings by long URL in memory."""
+        return {
+            long_url: self._by_long_url[long_url]
+            for long_url in long_urls
+            if long_url in self._by_long_url
+        }
+
     async def commit(self) -> None:
         """No-op for in-memory repository."""
         pass
@@ -0,0 +1,63 @@
+"""
+Timing decorator for the message broker port.
+
+Wraps the RabbitMQ broker so that every publish, whether made on the
+request path, by the buffered broker or by the outbox relay, is timed and
+counted per routing key in the broker metrics.
+"""
+
+import time
+from typing import Sequence, Tuple
+
+from pydantic import BaseModel
+
+from app.metrics import broker_publish_duration, broker_publish_errors, events_published
+from app.ports.message_broker import IMessageBroker
+
+
+class InstrumentedBroker(IMessageBroker):
+    """IMessageBroker decorator that records publish latency, counts and errors."""
+
+    def __init__(self, inner: IMessageBroker):
+        self._inner = inner
+
+    async def connect(self) -> None:
+        """Delegate to the wrapped broker."""
+        await self._inner.connect()
+
+    async def publish(self, event: BaseModel, routing_key: str) -> None:
+        """Publish via the wrapped broker, timing the call."""
+        started = time.perf_counter()
+        try:
+            await self._inner.publish(event, routing_key)
+        except Exception:
+            broker_publish_errors.labels(routing_key).inc()
+            raise
+        finally:
+            broker_publish_duration.labels(routing_key).observe(time.perf_counter() - started)
+        events_published.labels(routing_key).inc()
+
+    async def publish_batch(self, events: Sequence[Tuple[BaseModel, str]]) -> None:
+        """
+        Publish a batch via the wrapped broker, timing the call.
+
+        The batch duration is recorded once per routing key in the batch.
+        """
+        routing_keys = {routing_key for _, routing_key in events}
+        started = time.perf_counter()
+        try:
+            await self._inner.publish_batch(events)
+        except Exception:
+            for _, routing_key in events:
+                broker_publish_errors.labels(routing_key).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            for routing_key in routing_keys:
+                broker_publish_duration.labels(routing_key).observe(elapsed)
+        for _, routing_key in events:
+            events_published.labels(routing_key).inc()
+
+    async def close(self) -> None:
+        """Delegate to the wrapped broker."""
+        await self._inner.close()
@@ -0,0 +1,88 @@
+"""
+Timing decorator for the URL repository port.
+
+Records the duration of every repository call made by the service, and
+counts the calls that raise, in the repository metrics. The labelled
+metric children are resolved once at import, so a call costs two clock
+reads and a histogram observation.
+"""
+
+import time
+from typing import Awaitable, Dict, Optional, Sequence, Set, Tuple, TypeVar
+
+from app.adapters.delegating_repository import DelegatingUrlRepository
+from app.metrics import CounterChild, HistogramChild, repository_call_duration, repository_call_errors
+from app.models.url_mapping import UrlMapping
+
+T = TypeVar("T")
+
+_OPERATIONS = (
+    "save",
+    "insert_if_absent",
+    "insert_many_if_absent",
+    "find_by_short_code",
+    "find_long_url",
+    "find_many_by_short_codes",
+    "find_by_long_url",
+    "find_many_by_long_urls",
+    "commit",
+)
+_METRICS: Dict[str, Tuple[HistogramChild, CounterChild]] = {
+    operation: (repository_call_duration.labels(operation), repository_call_errors.labels(operation))
+    for operation in _OPERATIONS
+}
+
+
+async def _timed(operation: str, call: Awaitable[T]) -> T:
+    """Await a repository call, recording its duration and any error."""
+    duration, errors = _METRICS[operation]
+    started = time.perf_counter()
+    try:
+        return await call
+    except Exception:
+        errors.inc()
+        raise
+    finally:
+        duration.observe(time.perf_counter() - started)
+
+
+class InstrumentedUrlRepository(DelegatingUrlRepository):
+    """IUrlRepository decorator that times every call to the wrapped repository."""
+
+    async def save(self, url_mapping: UrlMapping) -> UrlMapping:
+        """Delegate to the wrapped repository, timing the call."""
+        return await _timed("save", self._inner.save(url_mapping))
+
+    async def insert_if_absent(self, url_mapping: UrlMapping) -> Tuple[UrlMapping, bool]:
+        """Delegate to the wrapped repository, timing the call."""
+        return await _timed("insert_if_absent", self._inner.insert_if_absent(url_mapping))
+
+    async def insert_many_if_absent(self, url_mappings: Sequence[UrlMapping]) -> Set[str]:
+        """Delegate to the wrapped repository, timing the call."""
+        return await _timed("insert_many_if_absent", self._inner.insert_many_if_absent(url_mappings))
+
+    async def find_by_short_code(self, short_code: str) -> Optional[UrlMapping]:
+        """Delegate to the wrapped repository, timing the call."""
+        return await _timed("find_by_short_code", self._inner.find_by_short_code(short_code))
+
+    async def find_long_url(self, short_code: str) -> Optional[str]:
+        """Delegate to the wrapped repository, timing the call."""
+        return await _timed("find_long_url", self._inner.find_long_url(short_code))
+
+    async def find_many_by_short_codes(
+        self, short_codes: Sequence[str]
+    ) -> Dict[str, UrlMapping]:
+        """Delegate to the wrapped repository, timing the call."""
+        return await _timed("find_many_by_short_codes", self._inner.find_many_by_short_codes(short_codes))
+
+    async def find_by_long_url(self, long_url: str) -> Optional[UrlMapping]:
+        """Delegate to the wrapped repository, timing the call."""
+        return await _timed("find_by_long_url", self._inner.find_by_long_url(long_url))
+
+    async def find_many_by_long_urls(self, long_urls: Sequence[str]) -> Dict[str, UrlMapping]:
+        """Delegate to the wrapped repository, timing the call."""
+        return await _timed("find_many_by_long_urls", self._inner.find_many_by_long_urls(long_urls))
+
+    async def commit(self) -> None:
+        """Delegate to the wrapped repository, timing the call."""
+        await _timed("commit", self._inner.commit())
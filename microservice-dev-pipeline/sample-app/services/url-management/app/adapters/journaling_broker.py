@@ -0,0 +1,170 @@
+"""
+Journaling message broker decorator for broker outages.
+
+While RabbitMQ is reachable, publishes pass straight through to the
+wrapped broker. When it is not, either because it was down at startup or
+because a publish failed, events are appended to a local SpillJournal
+instead, which costs the request no more than a buffered file write, and a
+background task keeps reconnecting. Once the broker accepts publishes
+again, the journal is replayed in order and in bulk, and publishing goes
+direct again only after the journal is empty, so events keep their order.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from app.adapters.spill_journal import SpillJournal
+from app.ports.message_broker import IMessageBroker
+
+logger = logging.getLogger(__name__)
+
+
+class JournalingBroker(IMessageBroker):
+    """IMessageBroker decorator that journals events locally while the wrapped broker is down."""
+
+    def __init__(
+        self,
+        inner: IMessageBroker,
+        journal: SpillJournal,
+        replay_batch_size: int = 500,
+        retry_interval_seconds: float = 1.0,
+    ):
+        self._inner = inner
+        self._journal = journal
+        self._replay_batch_size = replay_batch_size
+        self._retry_interval_seconds = retry_interval_seconds
+        self._connected = False
+        self._available = False
+        self._recovery: Optional[asyncio.Task] = None
+        self._closing = False
+        self.journaled = 0
+        self.outages = 0
+
+    @property
+    def available(self) -> bool:
+        """Whether events are currently published directly."""
+        return self._available
+
+    async def connect(self) -> None:
+        """
+        Connect the wrapped broker, or keep trying in the background if it is unreachable.
+
+        Never raises: the service starts and journals events until the
+        broker can be reached. Events journaled before a restart are
+        replayed first.
+        """
+        try:
+            await self._inner.connect()
+            self._connected = True
+        except Exception as e:
+            logger.warning(
+                "Message broker unreachable, journaling events until it recovers",
+                extra={"error": str(e)},
+            )
+            self.outages += 1
+        if self._connected and not self._journal.pending:
+            self._available = True
+        else:
+            self._start_recovery()
+
+    async def publish(self, event: BaseModel, routing_key: str) -> None:
+        """Publish directly while the broker is available, journal the event otherwise."""
+        if self._available:
+            try:
+                await self._inner.publish(event, routing_key)
+                return
+            except Exception as e:
+                self._enter_outage(e)
+        self._append([(event, routing_key)])
+
+    async def publish_batch(self, events: Sequence[Tuple[BaseModel, str]]) -> None:
+        """Publish a batch directly while the broker is available, journal it otherwise."""
+        if self._available:
+            try:
+                await self._inner.publish_batch(events)
+                return
+            except Exception as e:
+                self._enter_outage(e)
+        self._append(events)
+
+    def journal_undelivered(self, event: BaseModel, routing_key: str, error: Exception) -> None:
+        """
+        Take back an event the wrapped broker accepted but could not deliver.
+
+        Used as the undelivered handler of async publisher confirms: the
+        event is journaled and, as for a failed publish, later events are
+        journaled too until the journal has been replayed.
+        """
+        self._enter_outage(error)
+        self._append([(event, routing_key)])
+
+    def _enter_outage(self, error: Exception) -> None:
+        if self._available:
+            self._available = False
+            self.outages += 1
+            logger.warning(
+                "Publishing failed, journaling events until the broker recovers",
+                extra={"error": str(error)},
+            )
+
+    def _append(self, events: Sequence[Tuple[BaseModel, str]]) -> None:
+        self._journal.append(events)
+        self.journaled += len(events)
+        self._start_recovery()
+
+    def _start_recovery(self) -> None:
+        if self._closing:
+            # Events handed back while closing are replayed on the next start
+            return
+        if self._recovery is None or self._recovery.done():
+            self._recovery = asyncio.create_task(self._recover())
+
+    async def _recover(self) -> None:
+        """Reconnect if needed and replay the journal until it is empty, then publish directly again."""
+        while True:
+            try:
+                if not self._connected:
+                    await self._inner.connect()
+                    self._connected = True
+                    logger.info("Message broker connected")
+                await self._journal.replay(self._inner.publish_batch, self._replay_batch_size)
+            except Exception as e:
+                logger.warning("Message broker still unavailable", extra={"error": str(e)})
+                await asyncio.sleep(self._retry_interval_seconds)
+                continue
+            if not self._journal.pending:
+                self._available = True
+                logger.info("Message broker recovered, publishing directly")
+                return
+
+    async def close(self) -> None:
+        """
+        Stop recovering, close the wrapped broker, then make the journal durable.
+
+        The wrapped broker is closed first because settling its outstanding
+        confirms may still hand undelivered events to the journal.
+        """
+        self._closing = True
+        if self._recovery is not None:
+            self._recovery.cancel()
+            try:
+                await self._recovery
+            except asyncio.CancelledError:
+                pass
+            self._recovery = None
+        if self._connected:
+            await self._inner.close()
+        await self._journal.close()
+
+    def stats(self) -> Dict[str, object]:
+        """Return whether events are published directly and the journal counters."""
+        return {
+            "available": self._available,
+            "journal_pending": self._journal.pending,
+            "journaled": self.journaled,
+            "outages": self.outages,
+            **self._journal.stats(),
+        }
@@ -0,0 +1,143 @@
+"""
+Lazily acquired, eagerly released database sessions.
+
+A request that is answered from a cache, rejected by validation or turned
+away by a negative lookup should not pay for a database session at all, and
+a request that does use the database should hold its connection only for
+the unit of work, not until the response has been sent.
+
+LazySession opens its AsyncSession on first use, and LazySessionUrlRepository
+releases it as soon as the unit of work is over: right after a read when no
+write is pending, and right after the commit otherwise.
+"""
+
+from typing import Awaitable, Callable, Dict, Optional, Sequence, Set, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.url_mapping import UrlMapping
+from app.ports.repository import IUrlRepository
+
+T = TypeVar("T")
+
+
+class LazySession:
+    """Request-scoped holder of an AsyncSession that is only created when needed."""
+
+    def __init__(self, session_maker: async_sessionmaker):
+        self._session_maker = session_maker
+        self._session: Optional[AsyncSession] = None
+        self.opened = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether a session is currently open."""
+        return self._session is not None
+
+    def get(self) -> AsyncSession:
+        """Return the open session, creating it on first use."""
+        if self._session is None:
+            self._session = self._session_maker()
+            self.opened += 1
+        return self._session
+
+    async def release(self) -> None:
+        """Close the session, rolling back anything uncommitted and returning its connection."""
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+
+class LazySessionUrlRepository(IUrlRepository):
+    """
+    IUrlRepository that runs each operation on a LazySession.
+
+    Operations are executed by a repository built over the current session
+    (PostgresUrlRepository in production). The session is released after
+    every operation that leaves no uncommitted write behind.
+    """
+
+    def __init__(
+        self,
+        lazy_session: LazySession,
+        repository_factory: Callable[[AsyncSession], IUrlRepository],
+    ):
+        self._lazy_session = lazy_session
+        self._repository_factory = repository_factory
+        self._pending_write = False
+
+    async def _run(self, operation: Callable[[IUrlRepository], Awaitable[T]]) -> T:
+        """Run an operation on the session and release it if no write is pending."""
+        try:
+            return await operation(self._repository_factory(self._lazy_session.get()))
+        finally:
+            if not self._pending_write:
+                await self._lazy_session.release()
+
+    async def _run_write(
+        self,
+        operation: Callable[[IUrlRepository], Awaitable[T]],
+        wrote: Callable[[T], bool],
+    ) -> T:
+        """Run a write, keeping the session until commit if it left anything to commit."""
+        pending = self._pending_write
+        self._pending_write = True
+        try:
+            result = await operation(self._repository_factory(self._lazy_session.get()))
+            pending = pending or wrote(result)
+            return result
+        finally:
+            self._pending_write = pending
+            if not pending:
+                await self._lazy_session.release()
+
+    async def save(self, url_mapping: UrlMapping) -> UrlMapping:
+        """Persist a mapping; the session is kept until commit."""
+        return await self._run_write(lambda repository: repository.save(url_mapping), lambda _: True)
+
+    async def insert_if_absent(self, url_mapping: UrlMapping) -> Tuple[UrlMapping, bool]:
+        """Insert a mapping; the session is kept until commit only if a row was inserted."""
+        return await self._run_write(
+            lambda repository: repository.insert_if_absent(url_mapping),
+            lambda result: result[1],
+        )
+
+    async def insert_many_if_absent(self, url_mappings: Sequence[UrlMapping]) -> Set[str]:
+        """Insert mappings; the session is kept until commit only if rows were inserted."""
+        return await self._run_write(
+            lambda repository: repository.insert_many_if_absent(url_mappings),
+            bool,
+        )
+
+    async def find_by_short_code(self, short_code: str) -> Optional[UrlMapping]:
+        """Look up a mapping on the lazily opened session."""
+        return await self._run(lambda repository: repository.find_by_short_code(short_code))
+
+    async def find_long_url(self, short_code: str) -> Optional[str]:
+        """Look up a long URL on the lazily opened session."""
+        return await self._run(lambda repository: repository.find_long_url(short_code))
+
+    async def find_many_by_short_codes(
+        self, short_codes: Sequence[str]
+    ) -> Dict[str, UrlMapping]:
+        """Look up mappings on the lazily opened session."""
+        return await self._run(lambda repository: repository.find_many_by_short_codes(short_codes))
+
+    async def find_by_long_url(self, long_url: str) -> Optional[UrlMapping]:
+        """Look up a mapping on the lazily opened session."""
+        return await self._run(lambda repository: repository.find_by_long_url(long_url))
+
+    async def find_many_by_long_urls(self, long_urls: Sequence[str]) -> Dict[str, UrlMapping]:
+        """Look up mappings on the lazily opened session."""
+        return await self._run(lambda repository: repository.find_many_by_long_urls(long_urls))
+
+    async def commit(self) -> None:
+        """Commit the unit of work and release the session."""
+        if not self._lazy_session.active:
+            self._pending_write = False
+            return
+        try:
+            await self._lazy_session.get().commit()
+        finally:
+            self._pending_write = False
+            await self._lazy_session.release()
@@ -0,0 +1,52 @@
+"""
+Transactional outbox adapter for the message broker port.
+
+Instead of talking to RabbitMQ, publish() writes the event to the
+event_outbox table using the request's database session (or a factory
+returning it, so the session is only opened when an event is published).
+The outbox relay publishes the stored rows to the broker in the
+background, so a broker outage neither fails requests nor loses events.
+"""
+
+from typing import Callable, Union
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.outbox_event import OutboxEvent
+from app.ports.message_broker import IMessageBroker
+from app.tracing import tracer
+
+
+class OutboxBroker(IMessageBroker):
+    """IMessageBroker implementation that stores events in the outbox table."""
+
+    def __init__(self, session: Union[AsyncSession, Callable[[], AsyncSession]]):
+        self._session_source = session
+
+    def _session(self) -> AsyncSession:
+        if isinstance(self._session_source, AsyncSession):
+            return self._session_source
+        return self._session_source()
+
+    async def connect(self) -> None:
+        """No-op: the outbox uses the database session it was given."""
+        pass
+
+    async def publish(self, event: BaseModel, routing_key: str) -> None:
+        """
+        Store the event in the outbox and commit.
+
+        The commit also persists any pending writes made through the same
+        session, so the event and the state change it describes are atomic.
+        """
+        session = self._session()
+        session.add(
+            OutboxEvent(
+                event_type=type(event).__name__,
+                routing_key=routing_key,
+                payload=event.model_dump_json(),
+                traceparent=tracer.current_traceparent(),
+            )
+        )
+        await session.commit()
@@ -0,0 +1,114 @@
+"""
+Background relay from the event outbox to the message broker.
+
+Reads pending outbox rows in bulk, publishes them as one batch and deletes
+the published rows in a single statement. Rows are claimed with
+FOR UPDATE SKIP LOCKED so several workers can relay concurrently without
+publishing the same event twice.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.adapters.event_serialization import event_from_json
+from app.models.outbox_event import OutboxEvent
+from app.ports.message_broker import IMessageBroker
+from app.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """Publishes outbox rows to the broker from a background task."""
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        broker: IMessageBroker,
+        batch_size: int,
+        poll_interval_seconds: float,
+    ):
+        self._session_maker = session_maker
+        self._broker = broker
+        self._batch_size = batch_size
+        self._poll_interval_seconds = poll_interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self.published = 0
+
+    async def relay_batch(self) -> int:
+        """
+        Publish and delete one batch of pending outbox rows.
+
+        Returns:
+            The number of events relayed.
+        """
+        async with self._session_maker() as session:
+            stmt = (
+                select(
+                    OutboxEvent.id,
+                    OutboxEvent.event_type,
+                    OutboxEvent.routing_key,
+                    OutboxEvent.payload,
+                    OutboxEvent.traceparent,
+                )
+                .order_by(OutboxEvent.id)
+                .limit(self._batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = (await session.execute(stmt)).all()
+            if not rows:
+                await session.rollback()
+                return 0
+
+            events = []
+            for row in rows:
+                event = event_from_json(row.event_type, row.payload)
+                tracer.attach_traceparent(event, row.traceparent)
+                events.append((event, row.routing_key))
+            await self._broker.publish_batch(events)
+
+            await session.execute(
+                delete(OutboxEvent).where(OutboxEvent.id.in_([row.id for row in rows]))
+            )
+            await session.commit()
+
+        self.published += len(rows)
+        return len(rows)
+
+    def start(self) -> None:
+        """Start the relay loop as a background task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the relay loop, then relay whatever is still pending once."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        try:
+            while await self.relay_batch() == self._batch_size:
+                pass
+        except Exception as e:
+            logger.warning("Could not flush outbox on shutdown", extra={"error": str(e)})
+
+    async def _run(self) -> None:
+        """Relay continuously; poll when the outbox is drained or the broker fails."""
+        while True:
+            try:
+                relayed = await self.relay_batch()
+            except Exception as e:
+                logger.warning("Outbox relay failed, retrying", extra={"error": str(e)})
+                relayed = 0
+
+            if relayed < self._batch_size:
+                await asyncio.sleep(self._poll_interval_seconds)
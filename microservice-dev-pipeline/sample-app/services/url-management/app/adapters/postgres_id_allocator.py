@@ -0,0 +1,36 @@
+"""
+PostgreSQL ID block allocator.
+
+Leases blocks of IDs from a counter row with a single upsert, in its own
+short transaction so the row lock is never held across a request.
+"""
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.id_block_counter import IdBlockCounter
+from app.ports.id_block_allocator import IIdBlockAllocator
+
+
+class PostgresIdBlockAllocator(IIdBlockAllocator):
+    """PostgreSQL implementation of the ID block allocator port."""
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession], counter_name: str):
+        self._session_maker = session_maker
+        self._counter_name = counter_name
+
+    async def allocate_block(self, size: int) -> int:
+        """Advance the counter by size and return the start of the leased block."""
+        stmt = (
+            insert(IdBlockCounter)
+            .values(name=self._counter_name, next_id=1 + size)
+            .on_conflict_do_update(
+                index_elements=[IdBlockCounter.name],
+                set_={"next_id": IdBlockCounter.next_id + size},
+            )
+            .returning(IdBlockCounter.next_id)
+        )
+        async with self._session_maker() as session:
+            next_id = (await session.execute(stmt)).scalar_one()
+            await session.commit()
+        return next_id - size
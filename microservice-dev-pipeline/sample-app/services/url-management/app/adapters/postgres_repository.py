@@ -5,14 +5,22 @@ Implements the IUrlRepository port using SQLAlchemy async sessions
 for production database access.
 """
 
-from typing import Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import String, any_, bindparam, literal, select, union_all
+from sqlalchemy.dialects.postgresql import ARRAY, BYTEA, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.url_mapping import UrlMapping
+from app.models.url_mapping import UrlMapping, long_url_digest
 from app.ports.repository import IUrlRepository
 
+# Built once at import; SQLAlchemy caches its compiled form, and asyncpg
+# prepares it once per connection.
+_FIND_LONG_URL = select(UrlMapping.long_url).where(
+    UrlMapping.short_code == bindparam("short_code")
+)
+
 
 class PostgresUrlRepository(IUrlRepository):
     """PostgreSQL implementation of the URL repository port."""
@@ -26,17 +34,179 @@ class PostgresUrlRepository(IUrlRepository):
         await self._session.flush()
         return url_mapping
 
+    async def insert_if_absent(self, url_mapping: UrlMapping) -> Tuple[UrlMapping, bool]:
+        """
+        Insert a URL mapping, or return the row already stored under its short code.
+
+        A single statement combines INSERT ... ON CONFLICT DO NOTHING RETURNING
+        with a lookup of the conflicting row, so both outcomes cost one round
+        trip and concurrent duplicates never raise.
+        """
+        inserted = (
+            insert(UrlMapping)
+            .values(
+                short_code=url_mapping.short_code,
+                long_url=url_mapping.long_url,
+                long_url_hash=long_url_digest(url_mapping.long_url),
+                created_at=url_mapping.created_at,
+            )
+            .on_conflict_do_nothing(index_elements=[UrlMapping.short_code])
+            .returning(UrlMapping.id, UrlMapping.long_url, UrlMapping.created_at)
+            .cte("inserted")
+        )
+        stmt = union_all(
+            select(
+                inserted.c.id,
+                inserted.c.long_url,
+                inserted.c.created_at,
+                literal(True).label("created"),
+            ),
+            select(
+                UrlMapping.id,
+                UrlMapping.long_url,
+                UrlMapping.created_at,
+                literal(False).label("created"),
+            ).where(UrlMapping.short_code == url_mapping.short_code),
+        )
+        row = (await self._session.execute(stmt)).first()
+
+        if row is None:
+            # The conflicting row was committed after this statement's snapshot
+            existing = await self.find_by_short_code(url_mapping.short_code)
+            if existing is None:
+                raise RuntimeError(f"Conflicting row for {url_mapping.short_code} vanished")
+            return existing, False
+
+        if row.created:
+            url_mapping.id = row.id
+            return url_mapping, True
+        return (
+            UrlMapping(
+                id=row.id,
+                short_code=url_mapping.short_code,
+                long_url=row.long_url,
+                created_at=row.created_at,
+            ),
+            False,
+        )
+
+    async def insert_many_if_absent(self, url_mappings: Sequence[UrlMapping]) -> Set[str]:
+        """
+        Insert several URL mappings with one multi-row INSERT ... ON CONFLICT DO NOTHING.
+
+        Callers should keep each call below a few thousand rows to stay within
+        the driver's bind parameter limit.
+        """
+        if not url_mappings:
+            return set()
+        stmt = (
+            insert(UrlMapping)
+            .values(
+                [
+                    {
+                        "short_code": url_mapping.short_code,
+                        "long_url": url_mapping.long_url,
+                        "long_url_hash": long_url_digest(url_mapping.long_url),
+                        "created_at": url_mapping.created_at,
+                    }
+                    for url_mapping in url_mappings
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[UrlMapping.short_code])
+            .returning(UrlMapping.short_code)
+        )
+        result = await self._session.execute(stmt)
+        return set(result.scalars().all())
+
     async def find_by_short_code(self, short_code: str) -> Optional[UrlMapping]:
         """Find a URL mapping by short code in PostgreSQL."""
         stmt = select(UrlMapping).where(UrlMapping.short_code == short_code)
         result = await self._session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def find_long_url(self, short_code: str) -> Optional[str]:
+        """Select only the long URL column, without hydrating a UrlMapping entity."""
+        result = await self._session.execute(_FIND_LONG_URL, {"short_code": short_code})
+        return result.scalar_one_or_none()
+
+    async def find_long_urls(self, short_codes: Sequence[str]) -> Dict[str, str]:
+        """Select only the long URLs of several short codes with one ANY(...) query."""
+        if not short_codes:
+            return {}
+        codes = bindparam("short_codes", list(short_codes), type_=ARRAY(String))
+        stmt = select(UrlMapping.short_code, UrlMapping.long_url).where(
+            UrlMapping.short_code == any_(codes)
+        )
+        result = await self._session.execute(stmt)
+        return {row.short_code: row.long_url for row in result}
+
+    async def find_many_by_short_codes(
+        self, short_codes: Sequence[str]
+    ) -> Dict[str, UrlMapping]:
+        """Find URL mappings for several short codes with one ANY(...) query."""
+        if not short_codes:
+            return {}
+        codes = bindparam("short_codes", list(short_codes), type_=ARRAY(String))
+        stmt = select(UrlMapping).where(UrlMapping.short_code == any_(codes))
+        result = await self._session.execute(stmt)
+        return {url_mapping.short_code: url_mapping for url_mapping in result.scalars()}
+
     async def find_by_long_url(self, long_url: str) -> Optional[UrlMapping]:
-        """Find a URL mapping by long URL in PostgreSQL."""
-        stmt = select(UrlMapping).where(UrlMapping.long_url == long_url)
+        """
+        Find a URL mapping by long URL in PostgreSQL.
+
+        Uses the fixed-width digest index, then compares the full URL so a
+        digest collision can never return the wrong mapping.
+        """
+        stmt = select(UrlMapping).where(
+            UrlMapping.long_url_hash == long_url_digest(long_url),
+            UrlMapping.long_url == long_url,
+        )
         result = await self._session.execute(stmt)
-        return result.scalar_one_or_none()
+        return result.scalars().first()
+
+    async def find_many_by_long_urls(self, long_urls: Sequence[str]) -> Dict[str, UrlMapping]:
+        """Find URL mappings for several long URLs through the digest index."""
+        if not long_urls:
+            return {}
+        digests = bindparam(
+            "long_url_hashes",
+            [long_url_digest(long_url) for long_url in long_urls],
+            type_=ARRAY(BYTEA),
+        )
+        stmt = select(UrlMapping).where(UrlMapping.long_url_hash == any_(digests))
+        result = await self._session.execute(stmt)
+        wanted = set(long_urls)
+        return {
+            url_mapping.long_url: url_mapping
+            for url_mapping in result.scalars()
+            if url_mapping.long_url in wanted
+        }
+
+    async def list_short_codes(
+        self, after_id: int, limit: int, created_after: Optional[datetime] = None
+    ) -> List[Tuple[int, str]]:
+        """
+        Page through stored short codes in ID order.
+
+        Args:
+            after_id: Only rows with a larger ID are returned.
+            limit: Maximum number of rows to return.
+            created_after: If given, only rows created after this time are returned.
+
+        Returns:
+            (id, short_code) pairs ordered by ID.
+        """
+        stmt = (
+            select(UrlMapping.id, UrlMapping.short_code)
+            .where(UrlMapping.id > after_id)
+            .order_by(UrlMapping.id)
+            .limit(limit)
+        )
+        if created_after is not None:
+            stmt = stmt.where(UrlMapping.created_at > created_after)
+        result = await self._session.execute(stmt)
+        return [(row.id, row.short_code) for row in result]
 
     async def commit(self) -> None:
         """Commit the current database transaction."""
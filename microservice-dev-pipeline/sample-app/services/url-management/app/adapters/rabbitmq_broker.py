@@ -2,58 +2,159 @@
 RabbitMQ message broker adapter.
 
 Implements the IMessageBroker port using aio-pika for production
-event publishing to RabbitMQ.
+event publishing to RabbitMQ. Messages are published on a pool of
+confirm-mode channels through a ConfirmPipeline, so batches keep many
+publishes in flight while their confirms arrive; in the "async" confirm
+mode single publishes do not wait for their confirm either, and events that
+are finally not confirmed are handed to an undelivered handler. While
+tracing is enabled, every message carries a W3C traceparent and its publish
+time in its headers, so the consumer can continue the trace and measure how
+long the message waited in the queue. The traceparent is the one attached
+to the event when it was queued or stored, otherwise that of the publish
+span.
 """
 
+import asyncio
 import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional, Sequence, Tuple
 
 import aio_pika
 from pydantic import BaseModel
 
+from app.adapters.channel_pool import ChannelPool
+from app.adapters.confirm_pipeline import ConfirmPipeline
 from app.ports.message_broker import IMessageBroker
+from app.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
 
+CONFIRM_MODES = ("wait", "async")
+
+UndeliveredHandler = Callable[[BaseModel, str, Exception], None]
+
+
 class RabbitMQBroker(IMessageBroker):
-    """RabbitMQ implementation of the message broker port."""
+    """
+    RabbitMQ implementation of the message broker port.
 
-    def __init__(self, rabbitmq_url: str, exchange_name: str):
+    With the "wait" confirm mode publish() returns once RabbitMQ has
+    confirmed the event; with "async" it returns once the event is sent and
+    the confirm is tracked in the background. Since the caller has moved on
+    by then, async mode needs an undelivered handler to take back events that
+    are finally not confirmed; until one is set, publish() waits as in "wait"
+    mode. Batches always wait for their confirms. Unconfirmed publishes are
+    retried after confirm_timeout_seconds.
+    """
+
+    def __init__(
+        self,
+        rabbitmq_url: str,
+        exchange_name: str,
+        confirm_mode: str = "wait",
+        confirm_timeout_seconds: Optional[float] = 10.0,
+        confirm_pipeline: Optional[ConfirmPipeline] = None,
+        channel_pool: Optional[ChannelPool] = None,
+    ):
+        if confirm_mode not in CONFIRM_MODES:
+            raise ValueError(f"Unknown confirm mode: {confirm_mode}")
         self.rabbitmq_url = rabbitmq_url
         self.exchange_name = exchange_name
-        self._connection: aio_pika.abc.AbstractRobustConnection | None = None
-        self._channel: aio_pika.abc.AbstractChannel | None = None
-        self._exchange: aio_pika.abc.AbstractExchange | None = None
+        self._confirm_mode = confirm_mode
+        self._confirm_timeout_seconds = confirm_timeout_seconds
+        self.confirms = confirm_pipeline or ConfirmPipeline()
+        self.channels = channel_pool or ChannelPool(rabbitmq_url, exchange_name)
+        self._undelivered: Optional[UndeliveredHandler] = None
+
+    def on_undelivered(self, handler: UndeliveredHandler) -> None:
+        """Set the handler that takes back async-mode events that could not be confirmed."""
+        self._undelivered = handler
 
     async def connect(self) -> None:
-        """Establish connection to RabbitMQ and declare the exchange."""
-        self._connection = await aio_pika.connect_robust(self.rabbitmq_url)
-        self._channel = await self._connection.channel()
-        self._exchange = await self._channel.declare_exchange(
-            self.exchange_name,
-            aio_pika.ExchangeType.TOPIC,
-            durable=True,
-        )
+        """Open the channel pool's connections and declare the exchange on each channel."""
+        await self.channels.connect()
         logger.info("Connected to RabbitMQ", extra={"exchange": self.exchange_name})
 
     async def publish(self, event: BaseModel, routing_key: str) -> None:
         """Publish an event to the RabbitMQ exchange."""
-        if self._exchange is None:
+        if not self.channels.connected:
             raise RuntimeError("Message broker is not connected. Call connect() first.")
 
-        message = aio_pika.Message(
-            body=event.model_dump_json().encode(),
-            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
-            content_type="application/json",
-        )
-        await self._exchange.publish(message, routing_key=routing_key)
+        with tracer.start_span("publish", attributes={"routing_key": routing_key}):
+            message = self._build_message(event, self._trace_headers(event))
+            if self._confirm_mode == "async" and self._undelivered is not None:
+                handler = self._undelivered
+                await self.confirms.submit(
+                    self._sender(message, routing_key),
+                    routing_key,
+                    lambda error: handler(event, routing_key, error),
+                )
+            else:
+                await self.confirms.publish(self._sender(message, routing_key), routing_key)
         logger.info(
             "Event published",
             extra={"routing_key": routing_key, "event_type": type(event).__name__},
         )
 
+    async def publish_batch(self, events: Sequence[Tuple[BaseModel, str]]) -> None:
+        """
+        Publish several events with their publishes pipelined on the channel.
+
+        Returns once every event is confirmed. If any event could not be
+        confirmed, the first error is raised after all others have settled;
+        the caller's retry may then re-publish events that were confirmed.
+        """
+        if not self.channels.connected:
+            raise RuntimeError("Message broker is not connected. Call connect() first.")
+
+        with tracer.start_span("publish_batch", attributes={"count": len(events)}):
+            results = await asyncio.gather(
+                *(
+                    self.confirms.publish(
+                        self._sender(self._build_message(event, self._trace_headers(event)), routing_key),
+                        routing_key,
+                    )
+                    for event, routing_key in events
+                ),
+                return_exceptions=True,
+            )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+        logger.info("Event batch published", extra={"count": len(events)})
+
+    def _sender(self, message: aio_pika.Message, routing_key: str) -> Callable[[], Awaitable[object]]:
+        """Return a callable that publishes the message on a pooled channel and resolves with its confirm."""
+
+        def send() -> Awaitable[object]:
+            return self.channels.publish(message, routing_key, timeout=self._confirm_timeout_seconds)
+
+        return send
+
+    @staticmethod
+    def _trace_headers(event: Optional[BaseModel] = None) -> Optional[Dict[str, str]]:
+        """Return the trace context headers of the event or the active span, or None while tracing is off."""
+        if not tracer.enabled:
+            return None
+        traceparent = tracer.attached_traceparent(event) or tracer.current_traceparent()
+        if traceparent is None:
+            return None
+        return {"traceparent": traceparent, "x-published-at": repr(time.time())}
+
+    @staticmethod
+    def _build_message(event: BaseModel, headers: Optional[Dict[str, str]] = None) -> aio_pika.Message:
+        """Serialize an event into a persistent JSON message."""
+        return aio_pika.Message(
+            body=event.model_dump_json().encode(),
+            headers=headers,
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            content_type="application/json",
+        )
+
     async def close(self) -> None:
-        """Close the RabbitMQ connection."""
-        if self._connection:
-            await self._connection.close()
+        """Wait for outstanding confirms, then close the RabbitMQ connections."""
+        await self.confirms.drain()
+        if self.channels.connected:
+            await self.channels.close()
             logger.info("Disconnected from RabbitMQ")
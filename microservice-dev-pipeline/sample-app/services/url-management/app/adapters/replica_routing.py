@@ -0,0 +1,304 @@
+"""
+Read-replica routing for URL lookups.
+
+Lookups are spread round-robin over the healthy read replicas, while writes
+go to the primary. A background health check measures each replica's
+replication lag and takes replicas that lag too far behind, or fail to
+answer, out of rotation until they recover.
+
+Routing keeps the primary's semantics:
+
+- once a repository instance has written, all of its reads stay on the
+  primary (read-your-writes within a request);
+- a lookup that finds nothing on a replica is confirmed on the primary,
+  since the mapping may simply not have replicated yet. Optionally, misses
+  on a replica whose last measured lag was zero are trusted unless this
+  process wrote within the lag window; that spares the primary unknown
+  codes (bot traffic) but gives up read-after-write for mappings created
+  by other processes, as the lag may have grown since it was measured;
+- a replica error falls back to the primary and marks the replica unhealthy.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Sequence, Set, Tuple, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.adapters.delegating_repository import DelegatingUrlRepository
+from app.adapters.postgres_repository import PostgresUrlRepository
+from app.models.url_mapping import UrlMapping
+from app.ports.repository import IUrlRepository
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Zero on a primary or a fully caught-up standby, otherwise the age of the
+# last replayed transaction.
+REPLICATION_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReadReplica:
+    """One read replica database, reachable through its own session factory."""
+
+    def __init__(self, name: str, session_maker: async_sessionmaker):
+        self.name = name
+        self._session_maker = session_maker
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.reads = 0
+        self.failures = 0
+
+    @asynccontextmanager
+    async def repository(self) -> AsyncIterator[IUrlRepository]:
+        """Provide a repository bound to a short-lived session on this replica."""
+        async with self._session_maker() as session:
+            yield PostgresUrlRepository(session)
+
+    async def measure_lag(self) -> float:
+        """Return the replication lag of this replica in seconds."""
+        async with self._session_maker() as session:
+            result = await session.execute(REPLICATION_LAG_SQL)
+            return float(result.scalar_one())
+
+
+class ReplicaPool:
+    """
+    Process-wide set of read replicas with round-robin selection and health checks.
+
+    Replicas start out of rotation and join it after their first successful
+    health check.
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[ReadReplica],
+        max_lag_seconds: float = 5.0,
+        check_interval_seconds: float = 5.0,
+        check_timeout_seconds: float = 2.0,
+        trust_caught_up_misses: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._replicas = list(replicas)
+        self._max_lag_seconds = max_lag_seconds
+        self._check_interval_seconds = check_interval_seconds
+        self._check_timeout_seconds = check_timeout_seconds
+        self._trust_caught_up_misses = trust_caught_up_misses
+        self._cursor = itertools.count()
+        self._clock = clock
+        self._last_write = -math.inf
+        self._task: Optional[asyncio.Task] = None
+        self.primary_reads = 0
+        self.miss_confirmations = 0
+
+    def choose(self) -> Optional[ReadReplica]:
+        """Return the next healthy replica in round-robin order, or None if there is none."""
+        healthy = [replica for replica in self._replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._cursor) % len(healthy)]
+
+    def record_write(self) -> None:
+        """Note that this process is writing to the primary."""
+        self._last_write = self._clock()
+
+    def may_be_behind(self, replica: ReadReplica) -> bool:
+        """Whether a miss on the replica could be a mapping that has not replicated yet."""
+        if not self._trust_caught_up_misses or replica.lag_seconds is None or replica.lag_seconds > 0:
+            return True
+        return self._clock() - self._last_write <= self._max_lag_seconds
+
+    def mark_failed(self, replica: ReadReplica, error: Exception) -> None:
+        """Take a replica out of rotation until its next successful health check."""
+        replica.failures += 1
+        if replica.healthy:
+            logger.warning(
+                "Read replica failed, routing reads to the primary",
+                extra={"replica": replica.name, "error": str(error)},
+            )
+        replica.healthy = False
+
+    async def check_all(self) -> None:
+        """Measure every replica's lag and update whether it is in rotation."""
+        await asyncio.gather(*(self._check(replica) for replica in self._replicas))
+
+    async def _check(self, replica: ReadReplica) -> None:
+        try:
+            lag = await asyncio.wait_for(replica.measure_lag(), self._check_timeout_seconds)
+        except Exception as e:
+            self.mark_failed(replica, e)
+            return
+
+        replica.lag_seconds = lag
+        healthy = lag <= self._max_lag_seconds
+        if healthy != replica.healthy:
+            logger.info(
+                "Read replica back in rotation" if healthy else "Read replica lagging, out of rotation",
+                extra={"replica": replica.name, "lag_seconds": lag},
+            )
+        replica.healthy = healthy
+
+    def start(self) -> None:
+        """Start the background health check task."""
+        if self._task is None and self._replicas:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background health check task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self._check_interval_seconds)
+
+    def stats(self) -> Dict[str, object]:
+        """Return a snapshot of the replica states and read counters."""
+        return {
+            "primary_reads": self.primary_reads,
+            "miss_confirmations": self.miss_confirmations,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "lag_seconds": replica.lag_seconds,
+                    "reads": replica.reads,
+                    "failures": replica.failures,
+                }
+                for replica in self._replicas
+            ],
+        }
+
+
+class ReplicaRoutingUrlRepository(DelegatingUrlRepository):
+    """
+    IUrlRepository decorator that routes lookups to read replicas.
+
+    The wrapped repository is the primary; it receives all writes, the
+    reads of a repository that has written, and every fallback.
+    """
+
+    def __init__(self, inner: IUrlRepository, pool: ReplicaPool):
+        super().__init__(inner)
+        self._pool = pool
+        self._wrote = False
+
+    async def _read(
+        self,
+        lookup: Callable[[IUrlRepository], Awaitable[T]],
+        found: Callable[[T], bool],
+    ) -> T:
+        """Run a lookup on a replica, falling back to the primary on an error or a possibly stale miss."""
+        replica = None if self._wrote else self._pool.choose()
+        if replica is not None:
+            try:
+                async with replica.repository() as repository:
+                    result = await lookup(repository)
+                replica.reads += 1
+            except Exception as e:
+                self._pool.mark_failed(replica, e)
+            else:
+                if found(result) or not self._pool.may_be_behind(replica):
+                    return result
+                self._pool.miss_confirmations += 1
+                return await lookup(self._inner)
+        self._pool.primary_reads += 1
+        return await lookup(self._inner)
+
+    async def _read_many(
+        self,
+        lookup: Callable[[IUrlRepository, Sequence[str]], Awaitable[Dict[str, UrlMapping]]],
+        keys: Sequence[str],
+    ) -> Dict[str, UrlMapping]:
+        """Run a bulk lookup on a replica and read only the keys it may have missed from the primary."""
+        replica = None if self._wrote else self._pool.choose()
+        if replica is not None:
+            try:
+                async with replica.repository() as repository:
+                    found = await lookup(repository, keys)
+                replica.reads += 1
+            except Exception as e:
+                self._pool.mark_failed(replica, e)
+            else:
+                missing = [key for key in keys if key not in found]
+                if not missing or not self._pool.may_be_behind(replica):
+                    return found
+                self._pool.miss_confirmations += 1
+                found.update(await lookup(self._inner, missing))
+                return found
+        self._pool.primary_reads += 1
+        return await lookup(self._inner, keys)
+
+    async def save(self, url_mapping: UrlMapping) -> UrlMapping:
+        """Write to the primary; later reads of this repository stay there."""
+        self._wrote = True
+        self._pool.record_write()
+        return await self._inner.save(url_mapping)
+
+    async def insert_if_absent(self, url_mapping: UrlMapping) -> Tuple[UrlMapping, bool]:
+        """Write to the primary; later reads of this repository stay there."""
+        self._wrote = True
+        self._pool.record_write()
+        return await self._inner.insert_if_absent(url_mapping)
+
+    async def insert_many_if_absent(self, url_mappings: Sequence[UrlMapping]) -> Set[str]:
+        """Write to the primary; later reads of this repository stay there."""
+        self._wrote = True
+        self._pool.record_write()
+        return await self._inner.insert_many_if_absent(url_mappings)
+
+    async def find_by_short_code(self, short_code: str) -> Optional[UrlMapping]:
+        """Look up on a replica, confirming possibly stale misses on the primary."""
+        return await self._read(
+            lambda repository: repository.find_by_short_code(short_code),
+            lambda url_mapping: url_mapping is not None,
+        )
+
+    async def find_long_url(self, short_code: str) -> Optional[str]:
+        """Look up on a replica, confirming possibly stale misses on the primary."""
+        return await self._read(
+            lambda repository: repository.find_long_url(short_code),
+            lambda long_url: long_url is not None,
+        )
+
+    async def find_many_by_short_codes(
+        self, short_codes: Sequence[str]
+    ) -> Dict[str, UrlMapping]:
+        """Look up on a replica, reading the codes it does not have from the primary."""
+        return await self._read_many(
+            lambda repository, keys: repository.find_many_by_short_codes(keys), short_codes
+        )
+
+    async def find_by_long_url(self, long_url: str) -> Optional[UrlMapping]:
+        """Look up on a replica, confirming possibly stale misses on the primary."""
+        return await self._read(
+            lambda repository: repository.find_by_long_url(long_url),
+            lambda url_mapping: url_mapping is not None,
+        )
+
+    async def find_many_by_long_urls(self, long_urls: Sequence[str]) -> Dict[str, UrlMapping]:
+        """Look up on a replica, reading the URLs it does not have from the primary."""
+        return await self._read_many(
+            lambda repository, keys: repository.find_many_by_long_urls(keys), long_urls
+        )
@@ -0,0 +1,105 @@
+"""
+Single-flight coalescing of concurrent lookups.
+
+When a popular short code is not cached yet, every concurrent request for
+it would query the database at once. With single-flight coalescing the
+first request (the leader) performs the lookup, and requests arriving while
+it is in flight wait for and share its result, or its error, instead of
+issuing their own query.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from app.adapters.delegating_repository import DelegatingUrlRepository
+from app.models.url_mapping import UrlMapping
+from app.ports.repository import IUrlRepository
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Process-wide registry of in-flight calls, keyed by what they look up.
+
+    If a leader is cancelled (e.g. its client disconnected), its followers
+    do not inherit the cancellation: one of them retries as the new leader.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    @property
+    def inflight(self) -> int:
+        """Number of calls currently in flight."""
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Run call() unless a call for the same key is in flight, then share its outcome."""
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader was cancelled, not this caller: try again
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.leaders += 1
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved in case nobody was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the coalescing counters."""
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "inflight": self.inflight,
+        }
+
+
+class SingleFlightUrlRepository(DelegatingUrlRepository):
+    """
+    IUrlRepository decorator that coalesces concurrent short code lookups.
+
+    Only the lookups on the redirect path are coalesced; everything else is
+    delegated to the wrapped repository.
+    """
+
+    def __init__(self, inner: IUrlRepository, single_flight: SingleFlight):
+        super().__init__(inner)
+        self._single_flight = single_flight
+
+    async def find_by_short_code(self, short_code: str) -> Optional[UrlMapping]:
+        """Look up the mapping, sharing a concurrent lookup of the same code."""
+        return await self._single_flight.do(
+            ("find_by_short_code", short_code),
+            lambda: self._inner.find_by_short_code(short_code),
+        )
+
+    async def find_long_url(self, short_code: str) -> Optional[str]:
+        """Look up the long URL, sharing a concurrent lookup of the same code."""
+        return await self._single_flight.do(
+            ("find_long_url", short_code),
+            lambda: self._inner.find_long_url(short_code),
+        )
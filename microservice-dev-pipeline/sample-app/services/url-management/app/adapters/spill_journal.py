@@ -0,0 +1,207 @@
+"""
+Append-only local journal of events that could not be published.
+
+Events are appended as JSON lines. Appending only writes to the file
+buffer, so it costs no more than a memory copy on the request path; a
+background task flushes the buffer and fsyncs the file at most once per
+sync interval, or sooner once enough events are waiting, so many events
+share one fsync (group commit). A crash can lose at most the events of the
+last unsynced interval, and may leave a torn last line, which replay skips.
+
+Replay publishes the journal in order and in bulk. The journal file is
+first renamed to a replay file, so events appended while a replay is in
+progress go to a fresh journal and are replayed after it; whatever could
+not be published stays in the replay file for the next attempt. Since the
+replay takes over the whole file, a journal path must not be shared between
+processes.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import IO, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from app.adapters.event_serialization import event_from_json
+from app.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+QueuedEvent = Tuple[BaseModel, str]
+
+PublishBatch = Callable[[Sequence[QueuedEvent]], Awaitable[None]]
+
+
+class SpillJournal:
+    """Durable, fsync-batched journal file of unpublished events."""
+
+    def __init__(self, path: str, sync_interval_seconds: float = 0.05, sync_batch_size: int = 1000):
+        self._path = path
+        self._sync_interval_seconds = sync_interval_seconds
+        self._sync_batch_size = sync_batch_size
+        self._file: Optional[IO[str]] = None
+        self._lock = asyncio.Lock()
+        self._sync_task: Optional[asyncio.Task] = None
+        self._sync_requested = asyncio.Event()
+        self._unsynced = 0
+        self.appended = 0
+        self.replayed = 0
+        self.syncs = 0
+
+    @property
+    def replay_path(self) -> str:
+        """File holding the events of an interrupted replay."""
+        return f"{self._path}.replay"
+
+    @property
+    def pending(self) -> bool:
+        """Whether the journal holds events that still have to be replayed."""
+        return os.path.exists(self._path) or os.path.exists(self.replay_path)
+
+    def append(self, events: Sequence[QueuedEvent]) -> None:
+        """Append events to the journal; they become durable with the next sync."""
+        if self._file is None:
+            self._file = open(self._path, "a", encoding="utf-8")
+            if _ends_mid_line(self._path):
+                # Torn by a crash: keep it on a line of its own
+                self._file.write("\n")
+        self._file.writelines(_encode(event, routing_key) for event, routing_key in events)
+        self._unsynced += len(events)
+        self.appended += len(events)
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync_soon())
+        if self._unsynced >= self._sync_batch_size:
+            self._sync_requested.set()
+
+    async def _sync_soon(self) -> None:
+        try:
+            await asyncio.wait_for(self._sync_requested.wait(), self._sync_interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._sync_requested.clear()
+        await self.sync()
+
+    async def sync(self) -> None:
+        """Flush and fsync everything appended so far."""
+        async with self._lock:
+            if self._file is None or self._unsynced == 0:
+                return
+            self._unsynced = 0
+            self._file.flush()
+            await asyncio.to_thread(os.fsync, self._file.fileno())
+            self.syncs += 1
+
+    async def replay(self, publish_batch: PublishBatch, chunk_size: int) -> int:
+        """
+        Publish the journaled events in order, chunk by chunk.
+
+        Returns:
+            The number of events published.
+
+        Raises:
+            Exception: Whatever publish_batch raised; the events not yet
+                published stay journaled.
+        """
+        async with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                await asyncio.to_thread(os.fsync, self._file.fileno())
+                self._file.close()
+                self._file = None
+                self._unsynced = 0
+            if not os.path.exists(self.replay_path) and os.path.exists(self._path):
+                os.replace(self._path, self.replay_path)
+
+        lines = await asyncio.to_thread(_read_lines, self.replay_path)
+        position = 0
+        try:
+            while position < len(lines):
+                chunk = lines[position:position + chunk_size]
+                await publish_batch(_decode_lines(chunk, self.replay_path))
+                position += len(chunk)
+                self.replayed += len(chunk)
+        except Exception:
+            await asyncio.to_thread(_write_lines, self.replay_path, lines[position:])
+            raise
+
+        if os.path.exists(self.replay_path):
+            os.remove(self.replay_path)
+        if lines:
+            logger.info("Replayed journaled events", extra={"count": len(lines)})
+        return len(lines)
+
+    async def close(self) -> None:
+        """Make everything appended durable and close the journal file."""
+        if self._sync_task is not None:
+            self._sync_requested.set()
+            await self._sync_task
+            self._sync_task = None
+        await self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the journal counters."""
+        return {
+            "appended": self.appended,
+            "replayed": self.replayed,
+            "unsynced": self._unsynced,
+            "syncs": self.syncs,
+        }
+
+
+def _encode(event: BaseModel, routing_key: str) -> str:
+    """Serialize a queued event and its trace context as a single JSON line."""
+    record = {
+        "event_type": type(event).__name__,
+        "routing_key": routing_key,
+        "payload": event.model_dump_json(),
+    }
+    traceparent = tracer.attached_traceparent(event) or tracer.current_traceparent()
+    if traceparent is not None:
+        record["traceparent"] = traceparent
+    return json.dumps(record) + "\n"
+
+
+def _decode(line: str) -> QueuedEvent:
+    """Rebuild a queued event from a JSON line written by _encode."""
+    record = json.loads(line)
+    event = event_from_json(record["event_type"], record["payload"])
+    tracer.attach_traceparent(event, record.get("traceparent"))
+    return event, record["routing_key"]
+
+
+def _decode_lines(lines: Sequence[str], path: str) -> List[QueuedEvent]:
+    """Decode journal lines, skipping any torn by a crash while being appended."""
+    events = []
+    for line in lines:
+        try:
+            events.append(_decode(line))
+        except (ValueError, KeyError) as e:
+            logger.warning("Skipped unreadable journal line", extra={"path": path, "error": str(e)})
+    return events
+
+
+def _ends_mid_line(path: str) -> bool:
+    if not os.path.getsize(path):
+        return False
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b"\n"
+
+
+def _read_lines(path: str) -> List[str]:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [line for line in f if line.strip()]
+
+
+def _write_lines(path: str, lines: Sequence[str]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+        f.flush()
+        os.fsync(f.fileno())
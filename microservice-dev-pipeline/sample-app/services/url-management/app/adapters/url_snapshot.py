@@ -0,0 +1,314 @@
+"""
+Memory-mapped, read-only snapshot of the URL mappings.
+
+A snapshot file holds every mapping sorted by short code so that lookups are
+a binary search over fixed-width index entries. The file is memory-mapped
+rather than read, so all workers on a node share the same page cache
+instead of each holding its own copy, and only the pages touched by lookups
+are ever loaded.
+
+File layout (little endian):
+
+    header   magic "URLSNAP1", version, entry size, entry count, data offset
+    index    one entry per mapping, sorted by the NUL-padded short code:
+             short code (16 bytes), id, created_at (microseconds since the
+             epoch), long URL offset into the data section, long URL length
+    data     the UTF-8 long URLs, back to back
+
+Snapshots are written to a temporary file and atomically renamed into
+place; readers notice the new file and remap it on their next lookup.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.adapters.delegating_repository import DelegatingUrlRepository
+from app.models.url_mapping import UrlMapping
+from app.ports.repository import IUrlRepository
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"URLSNAP1"
+SNAPSHOT_VERSION = 1
+KEY_SIZE = 16
+
+_HEADER = struct.Struct("<8sIIQQ")
+_ENTRY = struct.Struct("<16sqqQI")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+SnapshotRecord = Tuple[int, datetime, str]
+
+
+def _encode_key(short_code: str) -> Optional[bytes]:
+    """Return the fixed-width index key of a short code, or None if it cannot be stored."""
+    try:
+        key = short_code.encode("ascii")
+    except UnicodeEncodeError:
+        return None
+    if len(key) > KEY_SIZE:
+        return None
+    return key.ljust(KEY_SIZE, b"\0")
+
+
+class SnapshotWriter:
+    """
+    Streams mappings, in ascending short code order, into a new snapshot file.
+
+    Index entries and long URLs are spooled to two temporary files, so
+    memory use does not depend on the number of mappings.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        self._index: BinaryIO = tempfile.TemporaryFile(dir=directory)
+        self._data: BinaryIO = tempfile.TemporaryFile(dir=directory)
+        self._data_size = 0
+        self._last_key = b""
+        self.count = 0
+
+    def add(self, short_code: str, long_url: str, mapping_id: int, created_at: datetime) -> None:
+        """Append one mapping; short codes must arrive in strictly ascending byte order."""
+        key = _encode_key(short_code)
+        if key is None:
+            raise ValueError(f"Short code cannot be stored in a snapshot: {short_code!r}")
+        if key <= self._last_key:
+            raise ValueError(f"Short codes must be added in ascending order: {short_code!r}")
+        self._last_key = key
+
+        url = long_url.encode("utf-8")
+        created_us = (created_at - _EPOCH) // timedelta(microseconds=1)
+        self._index.write(_ENTRY.pack(key, mapping_id, created_us, self._data_size, len(url)))
+        self._data.write(url)
+        self._data_size += len(url)
+        self.count += 1
+
+    def close(self) -> None:
+        """Assemble the snapshot and atomically move it into place."""
+        data_offset = _HEADER.size + self.count * _ENTRY.size
+        directory = os.path.dirname(os.path.abspath(self._path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                out.write(
+                    _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, _ENTRY.size, self.count, data_offset)
+                )
+                for spool in (self._index, self._data):
+                    spool.seek(0)
+                    while chunk := spool.read(1 << 20):
+                        out.write(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        finally:
+            self._index.close()
+            self._data.close()
+
+
+async def export_snapshot(session_maker: async_sessionmaker, path: str, batch_size: int = 10_000) -> int:
+    """
+    Export all URL mappings from the database into a snapshot file.
+
+    Rows are streamed with a server-side cursor, ordered by short code in
+    the "C" collation so the database order matches the snapshot's byte order.
+
+    Returns:
+        The number of exported mappings.
+    """
+    stmt = (
+        select(UrlMapping.id, UrlMapping.short_code, UrlMapping.long_url, UrlMapping.created_at)
+        .order_by(UrlMapping.short_code.collate("C"))
+        .execution_options(yield_per=batch_size)
+    )
+    writer = SnapshotWriter(path)
+    async with session_maker() as session:
+        result = await session.stream(stmt)
+        async for row in result:
+            writer.add(row.short_code, row.long_url, row.id, row.created_at)
+    writer.close()
+    logger.info("URL snapshot exported", extra={"path": path, "count": writer.count})
+    return writer.count
+
+
+class _MappedSnapshot:
+    """One opened, memory-mapped snapshot file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.identity = os.fstat(f.fileno())
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, entry_size, self.count, self._data_offset = _HEADER.unpack_from(self._mm, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or entry_size != _ENTRY.size:
+            self._mm.close()
+            raise ValueError(f"Not a supported URL snapshot: {path}")
+
+    def find(self, key: bytes) -> Optional[SnapshotRecord]:
+        mm = self._mm
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = _HEADER.size + mid * _ENTRY.size
+            candidate = mm[offset:offset + KEY_SIZE]
+            if candidate < key:
+                lo = mid + 1
+            elif candidate > key:
+                hi = mid
+            else:
+                _, mapping_id, created_us, url_offset, url_length = _ENTRY.unpack_from(mm, offset)
+                start = self._data_offset + url_offset
+                long_url = mm[start:start + url_length].decode("utf-8")
+                return mapping_id, _EPOCH + timedelta(microseconds=created_us), long_url
+        return None
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+class UrlSnapshotIndex:
+    """
+    Process-wide reader of the snapshot file with hot reload.
+
+    The file is checked at most once per check interval; a replaced file is
+    remapped and the previous mapping released. Lookups run synchronously on
+    the event loop thread, so a reload can never race an in-flight lookup.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        check_interval_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._path = path
+        self._check_interval_seconds = check_interval_seconds
+        self._clock = clock
+        self._snapshot: Optional[_MappedSnapshot] = None
+        self._last_check = -float("inf")
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    @property
+    def count(self) -> int:
+        """Number of mappings in the loaded snapshot."""
+        return self._snapshot.count if self._snapshot is not None else 0
+
+    def lookup(self, short_code: str) -> Optional[SnapshotRecord]:
+        """
+        Find a short code in the snapshot.
+
+        Returns:
+            (id, created_at, long_url) if the snapshot contains the short code,
+            None otherwise (including when no snapshot is available).
+        """
+        if self._clock() - self._last_check >= self._check_interval_seconds:
+            self.reload_if_changed()
+
+        key = _encode_key(short_code)
+        record = self._snapshot.find(key) if self._snapshot is not None and key else None
+        if record is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return record
+
+    def reload_if_changed(self) -> None:
+        """Map the snapshot file if it appeared or was replaced since the last check."""
+        self._last_check = self._clock()
+        try:
+            stat = os.stat(self._path)
+        except FileNotFoundError:
+            return
+        current = self._snapshot.identity if self._snapshot is not None else None
+        if current is not None and (stat.st_ino, stat.st_mtime_ns, stat.st_size) == (
+            current.st_ino,
+            current.st_mtime_ns,
+            current.st_size,
+        ):
+            return
+
+        try:
+            snapshot = _MappedSnapshot(self._path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.error("Failed to load URL snapshot", extra={"path": self._path, "error": str(e)})
+            return
+        previous, self._snapshot = self._snapshot, snapshot
+        if previous is not None:
+            previous.close()
+        self.reloads += 1
+        logger.info("URL snapshot loaded", extra={"path": self._path, "count": snapshot.count})
+
+    def close(self) -> None:
+        """Release the memory mapping."""
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the index counters."""
+        return {
+            "count": self.count,
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+        }
+
+
+class SnapshotUrlRepository(DelegatingUrlRepository):
+    """
+    IUrlRepository decorator that serves short code lookups from a UrlSnapshotIndex.
+
+    Codes missing from the snapshot (created after it was exported) fall back
+    to the wrapped repository; writes and long URL lookups are delegated.
+    """
+
+    def __init__(self, inner: IUrlRepository, index: UrlSnapshotIndex):
+        super().__init__(inner)
+        self._index = index
+
+    async def find_by_short_code(self, short_code: str) -> Optional[UrlMapping]:
+        """Return the mapping from the snapshot, falling back to the wrapped repository."""
+        record = self._index.lookup(short_code)
+        if record is None:
+            return await self._inner.find_by_short_code(short_code)
+        return _to_mapping(short_code, record)
+
+    async def find_long_url(self, short_code: str) -> Optional[str]:
+        """Return the long URL from the snapshot, falling back to the wrapped repository."""
+        record = self._index.lookup(short_code)
+        if record is None:
+            return await self._inner.find_long_url(short_code)
+        return record[2]
+
+    async def find_many_by_short_codes(
+        self, short_codes: Sequence[str]
+    ) -> Dict[str, UrlMapping]:
+        """Serve what the snapshot holds and look up the rest in the wrapped repository."""
+        found: Dict[str, UrlMapping] = {}
+        missing: List[str] = []
+        for short_code in short_codes:
+            record = self._index.lookup(short_code)
+            if record is None:
+                missing.append(short_code)
+            else:
+                found[short_code] = _to_mapping(short_code, record)
+        if missing:
+            found.update(await self._inner.find_many_by_short_codes(missing))
+        return found
+
+
+def _to_mapping(short_code: str, record: SnapshotRecord) -> UrlMapping:
+    mapping_id, created_at, long_url = record
+    return UrlMapping(id=mapping_id, short_code=short_code, long_url=long_url, created_at=created_at)
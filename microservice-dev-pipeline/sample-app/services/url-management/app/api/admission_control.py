@@ -0,0 +1,258 @@
+"""
+Admission control and load shedding for the redirect and shorten endpoints.
+
+Without it, a slow database lets requests pile up on the connection pool
+until they all time out together. Each endpoint class is instead guarded by
+an adaptive concurrency limit (AIMD): the limit grows by about one per
+limit's worth of fast completions and is cut multiplicatively whenever a
+request exceeds the latency target, misses its deadline or fails. Requests
+above the limit wait in a bounded FIFO queue until their deadline; requests
+that cannot be admitted in time are shed immediately with 503 Service
+Unavailable and a Retry-After header, before they touch the database.
+
+Redirects take priority over shortening: while redirects are queueing,
+new shorten requests are shed rather than competing for the database.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Deque, Dict, FrozenSet, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.redirect_fast_path import static_route_paths
+
+logger = logging.getLogger(__name__)
+
+_SHORTEN_PATHS = frozenset({"/api/v1/urls", "/api/v1/urls:batch"})
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionLimiter:
+    """
+    Adaptive concurrency limit with a bounded, deadline-aware waiting queue.
+
+    One limiter is shared by all requests of an endpoint class in a worker
+    process; it relies on the single-threaded event loop for consistency.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        max_limit: int,
+        latency_target_seconds: float,
+        deadline_seconds: float,
+        max_queue: int,
+        min_limit: int = 1,
+        backoff_ratio: float = 0.9,
+        yields_to: Optional["AdmissionLimiter"] = None,
+    ):
+        if not 0 < min_limit <= initial_limit <= max_limit:
+            raise ValueError("Admission limits must satisfy 0 < min_limit <= initial_limit <= max_limit")
+        if not 0 < backoff_ratio < 1:
+            raise ValueError("Admission backoff ratio must be between 0 and 1")
+        self.name = name
+        self.deadline_seconds = deadline_seconds
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._latency_target_seconds = latency_target_seconds
+        self._max_queue = max_queue
+        self._backoff_ratio = backoff_ratio
+        self._yields_to = yields_to
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.inflight = 0
+        self.admitted = 0
+        self.queued_total = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "deadline": 0, "priority": 0}
+        self.deadline_exceeded = 0
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def queued(self) -> int:
+        """Number of requests currently waiting for admission."""
+        return len(self._waiters)
+
+    async def acquire(self, deadline: float) -> None:
+        """
+        Admit a request, waiting in the queue until the deadline if the limit is reached.
+
+        Args:
+            deadline: Event loop time by which the request must have been admitted.
+
+        Raises:
+            AdmissionRejected: If the request is shed.
+        """
+        if self._yields_to is not None and self._yields_to.queued:
+            self._reject("priority")
+        if self.inflight < self.limit and not self._waiters:
+            self.inflight += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self._max_queue:
+            self._reject("queue_full")
+
+        loop = asyncio.get_running_loop()
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            self._reject("deadline")
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        self.queued_total += 1
+        try:
+            await asyncio.wait({waiter}, timeout=remaining)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if not waiter.done():
+            self._abandon(waiter)
+            self._reject("deadline")
+        self.admitted += 1
+
+    def release(self, latency_seconds: float, dropped: bool) -> None:
+        """
+        Return an admitted request's slot and adapt the limit to its outcome.
+
+        Args:
+            latency_seconds: Time from admission to completion.
+            dropped: Whether the request failed or missed its deadline.
+        """
+        if dropped or latency_seconds > self._latency_target_seconds:
+            self._limit = max(self._min_limit, self._limit * self._backoff_ratio)
+        elif self.inflight >= self._limit / 2:
+            self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+        self.inflight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Hand free slots to queued requests in arrival order."""
+        while self._waiters and self.inflight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.inflight += 1
+                waiter.set_result(None)
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        """Withdraw a waiter, giving back its slot if it was granted in the meantime."""
+        if waiter.done():
+            self.inflight -= 1
+            self._wake()
+        else:
+            waiter.cancel()
+            self._waiters.remove(waiter)
+
+    def _reject(self, reason: str) -> None:
+        self.shed[reason] += 1
+        raise AdmissionRejected(reason)
+
+    def stats(self) -> Dict[str, object]:
+        """Return a snapshot of the limit and the admission counters."""
+        return {
+            "limit": self.limit,
+            "inflight": self.inflight,
+            "queued": self.queued,
+            "queued_total": self.queued_total,
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "deadline_exceeded": self.deadline_exceeded,
+        }
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware that admits redirect and shorten requests through their limiters.
+
+    Requests are given until their limiter's deadline to be admitted and
+    completed; other routes (health, internal, docs) are not limited.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        redirect_limiter: AdmissionLimiter,
+        shorten_limiter: AdmissionLimiter,
+        retry_after_seconds: int = 1,
+    ):
+        self._app = app
+        self._redirect_limiter = redirect_limiter
+        self._shorten_limiter = shorten_limiter
+        self._retry_after = str(retry_after_seconds).encode("latin-1")
+        self._static_paths: Optional[FrozenSet[str]] = None
+
+    def _classify(self, scope: Scope) -> Optional[AdmissionLimiter]:
+        """Return the limiter guarding a request, or None if it is not limited."""
+        method, path = scope["method"], scope["path"]
+        if method == "POST" and path in _SHORTEN_PATHS:
+            return self._shorten_limiter
+        if method != "GET" or len(path) < 2 or "/" in path[1:]:
+            return None
+        if self._static_paths is None:
+            self._static_paths = static_route_paths(scope["app"])
+        return None if path in self._static_paths else self._redirect_limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limiter = self._classify(scope) if scope["type"] == "http" else None
+        if limiter is None:
+            await self._app(scope, receive, send)
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + limiter.deadline_seconds
+        try:
+            await limiter.acquire(deadline)
+        except AdmissionRejected as e:
+            await self._overloaded(send, f"Service overloaded ({e.reason}), retry later")
+            return
+
+        started = loop.time()
+        status = 0
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        dropped = True
+        try:
+            await asyncio.wait_for(self._app(scope, receive, send_with_status), deadline - started)
+            dropped = status >= 500
+        except asyncio.TimeoutError:
+            limiter.deadline_exceeded += 1
+            logger.warning(
+                "Request exceeded its deadline",
+                extra={"endpoint": limiter.name, "path": scope["path"]},
+            )
+            if not status:
+                await self._overloaded(send, "Request deadline exceeded, retry later")
+        finally:
+            limiter.release(loop.time() - started, dropped)
+
+    async def _overloaded(self, send: Send, detail: str) -> None:
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    (b"content-type", b"application/json"),
+                    (b"retry-after", self._retry_after),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,68 @@
+"""
+Request latency metrics middleware.
+
+Times every HTTP request from the moment it reaches the application until
+its response has been sent, and records it in the request duration
+histogram under its route template rather than its concrete path, so
+that short codes do not explode the label space. Requests answered ahead
+of the router (the redirect fast path, load shedding) are attributed to
+the route they would have reached.
+"""
+
+import time
+from typing import Callable, Dict, FrozenSet, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.redirect_fast_path import static_route_paths
+from app.metrics import http_request_duration
+
+REDIRECT_ROUTE = "/{short_code}"
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware that records request latency per method, route and status."""
+
+    def __init__(self, app: ASGIApp):
+        self._app = app
+        self._route_paths: Optional[Dict[Callable, str]] = None
+        self._static_paths: Optional[FrozenSet[str]] = None
+
+    def _route(self, scope: Scope) -> str:
+        """Return the route template a request was, or would have been, served by."""
+        if self._route_paths is None:
+            self._route_paths = {
+                route.endpoint: route.path for route in scope["app"].routes if hasattr(route, "endpoint")
+            }
+            self._static_paths = static_route_paths(scope["app"])
+        endpoint = scope.get("endpoint")
+        if endpoint is not None:
+            return self._route_paths.get(endpoint, UNMATCHED_ROUTE)
+        path = scope["path"]
+        if path in self._static_paths:
+            return path
+        if len(path) > 1 and "/" not in path[1:]:
+            return REDIRECT_ROUTE
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self._app(scope, receive, send_with_status)
+        finally:
+            http_request_duration.labels(scope["method"], self._route(scope), str(status)).observe(
+                time.perf_counter() - started
+            )
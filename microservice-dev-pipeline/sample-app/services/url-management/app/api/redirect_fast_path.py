@@ -0,0 +1,95 @@
+"""
+Pure-ASGI fast path for GET /{short_code} redirects.
+
+Redirects are by far the most frequent request. Served by the router, each
+one pays for route matching, FastAPI dependency resolution, a pydantic
+ResolveUrlResponse and a RedirectResponse object. This middleware answers
+them ahead of the router instead: it wires the service through the same
+provider as the route, resolves the long URL and writes the 301 or 404
+response with prebuilt headers.
+
+Responses are byte-for-byte those of the redirect route and its
+UrlNotFoundError handler; every other request is passed on unchanged.
+"""
+
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, AsyncGenerator, Callable, Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import quote
+
+from starlette.applications import Starlette
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.exceptions.url_exceptions import UrlNotFoundError
+from app.services.url_service import UrlManagementService
+
+ServiceProvider = Callable[[], AsyncGenerator[UrlManagementService, None]]
+ServiceContext = Callable[[], AsyncContextManager[UrlManagementService]]
+
+# Characters RedirectResponse leaves unquoted in the Location header
+_LOCATION_SAFE = ":/%#?=@[]!$&'()*+,;"
+
+
+def static_route_paths(app: Starlette) -> FrozenSet[str]:
+    """Return the paths of the application's routes that have no path parameters."""
+    return frozenset(route.path for route in app.routes if "{" not in route.path)
+
+
+class RedirectFastPathMiddleware:
+    """
+    ASGI middleware that serves single-segment GET requests as short code redirects.
+
+    Paths of the application's static routes (such as /health) are never
+    treated as short codes; they are read from the application on the
+    first request, once all routes have been registered. Like the route,
+    the middleware honours the application's dependency_overrides for the
+    service provider.
+    """
+
+    def __init__(self, app: ASGIApp, service_provider: ServiceProvider):
+        self._app = app
+        self._service_provider = service_provider
+        self._services: Dict[ServiceProvider, ServiceContext] = {}
+        self._static_paths: Optional[FrozenSet[str]] = None
+
+    def _service(self, scope: Scope) -> AsyncContextManager[UrlManagementService]:
+        """Open the service of the configured provider, or of its override."""
+        overrides = getattr(scope["app"], "dependency_overrides", {})
+        provider = overrides.get(self._service_provider, self._service_provider)
+        service = self._services.get(provider)
+        if service is None:
+            service = self._services[provider] = asynccontextmanager(provider)
+        return service()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self._app(scope, receive, send)
+            return
+
+        path: str = scope["path"]
+        if self._static_paths is None:
+            self._static_paths = static_route_paths(scope["app"])
+        if len(path) < 2 or "/" in path[1:] or path in self._static_paths:
+            await self._app(scope, receive, send)
+            return
+
+        short_code = path[1:]
+        try:
+            async with self._service(scope) as service:
+                long_url = await service.resolve_long_url(short_code)
+        except UrlNotFoundError as e:
+            body = json.dumps(
+                {"detail": str(e)}, ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")
+            await _respond(send, 404, [(b"content-type", b"application/json")], body)
+            return
+
+        location = quote(long_url, safe=_LOCATION_SAFE).encode("latin-1")
+        await _respond(send, 301, [(b"location", location)], b"")
+
+
+async def _respond(send: Send, status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+    """Send a complete response in one body message."""
+    headers.insert(0, (b"content-length", str(len(body)).encode("latin-1")))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
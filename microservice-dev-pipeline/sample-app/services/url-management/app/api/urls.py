@@ -8,6 +8,8 @@ from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse, RedirectResponse
 
 from architecture.contracts.url_management_service import (
+    BatchShortenUrlRequest,
+    BatchShortenUrlResponse,
     ShortenUrlRequest,
     ShortenUrlResponse,
 )
@@ -28,17 +30,28 @@ async def shorten_url(
 
     Returns 201 Created for new mappings, 200 OK for existing ones (idempotent).
     """
-    # Check if this URL already exists to determine status code
-    existing = await service._repository.find_by_long_url(request.long_url)
-    result = await service.shorten_url(request)
+    result, created = await service.shorten_url_with_status(request)
 
-    status_code = 200 if existing else 201
+    status_code = 201 if created else 200
     return JSONResponse(
         content=result.model_dump(mode="json"),
         status_code=status_code,
     )
 
 
+@router.post("/api/v1/urls:batch")
+async def shorten_urls_batch(
+    request: BatchShortenUrlRequest,
+    service: UrlManagementService = Depends(get_url_service),
+) -> BatchShortenUrlResponse:
+    """
+    Shorten several long URLs in one request.
+
+    Returns 200 OK with one result per URL, each marked "created" or "existing".
+    """
+    return await service.shorten_urls_batch(request)
+
+
 @router.get("/{short_code}")
 async def redirect_url(
     short_code: str,
@@ -5,24 +5,291 @@ Provides FastAPI dependency functions that wire together ports and adapters
 at runtime. This is the composition root of the application.
 """
 
-from typing import AsyncGenerator
+from datetime import datetime
+from typing import AsyncGenerator, Dict, List, Optional, Sequence, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.adapters.aggregating_broker import AggregatingBroker
+from app.adapters.asyncpg_url_lookup import AsyncpgLookupRepository, AsyncpgUrlLookup
+from app.adapters.batched_lookup import BatchedLookupUrlRepository, BatchLoader
+from app.adapters.bloom_guarded_repository import BloomGuardedUrlRepository, ShortCodeFilter
+from app.adapters.buffered_broker import BufferedBroker
+from app.adapters.cached_repository import CachedUrlRepository, ShortCodeCache
+from app.adapters.channel_pool import ChannelPool
+from app.adapters.confirm_pipeline import ConfirmPipeline
+from app.adapters.instrumented_broker import InstrumentedBroker
+from app.adapters.instrumented_pool import InstrumentedAsyncAdaptedQueuePool, engine_pool_stats
+from app.adapters.instrumented_repository import InstrumentedUrlRepository
+from app.adapters.journaling_broker import JournalingBroker
+from app.adapters.lazy_session import LazySession, LazySessionUrlRepository
+from app.adapters.outbox_broker import OutboxBroker
+from app.adapters.outbox_relay import OutboxRelay
+from app.adapters.postgres_id_allocator import PostgresIdBlockAllocator
 from app.adapters.postgres_repository import PostgresUrlRepository
 from app.adapters.rabbitmq_broker import RabbitMQBroker
+from app.adapters.replica_routing import ReadReplica, ReplicaPool, ReplicaRoutingUrlRepository
+from app.adapters.single_flight import SingleFlight, SingleFlightUrlRepository
+from app.adapters.spill_journal import SpillJournal
+from app.adapters.url_snapshot import SnapshotUrlRepository, UrlSnapshotIndex
+from app.api.admission_control import AdmissionLimiter
 from app.config import get_settings
+from app.models.url_mapping import UrlMapping
+from app.ports.message_broker import IMessageBroker
+from app.ports.repository import IUrlRepository
+from app.ports.short_code_generator import IShortCodeGenerator
+from app.services.short_code_generators import (
+    CounterShortCodeGenerator,
+    HashShortCodeGenerator,
+)
 from app.services.url_service import UrlManagementService
 
 settings = get_settings()
 
-engine = create_async_engine(settings.database_url, echo=False)
+engine_options = {
+    "poolclass": InstrumentedAsyncAdaptedQueuePool,
+    "pool_size": settings.database_pool_size,
+    "max_overflow": settings.database_max_overflow,
+    "pool_timeout": settings.database_pool_timeout_seconds,
+    "pool_recycle": settings.database_pool_recycle_seconds,
+    "pool_pre_ping": settings.database_pool_pre_ping,
+    "connect_args": {"prepared_statement_cache_size": settings.database_statement_cache_size},
+}
+
+engine = create_async_engine(settings.database_url, echo=False, **engine_options)
 session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-broker = RabbitMQBroker(
+replica_engines = [
+    create_async_engine(replica_url, echo=False, **engine_options)
+    for replica_url in settings.database_replica_urls
+]
+replica_pool = (
+    ReplicaPool(
+        [
+            ReadReplica(
+                f"replica-{position}",
+                async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False),
+            )
+            for position, replica_engine in enumerate(replica_engines)
+        ],
+        max_lag_seconds=settings.database_replica_max_lag_seconds,
+        check_interval_seconds=settings.database_replica_check_interval_seconds,
+        trust_caught_up_misses=settings.database_replica_trust_caught_up_misses,
+    )
+    if replica_engines
+    else None
+)
+
+rabbitmq_broker = RabbitMQBroker(
     rabbitmq_url=settings.rabbitmq_url,
     exchange_name=settings.rabbitmq_exchange,
+    confirm_mode=settings.rabbitmq_confirm_mode,
+    confirm_timeout_seconds=settings.rabbitmq_confirm_timeout_seconds,
+    confirm_pipeline=ConfirmPipeline(
+        max_in_flight=settings.rabbitmq_confirm_max_in_flight,
+        max_retries=settings.rabbitmq_confirm_max_retries,
+        retry_backoff_seconds=settings.rabbitmq_confirm_retry_backoff_seconds,
+    ),
+    channel_pool=ChannelPool(
+        rabbitmq_url=settings.rabbitmq_url,
+        exchange_name=settings.rabbitmq_exchange,
+        connections=settings.rabbitmq_connections,
+        channels_per_connection=settings.rabbitmq_channels_per_connection,
+        selection=settings.rabbitmq_channel_selection,
+    ),
+)
+
+# Every publish path goes through this decorator so that it is measured
+instrumented_broker = InstrumentedBroker(rabbitmq_broker)
+
+# Outbox mode keeps unpublished events in the database instead
+journaling_broker = (
+    JournalingBroker(
+        instrumented_broker,
+        SpillJournal(
+            settings.event_journal_path,
+            sync_interval_seconds=settings.event_journal_sync_interval_seconds,
+            sync_batch_size=settings.event_journal_sync_batch_size,
+        ),
+        replay_batch_size=settings.event_journal_replay_batch_size,
+        retry_interval_seconds=settings.event_journal_retry_interval_seconds,
+    )
+    if settings.event_journal_path and settings.event_publish_mode != "outbox"
+    else None
+)
+
+if journaling_broker is not None:
+    # Async confirms settle after publish() returned; failures go to the journal
+    rabbitmq_broker.on_undelivered(journaling_broker.journal_undelivered)
+elif settings.rabbitmq_confirm_mode == "async" and settings.event_publish_mode != "outbox":
+    raise ValueError("RABBITMQ_CONFIRM_MODE=async needs EVENT_JOURNAL_PATH to keep unconfirmed events")
+
+broker: IMessageBroker = journaling_broker if journaling_broker is not None else instrumented_broker
+if settings.event_publish_mode == "buffered":
+    broker = BufferedBroker(
+        broker,
+        max_queue_size=settings.event_queue_max_size,
+        flush_size=settings.event_flush_size,
+        flush_interval_seconds=settings.event_flush_interval_seconds,
+        overflow_policy=settings.event_overflow_policy,
+        spill_path=settings.event_spill_path,
+        drain_timeout_seconds=settings.event_drain_timeout_seconds,
+    )
+
+# Outbox mode writes each access event in the request's transaction instead
+access_aggregator = (
+    AggregatingBroker(
+        broker,
+        window_seconds=settings.access_aggregation_window_seconds,
+        max_keys=settings.access_aggregation_max_keys,
+    )
+    if settings.access_aggregation_enabled and settings.event_publish_mode != "outbox"
+    else None
 )
+if access_aggregator is not None:
+    broker = access_aggregator
+
+outbox_relay = (
+    OutboxRelay(
+        session_maker,
+        instrumented_broker,
+        batch_size=settings.outbox_relay_batch_size,
+        poll_interval_seconds=settings.outbox_relay_poll_interval_seconds,
+    )
+    if settings.event_publish_mode == "outbox"
+    else None
+)
+
+short_code_generator: IShortCodeGenerator
+if settings.short_code_strategy == "counter":
+    short_code_generator = CounterShortCodeGenerator(
+        PostgresIdBlockAllocator(session_maker, counter_name="short_codes"),
+        length=settings.short_code_length,
+        block_size=settings.short_code_block_size,
+    )
+else:
+    short_code_generator = HashShortCodeGenerator(
+        length=settings.short_code_length,
+        alphabet=settings.short_code_alphabet,
+    )
+
+url_lookup = (
+    AsyncpgUrlLookup(
+        settings.database_url.replace("+asyncpg", ""),
+        min_size=settings.url_lookup_pool_min_size,
+        max_size=settings.url_lookup_pool_max_size,
+        statement_cache_size=settings.database_statement_cache_size,
+    )
+    if settings.url_lookup_backend == "asyncpg"
+    else None
+)
+
+url_snapshot = (
+    UrlSnapshotIndex(
+        settings.url_snapshot_path,
+        check_interval_seconds=settings.url_snapshot_check_interval_seconds,
+    )
+    if settings.url_snapshot_path
+    else None
+)
+
+
+async def load_mappings(short_codes: Sequence[str]) -> Dict[str, UrlMapping]:
+    """Load a batch of mappings on a dedicated session."""
+    async with session_maker() as session:
+        return await PostgresUrlRepository(session).find_many_by_short_codes(short_codes)
+
+
+async def load_long_urls(short_codes: Sequence[str]) -> Dict[str, str]:
+    """Load a batch of long URLs on the asyncpg lookup pool if there is one, else on a dedicated session."""
+    if url_lookup is not None:
+        return await url_lookup.find_long_urls(short_codes)
+    async with session_maker() as session:
+        return await PostgresUrlRepository(session).find_long_urls(short_codes)
+
+
+mapping_loader: Optional[BatchLoader[UrlMapping]] = None
+long_url_loader: Optional[BatchLoader[str]] = None
+if settings.url_lookup_batching_enabled:
+    mapping_loader = BatchLoader(
+        load_mappings,
+        window_seconds=settings.url_lookup_batch_window_seconds,
+        max_batch_size=settings.url_lookup_batch_max_size,
+    )
+    long_url_loader = BatchLoader(
+        load_long_urls,
+        window_seconds=settings.url_lookup_batch_window_seconds,
+        max_batch_size=settings.url_lookup_batch_max_size,
+    )
+
+single_flight = SingleFlight() if settings.url_lookup_coalescing_enabled else None
+
+url_cache = (
+    ShortCodeCache(
+        max_size=settings.url_cache_max_size,
+        ttl_seconds=settings.url_cache_ttl_seconds,
+        negative_ttl_seconds=settings.url_cache_negative_ttl_seconds,
+    )
+    if settings.url_cache_enabled
+    else None
+)
+
+
+async def load_short_code_page(
+    after_id: int, limit: int, created_after: Optional[datetime]
+) -> List[Tuple[int, str]]:
+    """Load one page of (id, short_code) rows for the short code filter."""
+    async with session_maker() as session:
+        return await PostgresUrlRepository(session).list_short_codes(after_id, limit, created_after)
+
+
+short_code_filter = (
+    ShortCodeFilter(
+        load_short_code_page,
+        capacity=settings.short_code_filter_capacity,
+        false_positive_rate=settings.short_code_filter_false_positive_rate,
+        page_size=settings.short_code_filter_page_size,
+        visibility_window_seconds=settings.short_code_filter_visibility_window_seconds,
+        refresh_interval_seconds=settings.short_code_filter_refresh_interval_seconds,
+        rebuild_interval_seconds=settings.short_code_filter_rebuild_interval_seconds,
+    )
+    if settings.short_code_filter_enabled
+    else None
+)
+
+
+redirect_limiter: Optional[AdmissionLimiter] = None
+shorten_limiter: Optional[AdmissionLimiter] = None
+if settings.admission_control_enabled:
+    redirect_limiter = AdmissionLimiter(
+        "redirect",
+        initial_limit=settings.admission_redirect_initial_limit,
+        max_limit=settings.admission_redirect_max_limit,
+        latency_target_seconds=settings.admission_redirect_latency_target_seconds,
+        deadline_seconds=settings.admission_redirect_deadline_seconds,
+        max_queue=settings.admission_redirect_max_queue,
+        backoff_ratio=settings.admission_backoff_ratio,
+    )
+    shorten_limiter = AdmissionLimiter(
+        "shorten",
+        initial_limit=settings.admission_shorten_initial_limit,
+        max_limit=settings.admission_shorten_max_limit,
+        latency_target_seconds=settings.admission_shorten_latency_target_seconds,
+        deadline_seconds=settings.admission_shorten_deadline_seconds,
+        max_queue=settings.admission_shorten_max_queue,
+        backoff_ratio=settings.admission_backoff_ratio,
+        yields_to=redirect_limiter,
+    )
+
+
+def get_pool_stats() -> Dict[str, Dict[str, object]]:
+    """Report the connection pool metrics of every database engine and pool."""
+    stats = {"primary": engine_pool_stats(engine)}
+    for position, replica_engine in enumerate(replica_engines):
+        stats[f"replica-{position}"] = engine_pool_stats(replica_engine)
+    if url_lookup is not None:
+        stats["lookup"] = url_lookup.stats()
+    return stats
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
@@ -32,12 +299,42 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
 
 
 async def get_url_service() -> AsyncGenerator[UrlManagementService, None]:
-    """Provide a fully wired UrlManagementService instance."""
-    async with session_maker() as session:
-        repository = PostgresUrlRepository(session)
+    """
+    Provide a fully wired UrlManagementService instance.
+
+    The database session is only opened when the service first needs it and
+    is released after each unit of work; the final release below covers
+    requests that failed mid-way.
+    """
+    lazy_session = LazySession(session_maker)
+    try:
+        repository: IUrlRepository = LazySessionUrlRepository(lazy_session, PostgresUrlRepository)
+        if mapping_loader is not None and long_url_loader is not None:
+            repository = BatchedLookupUrlRepository(repository, mapping_loader, long_url_loader)
+        if url_lookup is not None and long_url_loader is None:
+            # With batching, the long URL loader already reads from the asyncpg pool
+            repository = AsyncpgLookupRepository(repository, url_lookup)
+        if replica_pool is not None:
+            repository = ReplicaRoutingUrlRepository(repository, replica_pool)
+        if single_flight is not None:
+            repository = SingleFlightUrlRepository(repository, single_flight)
+        if url_cache is not None:
+            repository = CachedUrlRepository(repository, url_cache)
+        if url_snapshot is not None:
+            repository = SnapshotUrlRepository(repository, url_snapshot)
+        if short_code_filter is not None:
+            repository = BloomGuardedUrlRepository(repository, short_code_filter)
+        repository = InstrumentedUrlRepository(repository)
+        message_broker = OutboxBroker(lazy_session.get) if outbox_relay is not None else broker
         service = UrlManagementService(
             repository=repository,
-            message_broker=broker,
+            message_broker=message_broker,
             base_url=settings.base_url,
+            batch_max_size=settings.shorten_batch_max_size,
+            batch_chunk_size=settings.shorten_batch_chunk_size,
+            short_code_generator=short_code_generator,
+            max_collision_attempts=settings.short_code_max_attempts,
         )
         yield service
+    finally:
+        await lazy_session.release()
@@ -21,3 +21,21 @@ class InvalidUrlError(Exception):
         self.url = url
         self.reason = reason
         super().__init__(f"Invalid URL: {url} - {reason}")
+
+
+class BatchTooLargeError(Exception):
+    """Raised when a batch request contains more URLs than allowed."""
+
+    def __init__(self, size: int, max_size: int):
+        self.size = size
+        self.max_size = max_size
+        super().__init__(f"Batch of {size} URLs exceeds the maximum of {max_size}")
+
+
+class ShortCodeCollisionError(Exception):
+    """Raised when a generated short code is already taken by a different long URL."""
+
+    def __init__(self, short_code: str, long_url: str):
+        self.short_code = short_code
+        self.long_url = long_url
+        super().__init__(f"Short code {short_code} is already used by another URL")
@@ -0,0 +1,38 @@
+"""
+Command-line entry point that exports the URL mappings into a snapshot file.
+
+Run periodically (e.g. from cron or a Kubernetes CronJob) on a host that can
+reach the database; workers configured with URL_SNAPSHOT_PATH pick up the
+new file without a restart.
+
+Usage:
+    python -m app.export_snapshot [--output PATH]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.adapters.url_snapshot import export_snapshot
+from app.config import get_settings
+
+
+async def main(output: str) -> None:
+    settings = get_settings()
+    engine = create_async_engine(settings.database_url, echo=False)
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        count = await export_snapshot(session_maker, output)
+    finally:
+        await engine.dispose()
+    print(f"Exported {count} mappings to {output}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Export URL mappings into a snapshot file")
+    parser.add_argument("--output", default=get_settings().url_snapshot_path or "url_mappings.snapshot")
+    args = parser.parse_args()
+    asyncio.run(main(args.output))
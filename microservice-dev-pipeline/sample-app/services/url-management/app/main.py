@@ -10,19 +10,68 @@ from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
+from app.api.admission_control import AdmissionControlMiddleware
+from app.api.metrics_middleware import MetricsMiddleware
+from app.api.redirect_fast_path import RedirectFastPathMiddleware
 from app.api.urls import router
-from app.dependencies import broker, engine
-from app.exceptions.url_exceptions import InvalidUrlError, UrlNotFoundError
+from app.dependencies import (
+    access_aggregator,
+    broker,
+    engine,
+    get_pool_stats,
+    get_url_service,
+    journaling_broker,
+    long_url_loader,
+    mapping_loader,
+    outbox_relay,
+    rabbitmq_broker,
+    redirect_limiter,
+    replica_engines,
+    replica_pool,
+    settings,
+    short_code_filter,
+    shorten_limiter,
+    single_flight,
+    url_lookup,
+    url_snapshot,
+)
+from app.exceptions.url_exceptions import (
+    BatchTooLargeError,
+    InvalidUrlError,
+    ShortCodeCollisionError,
+    UrlNotFoundError,
+)
+from app.logging_config import configure_logging
+from app.metrics import CONTENT_TYPE, registry
 from app.models.url_mapping import Base
+from app.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Manage application lifespan: connect/disconnect message broker."""
+    """
+    Manage application lifespan: connect/disconnect message broker.
+
+    In outbox mode the outbox relay runs for the lifetime of the application,
+    as does the raw asyncpg lookup pool when it serves redirects and the
+    health check of the read replicas. The short code filter is built in the
+    background and rebuilt periodically. If the broker is unreachable, events
+    are journaled locally while it is reconnected in the background. On
+    shutdown, closing the broker drains any events still buffered for
+    publishing before the connection is released, then the span exporter and
+    the log listener flush the remaining spans and records.
+    """
+    log_listener = configure_logging(
+        level=settings.log_level,
+        json_format=settings.log_format == "json",
+        sample_rates=settings.log_sample_rates,
+        queue_max_size=settings.log_queue_max_size,
+    )
+    tracer.configure("url-management", settings.tracing_export_path, settings.tracing_sample_rate)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created")
@@ -31,12 +80,40 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.info("Application started, broker connected")
     except Exception as e:
         logger.warning("Failed to connect to broker on startup", extra={"error": str(e)})
+    if replica_pool is not None:
+        await replica_pool.check_all()
+        replica_pool.start()
+    if url_lookup is not None:
+        await url_lookup.connect()
+    if url_snapshot is not None:
+        url_snapshot.reload_if_changed()
+    if short_code_filter is not None:
+        short_code_filter.start()
+    if outbox_relay is not None:
+        outbox_relay.start()
+        logger.info("Outbox relay started")
     yield
+    if outbox_relay is not None:
+        await outbox_relay.stop()
+        logger.info("Outbox relay stopped")
+    if short_code_filter is not None:
+        await short_code_filter.stop()
+    if replica_pool is not None:
+        await replica_pool.stop()
+    for replica_engine in replica_engines:
+        await replica_engine.dispose()
+    if url_lookup is not None:
+        await url_lookup.close()
+    if url_snapshot is not None:
+        url_snapshot.close()
     try:
+        logger.info("Application shutdown, draining pending events")
         await broker.close()
         logger.info("Application shutdown, broker disconnected")
     except Exception as e:
         logger.warning("Error closing broker connection", extra={"error": str(e)})
+    tracer.shutdown()
+    log_listener.stop()
 
 
 app = FastAPI(
@@ -46,12 +123,106 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+if settings.redirect_fast_path_enabled:
+    app.add_middleware(RedirectFastPathMiddleware, service_provider=get_url_service)
+if redirect_limiter is not None and shorten_limiter is not None:
+    # Added after the redirect fast path so that it runs before it
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        redirect_limiter=redirect_limiter,
+        shorten_limiter=shorten_limiter,
+        retry_after_seconds=settings.admission_retry_after_seconds,
+    )
+# Outermost, so that shed requests and the fast path are measured too
+app.add_middleware(MetricsMiddleware)
+
+
 @app.get("/health")
 async def health_check() -> dict:
     """Health check endpoint for load balancers and Docker health checks."""
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def metrics() -> Response:
+    """Expose request, repository and broker metrics in Prometheus text format."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/internal/pools")
+async def pool_stats() -> dict:
+    """Report checked-out, idle and waiting connections and acquire latency per pool."""
+    return get_pool_stats()
+
+
+@app.get("/internal/admission")
+async def admission_stats() -> dict:
+    """Report the concurrency limits and the admitted, queued and shed requests per endpoint."""
+    if redirect_limiter is None or shorten_limiter is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "redirect": redirect_limiter.stats(),
+        "shorten": shorten_limiter.stats(),
+    }
+
+
+@app.get("/internal/lookup-batching")
+async def lookup_batching_stats() -> dict:
+    """Report how many lookups were served and how many batched queries they took."""
+    if mapping_loader is None or long_url_loader is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "mappings": mapping_loader.stats(),
+        "long_urls": long_url_loader.stats(),
+    }
+
+
+@app.get("/internal/single-flight")
+async def single_flight_stats() -> dict:
+    """Report how many lookups led a database call and how many shared one."""
+    if single_flight is None:
+        return {"enabled": False}
+    return {"enabled": True, **single_flight.stats()}
+
+
+@app.get("/internal/publisher-confirms")
+async def publisher_confirms_stats() -> dict:
+    """Report outstanding, confirmed, nacked and failed publishes to RabbitMQ."""
+    return {"mode": settings.rabbitmq_confirm_mode, **rabbitmq_broker.confirms.stats()}
+
+
+@app.get("/internal/channel-pool")
+async def channel_pool_stats() -> dict:
+    """Report the state, outstanding publishes and recoveries of every publishing channel."""
+    return rabbitmq_broker.channels.stats()
+
+
+@app.get("/internal/event-journal")
+async def event_journal_stats() -> dict:
+    """Report whether events are published directly and how many were journaled and replayed."""
+    if journaling_broker is None:
+        return {"enabled": False}
+    return {"enabled": True, **journaling_broker.stats()}
+
+
+@app.get("/internal/access-aggregation")
+async def access_aggregation_stats() -> dict:
+    """Report the accesses counted in the open window and how many aggregates were published."""
+    if access_aggregator is None:
+        return {"enabled": False}
+    return {"enabled": True, **access_aggregator.stats()}
+
+
+@app.get("/internal/short-code-filter")
+async def short_code_filter_stats() -> dict:
+    """Report the short code filter's memory footprint and false positive rate."""
+    if short_code_filter is None:
+        return {"enabled": False}
+    return {"enabled": True, **short_code_filter.stats()}
+
+
 app.include_router(router)
 
 
@@ -71,3 +242,23 @@ async def invalid_url_handler(request: Request, exc: InvalidUrlError) -> JSONRes
         status_code=400,
         content={"detail": str(exc)},
     )
+
+
+@app.exception_handler(BatchTooLargeError)
+async def batch_too_large_handler(request: Request, exc: BatchTooLargeError) -> JSONResponse:
+    """Map BatchTooLargeError to 400 Bad Request."""
+    return JSONResponse(
+        status_code=400,
+        content={"detail": str(exc)},
+    )
+
+
+@app.exception_handler(ShortCodeCollisionError)
+async def short_code_collision_handler(
+    request: Request, exc: ShortCodeCollisionError
+) -> JSONResponse:
+    """Map ShortCodeCollisionError to 409 Conflict."""
+    return JSONResponse(
+        status_code=409,
+        content={"detail": str(exc)},
+    )
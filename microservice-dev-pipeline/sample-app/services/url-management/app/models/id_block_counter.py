@@ -0,0 +1,23 @@
+"""
+SQLAlchemy model for ID block counters.
+
+Each row holds the next unleased ID of a named counter; workers lease
+blocks of IDs from it for counter-based short codes.
+"""
+
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.url_mapping import Base
+
+
+class IdBlockCounter(Base):
+    """Database model representing a named ID counter."""
+
+    __tablename__ = "id_block_counters"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    next_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<IdBlockCounter(name='{self.name}', next_id={self.next_id})>"
@@ -0,0 +1,35 @@
+"""
+SQLAlchemy model for the transactional event outbox.
+
+Events are written to this table in the same database as url_mappings and
+published to the message broker later by the outbox relay.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import BigInteger, String, Text, TIMESTAMP
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.url_mapping import Base
+
+
+class OutboxEvent(Base):
+    """Database model representing an event waiting to be published."""
+
+    __tablename__ = "event_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    routing_key: Mapped[str] = mapped_column(String(128), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    # Trace context of the request that stored the event, while tracing is on
+    traceparent: Mapped[Optional[str]] = mapped_column(String(55), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    def __repr__(self) -> str:
+        return f"<OutboxEvent(id={self.id}, event_type='{self.event_type}')>"
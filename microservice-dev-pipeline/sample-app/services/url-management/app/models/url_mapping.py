@@ -4,12 +4,23 @@ SQLAlchemy model for URL mappings.
 Defines the database schema for storing short code to long URL mappings.
 """
 
+import hashlib
 from datetime import datetime, timezone
 
-from sqlalchemy import String, Text, TIMESTAMP
+from sqlalchemy import LargeBinary, String, Text, TIMESTAMP
+from sqlalchemy.engine.default import DefaultExecutionContext
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
+def long_url_digest(long_url: str) -> bytes:
+    """Return the fixed-width SHA-256 digest used to index long URLs."""
+    return hashlib.sha256(long_url.encode()).digest()
+
+
+def _default_long_url_hash(context: DefaultExecutionContext) -> bytes:
+    return long_url_digest(context.get_current_parameters()["long_url"])
+
+
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
     pass
@@ -22,10 +33,20 @@ class UrlMapping(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     short_code: Mapped[str] = mapped_column(String(16), unique=True, nullable=False, index=True)
-    long_url: Mapped[str] = mapped_column(Text, nullable=False, index=True)
+    long_url: Mapped[str] = mapped_column(Text, nullable=False)
+    # Long URLs can be several kilobytes; lookups by long URL go through this
+    # 32-byte digest index and then compare the full URL to rule out collisions.
+    long_url_hash: Mapped[bytes] = mapped_column(
+        LargeBinary(32),
+        nullable=False,
+        index=True,
+        default=_default_long_url_hash,
+    )
+    # Indexed for the short code filter's incremental refreshes
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
         nullable=False,
+        index=True,
         default=lambda: datetime.now(timezone.utc),
     )
 
@@ -0,0 +1,25 @@
+"""
+ID block allocator port.
+
+Defines the abstract interface for leasing ranges of unique integer IDs,
+used by counter-based short code generation.
+"""
+
+from abc import ABC, abstractmethod
+
+
+class IIdBlockAllocator(ABC):
+    """Abstract interface for leasing blocks of unique IDs."""
+
+    @abstractmethod
+    async def allocate_block(self, size: int) -> int:
+        """
+        Lease a block of consecutive IDs that no other caller will receive.
+
+        Args:
+            size: Number of IDs in the block.
+
+        Returns:
+            The first ID of the block; the block is [start, start + size).
+        """
+        ...
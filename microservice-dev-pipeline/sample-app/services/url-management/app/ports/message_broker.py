@@ -5,6 +5,7 @@ Defines the abstract interface for publishing domain events.
 """
 
 from abc import ABC, abstractmethod
+from typing import Sequence, Tuple
 
 from pydantic import BaseModel
 
@@ -31,3 +32,24 @@ class IMessageBroker(ABC):
         Must be called before publishing events.
         """
         ...
+
+    async def publish_batch(self, events: Sequence[Tuple[BaseModel, str]]) -> None:
+        """
+        Publish several events at once.
+
+        Adapters that can pipeline publishes should override this; the default
+        publishes the events one by one, in order.
+
+        Args:
+            events: Sequence of (event, routing_key) pairs.
+        """
+        for event, routing_key in events:
+            await self.publish(event, routing_key)
+
+    async def close(self) -> None:
+        """
+        Release the connection to the message broker.
+
+        No-op by default.
+        """
+        pass
@@ -5,7 +5,7 @@ Defines the abstract interface for storing and retrieving URL mappings.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, Optional, Sequence, Set, Tuple
 
 from app.models.url_mapping import UrlMapping
 
@@ -26,6 +26,37 @@ class IUrlRepository(ABC):
         """
         ...
 
+    @abstractmethod
+    async def insert_if_absent(self, url_mapping: UrlMapping) -> Tuple[UrlMapping, bool]:
+        """
+        Persist a URL mapping unless its short code is already stored.
+
+        Must be a single atomic operation so that concurrent inserts of the
+        same short code cannot fail on the unique constraint.
+
+        Args:
+            url_mapping: The URL mapping to insert.
+
+        Returns:
+            The mapping stored under the short code (the given one if it was
+            inserted) and True if it was inserted, False if it already existed.
+            Callers compare the stored long URL to detect short code collisions.
+        """
+        ...
+
+    @abstractmethod
+    async def insert_many_if_absent(self, url_mappings: Sequence[UrlMapping]) -> Set[str]:
+        """
+        Persist several URL mappings, skipping short codes that are already stored.
+
+        Args:
+            url_mappings: The URL mappings to insert; short codes must be distinct.
+
+        Returns:
+            The short codes that were inserted.
+        """
+        ...
+
     @abstractmethod
     async def find_by_short_code(self, short_code: str) -> Optional[UrlMapping]:
         """
@@ -39,6 +70,38 @@ class IUrlRepository(ABC):
         """
         ...
 
+    async def find_long_url(self, short_code: str) -> Optional[str]:
+        """
+        Find only the long URL stored under a short code.
+
+        This is all the redirect path needs. Adapters should override it with
+        a query that skips entity hydration; the default falls back to
+        find_by_short_code.
+
+        Args:
+            short_code: The short code to look up.
+
+        Returns:
+            The long URL if found, None otherwise.
+        """
+        url_mapping = await self.find_by_short_code(short_code)
+        return url_mapping.long_url if url_mapping is not None else None
+
+    @abstractmethod
+    async def find_many_by_short_codes(
+        self, short_codes: Sequence[str]
+    ) -> Dict[str, UrlMapping]:
+        """
+        Find the URL mappings for several short codes at once.
+
+        Args:
+            short_codes: The short codes to look up.
+
+        Returns:
+            The found mappings keyed by short code; unknown codes are omitted.
+        """
+        ...
+
     @abstractmethod
     async def find_by_long_url(self, long_url: str) -> Optional[UrlMapping]:
         """
@@ -52,6 +115,19 @@ class IUrlRepository(ABC):
         """
         ...
 
+    @abstractmethod
+    async def find_many_by_long_urls(self, long_urls: Sequence[str]) -> Dict[str, UrlMapping]:
+        """
+        Find the URL mappings for several long URLs at once.
+
+        Args:
+            long_urls: The long URLs to look up.
+
+        Returns:
+            The found mappings keyed by long URL; unknown URLs are omitted.
+        """
+        ...
+
     @abstractmethod
     async def commit(self) -> None:
         """
@@ -0,0 +1,38 @@
+"""
+Short code generator port.
+
+Defines the abstract interface for turning a long URL into a short code,
+so the generation strategy can be chosen at the composition root.
+"""
+
+from abc import ABC, abstractmethod
+
+
+class IShortCodeGenerator(ABC):
+    """Abstract interface for short code generation strategies."""
+
+    @property
+    @abstractmethod
+    def deterministic(self) -> bool:
+        """
+        Whether the same long URL always yields the same sequence of codes.
+
+        Deterministic generators let the service dedupe on the short code
+        alone; other generators require a lookup by long URL first.
+        """
+        ...
+
+    @abstractmethod
+    async def generate(self, long_url: str, attempt: int = 0) -> str:
+        """
+        Generate a short code for a long URL.
+
+        Args:
+            long_url: The long URL to shorten.
+            attempt: Collision probe number, 0 for the first try. Deterministic
+                generators must return a different code for each attempt.
+
+        Returns:
+            The short code.
+        """
+        ...
@@ -0,0 +1,112 @@
+"""
+Short code generation strategies.
+
+- HashShortCodeGenerator derives the code from a SHA-256 digest of the long
+  URL, so the same URL always gets the same code. Collisions are resolved by
+  probing: attempt n hashes the URL with the probe number as a salt.
+- CounterShortCodeGenerator encodes unique integer IDs leased in blocks per
+  worker, scrambled into a fixed-width base62 code. Codes never collide, but
+  the same URL shortened twice concurrently may get two codes.
+
+With 8 hex characters (32 bits) birthday collisions become likely around
+77k URLs; 10 base62 characters (~59 bits) push that to about a billion.
+"""
+
+import asyncio
+import hashlib
+
+from app.ports.id_block_allocator import IIdBlockAllocator
+from app.ports.short_code_generator import IShortCodeGenerator
+
+HEX_ALPHABET = "0123456789abcdef"
+BASE62_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+ALPHABETS = {"hex": HEX_ALPHABET, "base62": BASE62_ALPHABET}
+
+# Matches the width of the url_mappings.short_code column
+MAX_SHORT_CODE_LENGTH = 16
+
+# Odd and not a multiple of 31, hence invertible modulo 62**n for every n
+_SCRAMBLE_MULTIPLIER = 6364136223846793005
+
+
+def _validate_length(length: int) -> None:
+    if not 1 <= length <= MAX_SHORT_CODE_LENGTH:
+        raise ValueError(f"Short code length must be between 1 and {MAX_SHORT_CODE_LENGTH}")
+
+
+def encode_fixed_width(value: int, alphabet: str, length: int) -> str:
+    """Encode a non-negative integer below len(alphabet)**length as exactly length characters."""
+    base = len(alphabet)
+    chars = []
+    for _ in range(length):
+        value, remainder = divmod(value, base)
+        chars.append(alphabet[remainder])
+    return "".join(reversed(chars))
+
+
+class HashShortCodeGenerator(IShortCodeGenerator):
+    """Deterministic short codes from a SHA-256 digest of the long URL."""
+
+    def __init__(self, length: int = 8, alphabet: str = "hex"):
+        _validate_length(length)
+        if alphabet not in ALPHABETS:
+            raise ValueError(f"Unknown short code alphabet: {alphabet}")
+        self._length = length
+        self._alphabet = ALPHABETS[alphabet]
+
+    @property
+    def deterministic(self) -> bool:
+        """Hash codes only depend on the long URL and the probe number."""
+        return True
+
+    async def generate(self, long_url: str, attempt: int = 0) -> str:
+        """Return the code for the given probe of the long URL."""
+        data = long_url if attempt == 0 else f"{attempt}:{long_url}"
+        digest = hashlib.sha256(data.encode()).digest()
+        if self._alphabet is HEX_ALPHABET:
+            return digest.hex()[: self._length]
+        space = len(self._alphabet) ** self._length
+        return encode_fixed_width(int.from_bytes(digest, "big") % space, self._alphabet, self._length)
+
+
+class CounterShortCodeGenerator(IShortCodeGenerator):
+    """
+    Unique short codes from leased blocks of integer IDs.
+
+    Each worker leases block_size IDs at a time from the allocator, so the
+    shared counter is touched once per block rather than once per URL. IDs
+    are multiplied by a constant invertible modulo 62**length before being
+    encoded, so consecutive IDs do not produce guessable consecutive codes.
+    """
+
+    def __init__(self, allocator: IIdBlockAllocator, length: int = 7, block_size: int = 1_000):
+        _validate_length(length)
+        if block_size <= 0:
+            raise ValueError("Block size must be a positive integer")
+        self._allocator = allocator
+        self._length = length
+        self._block_size = block_size
+        self._space = len(BASE62_ALPHABET) ** length
+        self._next_id = 0
+        self._block_end = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def deterministic(self) -> bool:
+        """Counter codes depend on allocation order, not on the long URL."""
+        return False
+
+    async def generate(self, long_url: str, attempt: int = 0) -> str:
+        """Return the code for the next unused ID, leasing a new block if needed."""
+        if self._next_id >= self._block_end:
+            async with self._lock:
+                if self._next_id >= self._block_end:
+                    start = await self._allocator.allocate_block(self._block_size)
+                    self._next_id, self._block_end = start, start + self._block_size
+
+        id_ = self._next_id
+        self._next_id += 1
+        if id_ >= self._space:
+            raise RuntimeError(f"Short code space of length {self._length} is exhausted")
+        scrambled = (id_ * _SCRAMBLE_MULTIPLIER) % self._space
+        return encode_fixed_width(scrambled, BASE62_ALPHABET, self._length)
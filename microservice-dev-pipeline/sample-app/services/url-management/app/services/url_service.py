@@ -1,27 +1,38 @@
 """
 Core business logic for URL management.
 
-Implements the IUrlManagementService contract with deterministic
-short code generation and event publishing on URL resolution.
+Implements the IUrlManagementService contract with pluggable short code
+generation and event publishing on URL resolution.
 """
 
-import hashlib
 import logging
 import re
 from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
 
 from architecture.contracts.common import UrlAccessedEvent
 from architecture.contracts.url_management_service import (
+    BatchShortenUrlItem,
+    BatchShortenUrlRequest,
+    BatchShortenUrlResponse,
     IUrlManagementService,
     ResolveUrlResponse,
     ShortenUrlRequest,
     ShortenUrlResponse,
 )
 
-from app.exceptions.url_exceptions import InvalidUrlError, UrlNotFoundError
+from app.exceptions.url_exceptions import (
+    BatchTooLargeError,
+    InvalidUrlError,
+    ShortCodeCollisionError,
+    UrlNotFoundError,
+)
 from app.models.url_mapping import UrlMapping
 from app.ports.message_broker import IMessageBroker
 from app.ports.repository import IUrlRepository
+from app.ports.short_code_generator import IShortCodeGenerator
+from app.services.short_code_generators import HashShortCodeGenerator
+from app.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +44,8 @@ class UrlManagementService(IUrlManagementService):
     """
     Concrete implementation of the URL management service.
 
-    Provides deterministic URL shortening via SHA-256 hashing and
-    publishes UrlAccessedEvent on each URL resolution.
+    Shortens URLs with the configured short code generator (SHA-256 hash
+    codes by default) and publishes UrlAccessedEvent on each URL resolution.
     """
 
     def __init__(
@@ -42,15 +53,18 @@ class UrlManagementService(IUrlManagementService):
         repository: IUrlRepository,
         message_broker: IMessageBroker,
         base_url: str,
+        batch_max_size: int = 10_000,
+        batch_chunk_size: int = 1_000,
+        short_code_generator: Optional[IShortCodeGenerator] = None,
+        max_collision_attempts: int = 5,
     ):
         self._repository = repository
         self._message_broker = message_broker
         self._base_url = base_url.rstrip("/")
-
-    @staticmethod
-    def _generate_short_code(long_url: str) -> str:
-        """Generate a deterministic short code from a long URL using SHA-256."""
-        return hashlib.sha256(long_url.encode()).hexdigest()[:8]
+        self._batch_max_size = batch_max_size
+        self._batch_chunk_size = batch_chunk_size
+        self._generator = short_code_generator or HashShortCodeGenerator()
+        self._max_collision_attempts = max_collision_attempts
 
     @staticmethod
     def _validate_url(url: str) -> None:
@@ -67,41 +81,176 @@ class UrlManagementService(IUrlManagementService):
         Idempotent: the same long URL always returns the same short URL.
         Returns the existing mapping if one already exists.
         """
+        response, _ = await self.shorten_url_with_status(request)
+        return response
+
+    async def shorten_url_with_status(
+        self, request: ShortenUrlRequest
+    ) -> Tuple[ShortenUrlResponse, bool]:
+        """
+        Create a short URL and report whether a new mapping was stored.
+
+        With a deterministic generator, idempotency is keyed on the short code:
+        a single conditional insert also returns the mapping already stored
+        under that code, and a different stored long URL means a collision,
+        resolved by probing the next code. Other generators look the long URL
+        up by digest first.
+
+        Returns:
+            The shortened URL and True if it was created, False if it existed.
+
+        Raises:
+            ShortCodeCollisionError: If no free code was found within the probe limit.
+        """
         self._validate_url(request.long_url)
 
-        # Check if this URL has already been shortened
-        existing = await self._repository.find_by_long_url(request.long_url)
-        if existing:
+        short_code: Optional[str] = None
+        created = False
+        if not self._generator.deterministic:
+            existing = await self._repository.find_by_long_url(request.long_url)
+            if existing is not None:
+                short_code = existing.short_code
+
+        if short_code is None:
+            short_code, created = await self._store(request.long_url)
+
+        if created:
+            await self._repository.commit()
             logger.info(
-                "Returning existing short URL",
-                extra={"short_code": existing.short_code, "long_url": request.long_url},
+                "Created new short URL",
+                extra={"short_code": short_code, "long_url": request.long_url},
             )
-            return ShortenUrlResponse(
-                short_code=existing.short_code,
-                short_url=f"{self._base_url}/{existing.short_code}",
-                long_url=request.long_url,
+        else:
+            logger.info(
+                "Returning existing short URL",
+                extra={"short_code": short_code, "long_url": request.long_url},
             )
 
-        # Generate deterministic short code and persist
-        short_code = self._generate_short_code(request.long_url)
-        url_mapping = UrlMapping(
+        response = ShortenUrlResponse(
             short_code=short_code,
+            short_url=f"{self._base_url}/{short_code}",
             long_url=request.long_url,
-            created_at=datetime.now(timezone.utc),
         )
-        await self._repository.save(url_mapping)
-        await self._repository.commit()
+        return response, created
+
+    async def _store(self, long_url: str) -> Tuple[str, bool]:
+        """
+        Insert a mapping for the long URL, probing past codes taken by other URLs.
+
+        Returns:
+            The short code now mapped to the long URL and whether it was inserted.
+        """
+        short_code = ""
+        for attempt in range(self._max_collision_attempts):
+            short_code = await self._generator.generate(long_url, attempt)
+            stored, created = await self._repository.insert_if_absent(
+                UrlMapping(
+                    short_code=short_code,
+                    long_url=long_url,
+                    created_at=datetime.now(timezone.utc),
+                )
+            )
+            if stored.long_url == long_url:
+                return short_code, created
+            logger.warning(
+                "Short code collision, probing next code",
+                extra={"short_code": short_code, "attempt": attempt},
+            )
+        raise ShortCodeCollisionError(short_code, long_url)
+
+    async def shorten_urls_batch(
+        self, request: BatchShortenUrlRequest
+    ) -> BatchShortenUrlResponse:
+        """
+        Create short URLs for several long URLs at once.
+
+        All URLs are validated first and duplicates are collapsed in memory.
+        Distinct mappings are stored with one multi-row insert per chunk; codes
+        that were already taken are verified with one bulk lookup, and the few
+        real collisions fall back to probing one by one. Everything is
+        committed together. Each result reports "created" for the first
+        occurrence of a newly stored URL and "existing" otherwise.
+        """
+        if len(request.long_urls) > self._batch_max_size:
+            raise BatchTooLargeError(len(request.long_urls), self._batch_max_size)
+        for long_url in request.long_urls:
+            self._validate_url(long_url)
+
+        unique_urls = list(dict.fromkeys(request.long_urls))
+        codes: Dict[str, str] = {}
+        created_urls: Set[str] = set()
+        collided: List[str] = []
+
+        for start in range(0, len(unique_urls), self._batch_chunk_size):
+            chunk = unique_urls[start:start + self._batch_chunk_size]
+            if not self._generator.deterministic:
+                existing = await self._repository.find_many_by_long_urls(chunk)
+                for long_url, url_mapping in existing.items():
+                    codes[long_url] = url_mapping.short_code
+                chunk = [long_url for long_url in chunk if long_url not in existing]
+            await self._store_chunk(chunk, codes, created_urls, collided)
+
+        for long_url in collided:
+            codes[long_url], created = await self._store(long_url)
+            if created:
+                created_urls.add(long_url)
+
+        if created_urls:
+            await self._repository.commit()
+
+        results: List[BatchShortenUrlItem] = []
+        reported: Set[str] = set()
+        for long_url in request.long_urls:
+            short_code = codes[long_url]
+            created = long_url in created_urls and long_url not in reported
+            reported.add(long_url)
+            results.append(
+                BatchShortenUrlItem(
+                    short_code=short_code,
+                    short_url=f"{self._base_url}/{short_code}",
+                    long_url=long_url,
+                    status="created" if created else "existing",
+                )
+            )
 
         logger.info(
-            "Created new short URL",
-            extra={"short_code": short_code, "long_url": request.long_url},
+            "Shortened URL batch",
+            extra={"count": len(request.long_urls), "created_count": len(created_urls)},
         )
+        return BatchShortenUrlResponse(results=results)
 
-        return ShortenUrlResponse(
-            short_code=short_code,
-            short_url=f"{self._base_url}/{short_code}",
-            long_url=request.long_url,
-        )
+    async def _store_chunk(
+        self,
+        long_urls: List[str],
+        codes: Dict[str, str],
+        created_urls: Set[str],
+        collided: List[str],
+    ) -> None:
+        """Insert one chunk with a single multi-row insert and sort out the outcomes."""
+        now = datetime.now(timezone.utc)
+        mappings: Dict[str, UrlMapping] = {}
+        for long_url in long_urls:
+            short_code = await self._generator.generate(long_url)
+            if short_code in mappings:
+                # Two URLs of the same batch share a code
+                collided.append(long_url)
+                continue
+            mappings[short_code] = UrlMapping(short_code=short_code, long_url=long_url, created_at=now)
+        if not mappings:
+            return
+
+        inserted = await self._repository.insert_many_if_absent(list(mappings.values()))
+        skipped = [short_code for short_code in mappings if short_code not in inserted]
+        stored = await self._repository.find_many_by_short_codes(skipped) if skipped else {}
+
+        for short_code, url_mapping in mappings.items():
+            if short_code in inserted:
+                codes[url_mapping.long_url] = short_code
+                created_urls.add(url_mapping.long_url)
+            elif short_code in stored and stored[short_code].long_url == url_mapping.long_url:
+                codes[url_mapping.long_url] = short_code
+            else:
+                collided.append(url_mapping.long_url)
 
     async def resolve_url(self, short_code: str) -> ResolveUrlResponse:
         """
@@ -110,21 +259,33 @@ class UrlManagementService(IUrlManagementService):
         Publishes a UrlAccessedEvent on successful resolution.
         Raises UrlNotFoundError if the short code does not exist.
         """
-        url_mapping = await self._repository.find_by_short_code(short_code)
-        if url_mapping is None:
-            raise UrlNotFoundError(short_code)
+        return ResolveUrlResponse(long_url=await self.resolve_long_url(short_code))
 
-        # Publish access event
-        event = UrlAccessedEvent(
-            short_code=short_code,
-            long_url=url_mapping.long_url,
-            accessed_at=datetime.now(timezone.utc),
-        )
-        await self._message_broker.publish(event, routing_key="url.accessed")
+    async def resolve_long_url(self, short_code: str) -> str:
+        """
+        Resolve a short code to the original long URL without building a response model.
+
+        Used by the redirect fast path; behaves exactly like resolve_url.
+        Raises UrlNotFoundError if the short code does not exist.
+        """
+        with tracer.start_span("resolve", attributes={"short_code": short_code}) as span:
+            long_url = await self._repository.find_long_url(short_code)
+            if long_url is None:
+                span.set_attribute("found", False)
+                raise UrlNotFoundError(short_code)
+            span.set_attribute("found", True)
+
+            # Publish access event
+            event = UrlAccessedEvent(
+                short_code=short_code,
+                long_url=long_url,
+                accessed_at=datetime.now(timezone.utc),
+            )
+            await self._message_broker.publish(event, routing_key="url.accessed")
 
         logger.info(
             "Resolved short URL",
-            extra={"short_code": short_code, "long_url": url_mapping.long_url},
+            extra={"short_code": short_code, "long_url": long_url},
         )
 
-        return ResolveUrlResponse(long_url=url_mapping.long_url)
+        return long_url
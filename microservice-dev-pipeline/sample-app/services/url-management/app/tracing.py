@@ -0,0 +1,292 @@
+"""
+Lightweight distributed tracing with W3C trace context propagation.
+
+Spans are timed on the event loop and handed to an exporter that writes
+them, one JSON object per line, from a background thread. The current span
+is tracked in a context variable, so spans opened while another is active
+become its children, including across awaits and tasks.
+
+Trace context crosses service boundaries as a W3C `traceparent` value
+(version-trace_id-span_id-flags), carried in the AMQP message headers
+between url-management and analytics. Spans of both services can then be
+joined on trace_id.
+
+Events published later from a background task (buffered, aggregated,
+outbox and journaled events) keep the trace context they were published
+in: attach() records it on the event, and the broker puts it in that
+event's message headers instead of the background task's own span.
+
+Tracing is off until configure() is given an export path; the module-level
+tracer then answers start_span() with a shared no-op span.
+"""
+
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+# Instance attribute holding an event's trace context; not serialized with the event
+_EVENT_TRACEPARENT = "_traceparent"
+
+
+class SpanContext:
+    """Identity of a span, as propagated to other services."""
+
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+    @property
+    def traceparent(self) -> str:
+        """W3C traceparent header value of this span."""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(value: object) -> Optional[SpanContext]:
+    """Return the span context of a traceparent header value, or None if it is absent or invalid."""
+    if isinstance(value, bytes):
+        value = value.decode("latin-1")
+    if not isinstance(value, str):
+        return None
+    match = _TRACEPARENT.match(value.strip())
+    if match is None or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return SpanContext(match.group(1), match.group(2), bool(int(match.group(3), 16) & 1))
+
+
+_current_span: ContextVar[Optional[SpanContext]] = ContextVar("current_span", default=None)
+
+
+class JsonlSpanExporter:
+    """
+    Writes finished spans as JSON lines to a file from a background thread.
+
+    The file stands in for a trace collector. Spans that do not fit in the
+    queue are dropped and counted rather than blocking the event loop.
+    """
+
+    def __init__(self, path: str, queue_max_size: int = 10_000):
+        self._path = path
+        self._queue: "queue.Queue[Optional[Dict[str, object]]]" = queue.Queue(maxsize=queue_max_size)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+        self.dropped = 0
+
+    def export(self, span: Dict[str, object]) -> None:
+        """Queue a finished span for writing."""
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        """Write the queued spans and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        with open(self._path, "a", encoding="utf-8") as f:
+            while True:
+                span = self._queue.get()
+                if span is None:
+                    return
+                f.write(json.dumps(span, default=str) + "\n")
+                if self._queue.empty():
+                    f.flush()
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ("_tracer", "name", "context", "parent_span_id", "start_time", "attributes", "status")
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        context: SpanContext,
+        parent_span_id: Optional[str],
+        start_time: float,
+        attributes: Optional[Dict[str, object]] = None,
+    ):
+        self._tracer = tracer
+        self.name = name
+        self.context = context
+        self.parent_span_id = parent_span_id
+        self.start_time = start_time
+        self.attributes: Dict[str, object] = dict(attributes or {})
+        self.status = "ok"
+
+    def set_attribute(self, key: str, value: object) -> None:
+        """Attach a key/value pair to the span."""
+        self.attributes[key] = value
+
+    def end(self, end_time: Optional[float] = None) -> None:
+        """Finish the span and export it if its trace is sampled."""
+        if self.context.sampled:
+            self._tracer._export(self, time.time() if end_time is None else end_time)
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled."""
+
+    context = None
+
+    def set_attribute(self, key: str, value: object) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Creates spans for one service and passes the finished ones to its exporter."""
+
+    def __init__(self) -> None:
+        self.service_name = ""
+        self._exporter: Optional[JsonlSpanExporter] = None
+        self._sample_rate = 1.0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are being recorded."""
+        return self._exporter is not None
+
+    def configure(self, service_name: str, export_path: Optional[str], sample_rate: float = 1.0) -> None:
+        """
+        Start recording spans, or keep tracing disabled if no export path is given.
+
+        Args:
+            service_name: Name recorded on every span.
+            export_path: JSON lines file the spans are appended to.
+            sample_rate: Fraction of new traces that are recorded; propagated
+                traces keep the sampling decision of their origin.
+        """
+        self.shutdown()
+        self.service_name = service_name
+        self._sample_rate = sample_rate
+        if export_path:
+            self._exporter = JsonlSpanExporter(export_path)
+            logger.info("Tracing enabled", extra={"export_path": export_path, "sample_rate": sample_rate})
+
+    def shutdown(self) -> None:
+        """Flush the exported spans and stop recording."""
+        exporter, self._exporter = self._exporter, None
+        if exporter is not None:
+            exporter.close()
+
+    def current_traceparent(self) -> Optional[str]:
+        """Return the traceparent of the active span, if any."""
+        current = _current_span.get()
+        return current.traceparent if current is not None and self.enabled else None
+
+    def attach(self, event: object) -> None:
+        """Record on an event about to be queued or stored the trace context of the active span."""
+        self.attach_traceparent(event, self.current_traceparent())
+
+    @staticmethod
+    def attach_traceparent(event: object, traceparent: Optional[str]) -> None:
+        """Record a stored trace context on an event, keeping one attached earlier."""
+        if traceparent is not None and getattr(event, _EVENT_TRACEPARENT, None) is None:
+            setattr(event, _EVENT_TRACEPARENT, traceparent)
+
+    @staticmethod
+    def attached_traceparent(event: object) -> Optional[str]:
+        """Return the trace context attached to an event, if any."""
+        return getattr(event, _EVENT_TRACEPARENT, None)
+
+    def _new_context(self, parent: Optional[SpanContext]) -> SpanContext:
+        if parent is None:
+            return SpanContext(
+                f"{random.getrandbits(128):032x}",
+                f"{random.getrandbits(64):016x}",
+                random.random() < self._sample_rate,
+            )
+        return SpanContext(parent.trace_id, f"{random.getrandbits(64):016x}", parent.sampled)
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[SpanContext] = None,
+        attributes: Optional[Dict[str, object]] = None,
+    ) -> Iterator[Span]:
+        """
+        Time the enclosed block as a span, active for everything started inside it.
+
+        Args:
+            name: Operation name.
+            parent: Remote parent; defaults to the active span of this context.
+            attributes: Initial span attributes.
+        """
+        if self._exporter is None:
+            yield _NOOP_SPAN  # type: ignore[misc]
+            return
+        parent = parent or _current_span.get()
+        span = Span(
+            self,
+            name,
+            self._new_context(parent),
+            parent.span_id if parent else None,
+            time.time(),
+            attributes,
+        )
+        token = _current_span.set(span.context)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.set_attribute("error", repr(e))
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def record_span(
+        self,
+        name: str,
+        start_time: float,
+        end_time: float,
+        parent: Optional[SpanContext] = None,
+        attributes: Optional[Dict[str, object]] = None,
+    ) -> None:
+        """Export a span for an interval that has already elapsed, such as a queue wait."""
+        if self._exporter is None:
+            return
+        parent = parent or _current_span.get()
+        span = Span(self, name, self._new_context(parent), parent.span_id if parent else None, start_time, attributes)
+        span.end(end_time)
+
+    def _export(self, span: Span, end_time: float) -> None:
+        if self._exporter is None:
+            return
+        self._exporter.export(
+            {
+                "trace_id": span.context.trace_id,
+                "span_id": span.context.span_id,
+                "parent_span_id": span.parent_span_id,
+                "service": self.service_name,
+                "name": span.name,
+                "start_time": span.start_time,
+                "end_time": end_time,
+                "duration_ms": (end_time - span.start_time) * 1000,
+                "status": span.status,
+                "attributes": span.attributes,
+            }
+        )
+
+
+tracer = Tracer()
@@ -0,0 +1,104 @@
+"""
+Benchmark of the redirect fast path against the FastAPI redirect route.
+
+Sends GET /{short_code} requests through httpx's in-process ASGI transport
+to two copies of the application, one with RedirectFastPathMiddleware and
+one serving redirects from the router, both backed by the same in-memory
+repository and broker. Without network and database the numbers isolate
+the framework overhead per request.
+
+Usage:
+    python -m benchmarks.bench_redirect --requests 20000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import AsyncGenerator, Dict, List
+
+import httpx
+from fastapi import FastAPI
+
+from app.adapters.in_memory_broker import InMemoryBroker
+from app.adapters.in_memory_repository import InMemoryUrlRepository
+from app.api.redirect_fast_path import RedirectFastPathMiddleware
+from app.api.urls import router
+from app.dependencies import get_url_service
+from app.models.url_mapping import UrlMapping
+from app.services.url_service import UrlManagementService
+
+
+def _build_app(repository: InMemoryUrlRepository, fast_path: bool) -> FastAPI:
+    async def provide_service() -> AsyncGenerator[UrlManagementService, None]:
+        yield UrlManagementService(
+            repository=repository, message_broker=InMemoryBroker(), base_url="http://short.url"
+        )
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_url_service] = provide_service
+    if fast_path:
+        app.add_middleware(RedirectFastPathMiddleware, service_provider=provide_service)
+    return app
+
+
+async def _measure(app: FastAPI, codes: List[str], concurrency: int) -> Dict[str, float]:
+    """Issue the requests with a fixed number of concurrent clients; return throughput and latency."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for code in codes[:200]:
+            await client.get(f"/{code}")
+
+        queue = iter(codes)
+        latencies: List[float] = []
+
+        async def worker() -> None:
+            for code in queue:
+                t0 = time.perf_counter()
+                response = await client.get(f"/{code}")
+                latencies.append(time.perf_counter() - t0)
+                assert response.status_code == 301
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests_per_second": len(codes) / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+    }
+
+
+async def main(rows: int, requests: int, concurrency: int) -> None:
+    repository = InMemoryUrlRepository()
+    now = datetime.now(timezone.utc)
+    codes = [f"bench{i:08d}" for i in range(rows)]
+    for code in codes:
+        await repository.save(UrlMapping(short_code=code, long_url=f"https://example.com/{code}", created_at=now))
+    sample = [codes[i % rows] for i in range(requests)]
+
+    results = {
+        "route": await _measure(_build_app(repository, fast_path=False), sample, concurrency),
+        "fast-path": await _measure(_build_app(repository, fast_path=True), sample, concurrency),
+    }
+
+    baseline = results["route"]["requests_per_second"]
+    print(f"{'path':<11}{'req/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'speedup':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<11}{result['requests_per_second']:>12.0f}{result['p50_ms']:>10.3f}"
+            f"{result['p99_ms']:>10.3f}{result['requests_per_second'] / baseline:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.requests, args.concurrency))
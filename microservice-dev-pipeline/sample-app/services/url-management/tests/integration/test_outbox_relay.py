@@ -0,0 +1,136 @@
+"""
+Integration tests for the transactional outbox.
+
+Uses testcontainers to run a real PostgreSQL instance and verifies that
+OutboxBroker persists events and OutboxRelay publishes and deletes them.
+"""
+
+import pytest
+from datetime import datetime, timezone
+
+from testcontainers.postgres import PostgresContainer
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool
+
+from architecture.contracts.common import UrlAccessedEvent
+
+from app.adapters.in_memory_broker import InMemoryBroker
+from app.adapters.outbox_broker import OutboxBroker
+from app.adapters.outbox_relay import OutboxRelay
+from app.models.outbox_event import OutboxEvent  # noqa: F401  (registers the table)
+from app.models.url_mapping import Base
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+@pytest.fixture(scope="module")
+def postgres_container():
+    """
+    Start PostgreSQL container for integration tests.
+
+    Scope: module (shared across all tests in this file for performance).
+    """
+    with PostgresContainer("postgres:15-alpine") as postgres:
+        yield postgres.get_connection_url()
+
+
+@pytest.fixture
+async def engine(postgres_container):
+    """Create async database engine and initialize schema."""
+    db_url = postgres_container.replace("psycopg2", "asyncpg")
+
+    engine = create_async_engine(db_url, poolclass=NullPool, echo=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE TABLE event_outbox"))
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_maker(engine):
+    """Provide a session factory bound to the test engine."""
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def _event(short_code: str) -> UrlAccessedEvent:
+    return UrlAccessedEvent(
+        short_code=short_code,
+        long_url=f"https://example.com/{short_code}",
+        accessed_at=datetime.now(timezone.utc),
+    )
+
+
+# ============================================================================
+# Persistence Verification Tests
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_outbox_broker_persists_event(session_maker):
+    """Verify that publish() commits the event to the outbox table."""
+    async with session_maker() as session:
+        await OutboxBroker(session).publish(_event("outbox01"), routing_key="url.accessed")
+
+    # Verify with NEW session
+    async with session_maker() as new_session:
+        result = await new_session.execute(
+            text("SELECT event_type, routing_key, payload FROM event_outbox")
+        )
+        rows = result.fetchall()
+        assert len(rows) == 1, "Event was not persisted to the outbox!"
+        assert rows[0][0] == "UrlAccessedEvent"
+        assert rows[0][1] == "url.accessed"
+        assert "outbox01" in rows[0][2]
+
+
+@pytest.mark.asyncio
+async def test_relay_publishes_in_order_and_deletes(session_maker):
+    """Verify that the relay publishes pending rows in order and removes them."""
+    async with session_maker() as session:
+        outbox = OutboxBroker(session)
+        for i in range(5):
+            await outbox.publish(_event(f"relay{i:03d}"), routing_key="url.accessed")
+
+    broker = InMemoryBroker()
+    relay = OutboxRelay(session_maker, broker, batch_size=3, poll_interval_seconds=0.01)
+
+    assert await relay.relay_batch() == 3
+    assert await relay.relay_batch() == 2
+    assert await relay.relay_batch() == 0
+
+    assert [event.short_code for event, _ in broker.published_events] == [
+        f"relay{i:03d}" for i in range(5)
+    ]
+    assert all(isinstance(event, UrlAccessedEvent) for event, _ in broker.published_events)
+
+    async with session_maker() as new_session:
+        count = (await new_session.execute(text("SELECT COUNT(*) FROM event_outbox"))).scalar()
+        assert count == 0, f"Expected published rows to be deleted, found {count}"
+
+
+@pytest.mark.asyncio
+async def test_relay_keeps_rows_when_broker_fails(session_maker):
+    """Verify that rows stay in the outbox when publishing fails."""
+    async with session_maker() as session:
+        await OutboxBroker(session).publish(_event("keep0001"), routing_key="url.accessed")
+
+    class FailingBroker(InMemoryBroker):
+        async def publish(self, event, routing_key):
+            raise RuntimeError("Message broker is not connected. Call connect() first.")
+
+    relay = OutboxRelay(session_maker, FailingBroker(), batch_size=10, poll_interval_seconds=0.01)
+    with pytest.raises(RuntimeError):
+        await relay.relay_batch()
+
+    async with session_maker() as new_session:
+        count = (await new_session.execute(text("SELECT COUNT(*) FROM event_outbox"))).scalar()
+        assert count == 1
@@ -0,0 +1,93 @@
+"""
+Integration tests for PostgresIdBlockAllocator.
+
+Uses testcontainers to run a real PostgreSQL instance and verifies that
+ID blocks leased from the shared counter row never overlap.
+"""
+
+import asyncio
+
+import pytest
+
+from testcontainers.postgres import PostgresContainer
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool
+
+from app.adapters.postgres_id_allocator import PostgresIdBlockAllocator
+from app.models.id_block_counter import IdBlockCounter  # noqa: F401  (registers the table)
+from app.models.url_mapping import Base
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+@pytest.fixture(scope="module")
+def postgres_container():
+    """
+    Start PostgreSQL container for integration tests.
+
+    Scope: module (shared across all tests in this file for performance).
+    """
+    with PostgresContainer("postgres:15-alpine") as postgres:
+        yield postgres.get_connection_url()
+
+
+@pytest.fixture
+async def engine(postgres_container):
+    """Create async database engine and initialize schema."""
+    db_url = postgres_container.replace("psycopg2", "asyncpg")
+
+    engine = create_async_engine(db_url, poolclass=NullPool, echo=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE TABLE id_block_counters"))
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_maker(engine):
+    """Provide a session factory bound to the test engine."""
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+# ============================================================================
+# Allocation Tests
+# ============================================================================
+
+
+@pytest.mark.asyncio
+async def test_first_block_starts_at_one(session_maker):
+    """Verify that the counter row is created on first use."""
+    allocator = PostgresIdBlockAllocator(session_maker, counter_name="short_codes")
+
+    assert await allocator.allocate_block(100) == 1
+    assert await allocator.allocate_block(100) == 101
+
+    # Verify with NEW session
+    async with session_maker() as new_session:
+        next_id = (
+            await new_session.execute(
+                text("SELECT next_id FROM id_block_counters WHERE name = 'short_codes'")
+            )
+        ).scalar()
+        assert next_id == 201
+
+
+@pytest.mark.asyncio
+async def test_concurrent_allocators_get_disjoint_blocks(session_maker):
+    """Verify that workers sharing the counter never receive overlapping blocks."""
+    allocators = [
+        PostgresIdBlockAllocator(session_maker, counter_name="short_codes") for _ in range(5)
+    ]
+
+    starts = await asyncio.gather(*(allocator.allocate_block(50) for allocator in allocators))
+
+    assert sorted(starts) == [1, 51, 101, 151, 201]
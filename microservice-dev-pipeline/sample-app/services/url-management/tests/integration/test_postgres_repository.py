@@ -7,14 +7,16 @@ verification pattern.
 """
 
 import pytest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from testcontainers.postgres import PostgresContainer
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.pool import NullPool
 
+from app.adapters.asyncpg_url_lookup import AsyncpgUrlLookup
 from app.adapters.postgres_repository import PostgresUrlRepository
+from app.adapters.url_snapshot import UrlSnapshotIndex, export_snapshot
 from app.models.url_mapping import Base, UrlMapping
 
 
@@ -130,6 +132,49 @@ async def test_find_by_short_code(repository, session, engine):
         assert found.long_url == "https://example.com/find-by-code"
 
 
+@pytest.mark.asyncio
+async def test_find_long_url(repository, session, engine):
+    """Verify that find_long_url returns only the persisted long URL."""
+    await repository.save(
+        UrlMapping(
+            short_code="lean1234",
+            long_url="https://example.com/lean-lookup",
+            created_at=datetime.now(timezone.utc),
+        )
+    )
+    await session.commit()
+
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_maker() as new_session:
+        new_repo = PostgresUrlRepository(new_session)
+        assert await new_repo.find_long_url("lean1234") == "https://example.com/lean-lookup"
+        assert await new_repo.find_long_url("missing1") is None
+
+
+@pytest.mark.asyncio
+async def test_asyncpg_lookup_reads_committed_mapping(repository, session, postgres_container):
+    """Verify that the raw asyncpg lookup sees mappings committed through the ORM."""
+    await repository.save(
+        UrlMapping(
+            short_code="raw12345",
+            long_url="https://example.com/raw-lookup",
+            created_at=datetime.now(timezone.utc),
+        )
+    )
+    await session.commit()
+
+    lookup = AsyncpgUrlLookup(postgres_container.replace("+psycopg2", ""), min_size=1, max_size=2)
+    await lookup.connect()
+    try:
+        assert await lookup.find_long_url("raw12345") == "https://example.com/raw-lookup"
+        assert await lookup.find_long_url("missing1") is None
+        assert await lookup.find_long_urls(["raw12345", "missing1"]) == {
+            "raw12345": "https://example.com/raw-lookup"
+        }
+    finally:
+        await lookup.close()
+
+
 @pytest.mark.asyncio
 async def test_find_by_long_url(repository, session, engine):
     """Verify that find_by_long_url returns persisted data."""
@@ -176,3 +221,225 @@ async def test_idempotent_save(repository, session, engine):
         )
         count = result.scalar()
         assert count == 1, f"Expected 1 row, found {count}"
+
+
+@pytest.mark.asyncio
+async def test_insert_if_absent_reports_created_and_existing(repository, session, engine):
+    """
+    Verify that insert_if_absent inserts once and reports existing rows
+    without raising on the unique constraint.
+    """
+    first = UrlMapping(
+        short_code="upsert12",
+        long_url="https://example.com/upsert",
+        created_at=datetime.now(timezone.utc),
+    )
+    stored, created = await repository.insert_if_absent(first)
+    assert created is True
+    assert stored.id is not None
+    await session.commit()
+
+    duplicate = UrlMapping(
+        short_code="upsert12",
+        long_url="https://example.com/upsert",
+        created_at=datetime.now(timezone.utc),
+    )
+    stored, created = await repository.insert_if_absent(duplicate)
+    assert created is False
+    assert stored.long_url == "https://example.com/upsert"
+    await session.commit()
+
+    # Verify with NEW session that exactly one row exists
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_maker() as new_session:
+        result = await new_session.execute(
+            text("SELECT COUNT(*) FROM url_mappings WHERE short_code = :code"),
+            {"code": "upsert12"},
+        )
+        assert result.scalar() == 1
+
+
+@pytest.mark.asyncio
+async def test_insert_many_if_absent_skips_existing(repository, session, engine):
+    """Verify that a multi-row insert stores new rows and skips existing short codes."""
+    await repository.save(
+        UrlMapping(
+            short_code="many0001",
+            long_url="https://example.com/many-1",
+            created_at=datetime.now(timezone.utc),
+        )
+    )
+    await session.commit()
+
+    inserted = await repository.insert_many_if_absent(
+        [
+            UrlMapping(
+                short_code=f"many000{i}",
+                long_url=f"https://example.com/many-{i}",
+                created_at=datetime.now(timezone.utc),
+            )
+            for i in range(1, 4)
+        ]
+    )
+    await session.commit()
+
+    assert inserted == {"many0002", "many0003"}
+
+    # Verify with NEW session
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_maker() as new_session:
+        result = await new_session.execute(
+            text("SELECT COUNT(*) FROM url_mappings WHERE short_code LIKE 'many%'")
+        )
+        assert result.scalar() == 3
+
+
+@pytest.mark.asyncio
+async def test_insert_if_absent_returns_colliding_row(repository, session, engine):
+    """Verify that a conflicting insert returns the row stored under the short code."""
+    await repository.save(
+        UrlMapping(
+            short_code="coll1234",
+            long_url="https://example.com/first",
+            created_at=datetime.now(timezone.utc),
+        )
+    )
+    await session.commit()
+
+    stored, created = await repository.insert_if_absent(
+        UrlMapping(
+            short_code="coll1234",
+            long_url="https://example.com/second",
+            created_at=datetime.now(timezone.utc),
+        )
+    )
+
+    assert created is False
+    assert stored.long_url == "https://example.com/first"
+
+
+@pytest.mark.asyncio
+async def test_long_url_hash_is_persisted(repository, session, engine):
+    """Verify that the long URL digest is stored and used by find_by_long_url."""
+    url_mapping = UrlMapping(
+        short_code="hash1234",
+        long_url="https://example.com/" + "x" * 4000,
+        created_at=datetime.now(timezone.utc),
+    )
+    await repository.save(url_mapping)
+    await session.commit()
+
+    # Verify with NEW session
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_maker() as new_session:
+        result = await new_session.execute(
+            text("SELECT octet_length(long_url_hash) FROM url_mappings WHERE short_code = :code"),
+            {"code": "hash1234"},
+        )
+        assert result.scalar() == 32
+
+        found = await PostgresUrlRepository(new_session).find_by_long_url(url_mapping.long_url)
+        assert found is not None
+        assert found.short_code == "hash1234"
+
+
+@pytest.mark.asyncio
+async def test_find_many_by_short_codes(repository, session, engine):
+    """Verify that several short codes are resolved with one query."""
+    for i in range(3):
+        await repository.save(
+            UrlMapping(
+                short_code=f"bulk000{i}",
+                long_url=f"https://example.com/bulk-{i}",
+                created_at=datetime.now(timezone.utc),
+            )
+        )
+    await session.commit()
+
+    found = await repository.find_many_by_short_codes(["bulk0000", "bulk0002", "missing0"])
+
+    assert set(found) == {"bulk0000", "bulk0002"}
+    assert found["bulk0002"].long_url == "https://example.com/bulk-2"
+
+
+@pytest.mark.asyncio
+async def test_find_long_urls(repository, session, engine):
+    """Verify that the long URLs of several short codes are resolved with one query."""
+    now = datetime.now(timezone.utc)
+    await repository.insert_many_if_absent(
+        [
+            UrlMapping(short_code=f"many000{i}", long_url=f"https://example.com/many-{i}", created_at=now)
+            for i in range(3)
+        ]
+    )
+    await session.commit()
+
+    async with AsyncSession(engine) as new_session:
+        found = await PostgresUrlRepository(new_session).find_long_urls(
+            ["many0000", "many0002", "missing0"]
+        )
+
+    assert found == {
+        "many0000": "https://example.com/many-0",
+        "many0002": "https://example.com/many-2",
+    }
+
+@pytest.mark.asyncio
+async def test_list_short_codes_pages_in_id_order(repository, session):
+    """Verify that list_short_codes pages through stored codes after a given ID."""
+    now = datetime.now(timezone.utc)
+    await repository.insert_many_if_absent(
+        [
+            UrlMapping(short_code=f"page{i:04d}", long_url=f"https://example.com/page{i}", created_at=now)
+            for i in range(5)
+        ]
+    )
+    await session.commit()
+
+    first = await repository.list_short_codes(after_id=0, limit=3)
+    second = await repository.list_short_codes(after_id=first[-1][0], limit=3)
+
+    assert len(first) == 3 and len(second) == 2
+    assert sorted(code for _, code in first + second) == [f"page{i:04d}" for i in range(5)]
+    assert [row_id for row_id, _ in first + second] == sorted(row_id for row_id, _ in first + second)
+
+
+@pytest.mark.asyncio
+async def test_list_short_codes_created_after(repository, session):
+    """Verify that list_short_codes only returns codes created after the given time."""
+    now = datetime.now(timezone.utc)
+    await repository.insert_many_if_absent(
+        [
+            UrlMapping(short_code="older000", long_url="https://example.com/older", created_at=now - timedelta(minutes=5)),
+            UrlMapping(short_code="newer000", long_url="https://example.com/newer", created_at=now),
+        ]
+    )
+    await session.commit()
+
+    rows = await repository.list_short_codes(after_id=0, limit=10, created_after=now - timedelta(minutes=1))
+
+    assert [code for _, code in rows] == ["newer000"]
+
+
+@pytest.mark.asyncio
+async def test_export_snapshot_round_trip(repository, session, engine, tmp_path):
+    """Verify that exported mappings are found in the memory-mapped snapshot."""
+    now = datetime.now(timezone.utc)
+    codes = ["Zeta0001", "alpha001", "beta0001", "_under01"]
+    await repository.insert_many_if_absent(
+        [UrlMapping(short_code=code, long_url=f"https://example.com/{code}", created_at=now) for code in codes]
+    )
+    await session.commit()
+
+    path = str(tmp_path / "url_mappings.snapshot")
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    assert await export_snapshot(session_maker, path) == len(codes)
+
+    index = UrlSnapshotIndex(path)
+    try:
+        for code in codes:
+            record = index.lookup(code)
+            assert record is not None, f"{code} missing from snapshot"
+            assert record[2] == f"https://example.com/{code}"
+    finally:
+        index.close()
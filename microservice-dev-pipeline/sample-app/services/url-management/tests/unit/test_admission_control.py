@@ -0,0 +1,195 @@
+"""
+Unit tests for admission control and load shedding.
+
+Limiters are exercised directly on the event loop; the middleware is driven
+through httpx's ASGI transport with handlers that block until released.
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.admission_control import AdmissionControlMiddleware, AdmissionLimiter, AdmissionRejected
+
+
+def _limiter(
+    initial_limit: int = 2,
+    max_queue: int = 10,
+    yields_to: Optional[AdmissionLimiter] = None,
+    name: str = "redirect",
+) -> AdmissionLimiter:
+    return AdmissionLimiter(
+        name,
+        initial_limit=initial_limit,
+        max_limit=100,
+        latency_target_seconds=0.05,
+        deadline_seconds=0.2,
+        max_queue=max_queue,
+        yields_to=yields_to,
+    )
+
+
+def _deadline(seconds: float = 1.0) -> float:
+    return asyncio.get_running_loop().time() + seconds
+
+
+@pytest.mark.asyncio
+async def test_requests_above_limit_wait_for_a_free_slot() -> None:
+    """A queued request is admitted as soon as an admitted one completes."""
+    limiter = _limiter(initial_limit=1)
+    await limiter.acquire(_deadline())
+
+    waiting = asyncio.create_task(limiter.acquire(_deadline()))
+    await asyncio.sleep(0)
+    assert limiter.queued == 1 and not waiting.done()
+
+    limiter.release(0.001, dropped=False)
+    await waiting
+    assert limiter.stats()["admitted"] == 2
+    assert limiter.inflight == 1 and limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_immediately() -> None:
+    """Requests beyond the queue bound are rejected without waiting."""
+    limiter = _limiter(initial_limit=1, max_queue=1)
+    await limiter.acquire(_deadline())
+    waiting = asyncio.create_task(limiter.acquire(_deadline()))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await limiter.acquire(_deadline())
+
+    assert rejected.value.reason == "queue_full"
+    waiting.cancel()
+
+
+@pytest.mark.asyncio
+async def test_queued_request_is_shed_at_its_deadline() -> None:
+    """A request still queued at its deadline is rejected and leaves the queue."""
+    limiter = _limiter(initial_limit=1)
+    await limiter.acquire(_deadline())
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await limiter.acquire(_deadline(0.01))
+
+    assert rejected.value.reason == "deadline"
+    assert limiter.queued == 0 and limiter.inflight == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_gives_back_its_slot() -> None:
+    """A waiter cancelled after being granted a slot returns it to the next waiter."""
+    limiter = _limiter(initial_limit=1)
+    await limiter.acquire(_deadline())
+    first = asyncio.create_task(limiter.acquire(_deadline()))
+    second = asyncio.create_task(limiter.acquire(_deadline()))
+    await asyncio.sleep(0)
+
+    limiter.release(0.001, dropped=False)
+    first.cancel()
+    await asyncio.gather(first, return_exceptions=True)
+    await second
+
+    assert limiter.inflight == 1 and limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_limit_shrinks_on_slow_requests_and_grows_on_fast_ones() -> None:
+    """The limit backs off multiplicatively and recovers additively."""
+    limiter = _limiter(initial_limit=10)
+
+    for _ in range(10):
+        await limiter.acquire(_deadline())
+    for _ in range(10):
+        limiter.release(1.0, dropped=False)
+    assert limiter.limit == 3
+
+    for _ in range(50):
+        for _ in range(3):
+            await limiter.acquire(_deadline())
+        for _ in range(3):
+            limiter.release(0.001, dropped=False)
+    assert limiter.limit > 3
+
+
+@pytest.mark.asyncio
+async def test_shorten_yields_to_queued_redirects() -> None:
+    """Shorten requests are shed while redirects are waiting for admission."""
+    redirect = _limiter(initial_limit=1)
+    shorten = _limiter(yields_to=redirect, name="shorten")
+    await redirect.acquire(_deadline())
+    waiting = asyncio.create_task(redirect.acquire(_deadline()))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        await shorten.acquire(_deadline())
+    assert rejected.value.reason == "priority"
+
+    redirect.release(0.001, dropped=False)
+    await waiting
+    await shorten.acquire(_deadline())
+
+
+def _build_app(gate: asyncio.Event, redirect: AdmissionLimiter, shorten: AdmissionLimiter) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health_check() -> dict:
+        return {"status": "healthy"}
+
+    @app.get("/{short_code}")
+    async def redirect_url(short_code: str) -> dict:
+        await gate.wait()
+        return {"short_code": short_code}
+
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        redirect_limiter=redirect,
+        shorten_limiter=shorten,
+        retry_after_seconds=2,
+    )
+    return app
+
+
+@pytest.mark.asyncio
+async def test_middleware_sheds_with_503_and_retry_after() -> None:
+    """Overflowing redirects get a 503 with Retry-After; unlimited routes are served."""
+    gate = asyncio.Event()
+    redirect = _limiter(initial_limit=1, max_queue=0)
+    app = _build_app(gate, redirect, _limiter(name="shorten"))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        admitted = asyncio.create_task(client.get("/abc12345"))
+        while redirect.inflight == 0:
+            await asyncio.sleep(0.001)
+
+        shed = await client.get("/def67890")
+        health = await client.get("/health")
+        gate.set()
+        response = await admitted
+
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "2"
+    assert health.status_code == 200
+    assert response.status_code == 200
+    assert redirect.stats()["shed"]["queue_full"] == 1
+
+
+@pytest.mark.asyncio
+async def test_middleware_answers_503_when_deadline_expires() -> None:
+    """A request that runs past its deadline is cancelled, answered with 503 and backs off the limit."""
+    redirect = _limiter(initial_limit=4)
+    app = _build_app(asyncio.Event(), redirect, _limiter(name="shorten"))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/abc12345")
+
+    assert response.status_code == 503
+    assert redirect.deadline_exceeded == 1
+    assert redirect.limit == 3 and redirect.inflight == 0
@@ -0,0 +1,147 @@
+"""
+Unit tests for AggregatingBroker.
+
+Wraps the in-memory broker to verify that accesses are counted per short
+code and published as one UrlAccessCountedEvent per window.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, Sequence, Tuple
+
+import pytest
+from pydantic import BaseModel
+
+from architecture.contracts.common import UrlAccessCountedEvent, UrlAccessedEvent
+
+from app.adapters.aggregating_broker import AggregatingBroker
+from app.adapters.in_memory_broker import InMemoryBroker
+
+
+class FailingBroker(InMemoryBroker):
+    """In-memory broker whose batch publishes can be made to fail."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.fail = False
+        self.deliver_before_failing = 0
+
+    async def publish_batch(self, events: Sequence[Tuple[BaseModel, str]]) -> None:
+        if self.fail:
+            # Like RabbitMQBroker, some events may be confirmed before the batch fails
+            await super().publish_batch(events[:self.deliver_before_failing])
+            raise RuntimeError("No open RabbitMQ channel is available")
+        await super().publish_batch(events)
+
+
+def _event(short_code: str) -> UrlAccessedEvent:
+    return UrlAccessedEvent(
+        short_code=short_code,
+        long_url=f"https://example.com/{short_code}",
+        accessed_at=datetime.now(timezone.utc),
+    )
+
+
+def _counts(inner: InMemoryBroker) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for event, routing_key in inner.published_events:
+        assert isinstance(event, UrlAccessCountedEvent)
+        assert routing_key == "url.access_counted"
+        counts[event.short_code] = counts.get(event.short_code, 0) + event.count
+    return counts
+
+
+@pytest.mark.asyncio
+async def test_accesses_are_published_as_counts_per_window() -> None:
+    """Repeated accesses within a window become one event per short code."""
+    inner = InMemoryBroker()
+    broker = AggregatingBroker(inner, window_seconds=0.02)
+    await broker.connect()
+
+    for _ in range(5):
+        await broker.publish(_event("popular0"), "url.accessed")
+    await broker.publish_batch([(_event("rare0000"), "url.accessed")])
+    await asyncio.sleep(0.05)
+
+    assert len(inner.published_events) == 2
+    assert _counts(inner) == {"popular0": 5, "rare0000": 1}
+    event = inner.published_events[0][0]
+    assert event.window_start <= event.window_end
+    assert broker.stats()["accesses"] == 6
+    await broker.close()
+
+
+@pytest.mark.asyncio
+async def test_full_window_is_published_early_and_close_publishes_the_rest() -> None:
+    """Reaching max_keys closes the window before it elapses; close() publishes the open window."""
+    inner = InMemoryBroker()
+    broker = AggregatingBroker(inner, window_seconds=10, max_keys=2)
+    await broker.connect()
+
+    await broker.publish(_event("first000"), "url.accessed")
+    await broker.publish(_event("second00"), "url.accessed")
+    await asyncio.sleep(0.01)
+    assert _counts(inner) == {"first000": 1, "second00": 1}
+
+    await broker.publish(_event("first000"), "url.accessed")
+    await broker.close()
+    assert _counts(inner) == {"first000": 2, "second00": 1}
+
+
+@pytest.mark.asyncio
+async def test_failed_window_is_carried_into_the_next() -> None:
+    """Counts of a window that could not be published are added to the next window."""
+    inner = FailingBroker()
+    broker = AggregatingBroker(inner, window_seconds=10)
+    await broker.connect()
+
+    inner.fail = True
+    await broker.publish(_event("carried0"), "url.accessed")
+    assert not await broker.flush()
+    assert broker.stats()["pending_accesses"] == 1
+
+    inner.fail = False
+    await broker.publish(_event("carried0"), "url.accessed")
+    await broker.close()
+    assert _counts(inner) == {"carried0": 2}
+    assert broker.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_partly_delivered_window_is_retried_with_the_same_event_ids() -> None:
+    """Events retried after a partial failure keep their event_id, so a consumer can skip those delivered."""
+    inner = FailingBroker()
+    broker = AggregatingBroker(inner, window_seconds=10)
+    await broker.connect()
+
+    inner.fail = True
+    inner.deliver_before_failing = 1
+    await broker.publish(_event("first000"), "url.accessed")
+    await broker.publish(_event("second00"), "url.accessed")
+    assert not await broker.flush()
+
+    inner.fail = False
+    await broker.close()
+
+    deduplicated: Dict[str, UrlAccessCountedEvent] = {}
+    for event, _ in inner.published_events:
+        deduplicated.setdefault(event.event_id, event)
+    assert len(inner.published_events) == 3
+    assert sorted(event.short_code for event in deduplicated.values()) == ["first000", "second00"]
+    assert all(event.count == 1 for event in deduplicated.values())
+
+
+@pytest.mark.asyncio
+async def test_other_events_pass_through() -> None:
+    """Events other than UrlAccessedEvent are published directly."""
+    inner = InMemoryBroker()
+    broker = AggregatingBroker(inner, window_seconds=10)
+    now = datetime.now(timezone.utc)
+    counted = UrlAccessCountedEvent(
+        short_code="other000", long_url="https://example.com", count=3, window_start=now, window_end=now
+    )
+
+    await broker.publish(counted, "url.access_counted")
+
+    assert inner.published_events == [(counted, "url.access_counted")]
+    await broker.close()
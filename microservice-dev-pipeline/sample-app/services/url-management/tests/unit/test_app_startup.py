@@ -19,6 +19,12 @@ def test_app_has_shorten_endpoint() -> None:
     assert "/api/v1/urls" in routes
 
 
+def test_app_has_batch_shorten_endpoint() -> None:
+    """Test that the batch URL shortening endpoint is registered."""
+    routes = [route.path for route in app.routes]
+    assert "/api/v1/urls:batch" in routes
+
+
 def test_app_has_redirect_endpoint() -> None:
     """Test that the redirect endpoint is registered."""
     routes = [route.path for route in app.routes]
@@ -0,0 +1,115 @@
+"""
+Unit tests for micro-batched short code lookups.
+
+The batch loader is fed by an in-memory repository that records the size
+of every bulk lookup it serves.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence
+
+import pytest
+
+from app.adapters.batched_lookup import BatchedLookupUrlRepository, BatchLoader
+from app.adapters.in_memory_repository import InMemoryUrlRepository
+from app.models.url_mapping import UrlMapping
+
+
+class RecordingStore(InMemoryUrlRepository):
+    """In-memory repository that records the keys of each bulk lookup."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: List[List[str]] = []
+        self.fail = False
+
+    async def load_long_urls(self, short_codes: Sequence[str]) -> Dict[str, str]:
+        self.batches.append(list(short_codes))
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        found = await self.find_many_by_short_codes(short_codes)
+        return {short_code: url_mapping.long_url for short_code, url_mapping in found.items()}
+
+
+def _mapping(short_code: str) -> UrlMapping:
+    return UrlMapping(
+        short_code=short_code,
+        long_url=f"https://example.com/{short_code}",
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+async def store() -> RecordingStore:
+    """Provide a store holding ten mappings."""
+    store = RecordingStore()
+    for i in range(10):
+        await store.save(_mapping(f"code{i:04d}"))
+    return store
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_query(store: RecordingStore) -> None:
+    """Loads issued within the window are fetched with one bulk query."""
+    loader = BatchLoader(store.load_long_urls, window_seconds=0.01, max_batch_size=100)
+
+    results = await asyncio.gather(
+        *(loader.load(f"code{i:04d}") for i in range(10)), loader.load("unknown1")
+    )
+
+    assert results[:10] == [f"https://example.com/code{i:04d}" for i in range(10)]
+    assert results[10] is None
+    assert len(store.batches) == 1
+    assert loader.stats()["average_batch_size"] == 11
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_fetched_immediately(store: RecordingStore) -> None:
+    """Reaching the maximum batch size dispatches without waiting for the window."""
+    loader = BatchLoader(store.load_long_urls, window_seconds=10, max_batch_size=4)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(loader.load(f"code{i:04d}") for i in range(8))), timeout=1
+    )
+
+    assert len(results) == 8
+    assert [len(batch) for batch in store.batches] == [4, 4]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_keys_are_fetched_once(store: RecordingStore) -> None:
+    """Several callers asking for the same code share one key of the batch."""
+    loader = BatchLoader(store.load_long_urls, window_seconds=0.01)
+
+    results = await asyncio.gather(*(loader.load("code0001") for _ in range(5)))
+
+    assert results == ["https://example.com/code0001"] * 5
+    assert store.batches == [["code0001"]]
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller(store: RecordingStore) -> None:
+    """A failed bulk query fails all loads of the batch."""
+    store.fail = True
+    loader = BatchLoader(store.load_long_urls, window_seconds=0.01)
+
+    results = await asyncio.gather(
+        loader.load("code0001"), loader.load("code0002"), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_repository_reads_own_writes_from_inner(store: RecordingStore) -> None:
+    """After a write, lookups bypass the loader to see uncommitted rows."""
+    loader = BatchLoader(store.load_long_urls, window_seconds=0.01)
+    inner = InMemoryUrlRepository()
+    repository = BatchedLookupUrlRepository(inner, BatchLoader(store.find_many_by_short_codes), loader)
+
+    assert await repository.find_long_url("code0003") == "https://example.com/code0003"
+
+    await repository.insert_if_absent(_mapping("mine0001"))
+    assert await repository.find_long_url("mine0001") == "https://example.com/mine0001"
+    assert len(store.batches) == 1
@@ -0,0 +1,249 @@
+"""
+Unit tests for the Bloom filter guard.
+
+Feeds the short code filter from an in-memory list of rows and uses a fake
+wall clock to control the created_at window of refreshes deterministically.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple
+
+import pytest
+
+from app.adapters.bloom_guarded_repository import (
+    BloomFilter,
+    BloomGuardedUrlRepository,
+    ShortCodeFilter,
+)
+from app.adapters.in_memory_repository import InMemoryUrlRepository
+from app.models.url_mapping import UrlMapping
+
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self) -> None:
+        self.now = START
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+class RowSource:
+    """Stored (id, short_code, created_at) rows served page by page, counting queries."""
+
+    def __init__(self, clock: FakeClock) -> None:
+        self._clock = clock
+        self.rows: List[Tuple[int, str, datetime]] = []
+        self.queries = 0
+
+    def insert(self, short_code: str, created_at: Optional[datetime] = None) -> None:
+        self.rows.append((len(self.rows) + 1, short_code, created_at or self._clock.now))
+
+    async def load_page(
+        self, after_id: int, limit: int, created_after: Optional[datetime]
+    ) -> Sequence[Tuple[int, str]]:
+        self.queries += 1
+        await asyncio.sleep(0)
+        rows = [
+            (row_id, short_code)
+            for row_id, short_code, created_at in self.rows
+            if row_id > after_id and (created_after is None or created_at > created_after)
+        ]
+        return rows[:limit]
+
+
+class CountingRepository(InMemoryUrlRepository):
+    """In-memory repository that counts long URL lookups."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+
+    async def find_long_url(self, short_code: str):
+        self.lookups += 1
+        return await super().find_long_url(short_code)
+
+
+def _mapping(short_code: str) -> UrlMapping:
+    return UrlMapping(
+        short_code=short_code,
+        long_url=f"https://example.com/{short_code}",
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Provide a fake wall clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def source(clock: FakeClock) -> RowSource:
+    """Provide an empty row source."""
+    return RowSource(clock)
+
+
+@pytest.fixture
+def short_code_filter(source: RowSource, clock: FakeClock) -> ShortCodeFilter:
+    """Provide a small filter that pages three rows at a time."""
+    return ShortCodeFilter(
+        source.load_page,
+        capacity=1_000,
+        false_positive_rate=0.01,
+        page_size=3,
+        visibility_window_seconds=30.0,
+        refresh_interval_seconds=0.01,
+        wall_clock=clock,
+    )
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    """Every added item is reported as present."""
+    bloom = BloomFilter(capacity=10_000, false_positive_rate=0.01)
+    codes = [f"code{i:05d}" for i in range(10_000)]
+    for code in codes:
+        bloom.add(code)
+
+    assert all(code in bloom for code in codes)
+
+
+def test_bloom_filter_false_positive_rate_is_near_target() -> None:
+    """At capacity, the measured and estimated false positive rates stay near the target."""
+    bloom = BloomFilter(capacity=10_000, false_positive_rate=0.01)
+    for i in range(10_000):
+        bloom.add(f"code{i:05d}")
+
+    false_positives = sum(f"miss{i:05d}" in bloom for i in range(20_000))
+
+    assert false_positives / 20_000 < 0.02
+    assert 0.005 < bloom.estimated_false_positive_rate() < 0.02
+    assert bloom.memory_bytes == (bloom.size_bits + 7) // 8
+    assert bloom.memory_bytes < 12_500
+
+
+@pytest.mark.asyncio
+async def test_filter_passes_everything_until_built(short_code_filter: ShortCodeFilter) -> None:
+    """Before the first build, no lookup is rejected."""
+    assert not short_code_filter.ready
+    assert await short_code_filter.might_contain("anything")
+    assert short_code_filter.rejected == 0
+
+
+@pytest.mark.asyncio
+async def test_rebuild_loads_all_pages(short_code_filter: ShortCodeFilter, source: RowSource) -> None:
+    """A rebuild pages through every stored short code."""
+    for i in range(7):
+        source.insert(f"code{i}")
+
+    await short_code_filter.rebuild()
+
+    assert short_code_filter.ready
+    assert source.queries == 3
+    for i in range(7):
+        assert await short_code_filter.might_contain(f"code{i}")
+    assert short_code_filter.stats()["items"] == 7
+
+
+@pytest.mark.asyncio
+async def test_miss_is_confirmed_by_a_refresh(
+    short_code_filter: ShortCodeFilter, source: RowSource, clock: FakeClock
+) -> None:
+    """A code committed elsewhere just before its lookup is found by the refresh the miss triggers."""
+    await short_code_filter.rebuild()
+    clock.now += timedelta(seconds=0.01)
+    source.insert("elsewhere")
+
+    assert await short_code_filter.might_contain("elsewhere")
+    assert not await short_code_filter.might_contain("bot00001")
+    assert short_code_filter.rejected == 1
+    assert short_code_filter.refreshes == 2
+
+
+@pytest.mark.asyncio
+async def test_late_commit_within_the_visibility_window_is_found(
+    short_code_filter: ShortCodeFilter, source: RowSource, clock: FakeClock
+) -> None:
+    """A row created before the last refresh but committed after it is still picked up."""
+    await short_code_filter.rebuild()
+    created_at = clock.now + timedelta(seconds=1)
+    clock.now += timedelta(seconds=10)
+    assert not await short_code_filter.might_contain("bot00001")
+
+    source.insert("longtxn0", created_at=created_at)
+    clock.now += timedelta(seconds=10)
+
+    assert await short_code_filter.might_contain("longtxn0")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_a_refresh(
+    short_code_filter: ShortCodeFilter, source: RowSource
+) -> None:
+    """Misses arriving together are confirmed by one refresh, not one query each."""
+    await short_code_filter.rebuild()
+    queries = source.queries
+
+    results = await asyncio.gather(*(short_code_filter.might_contain(f"bot{i:05d}") for i in range(20)))
+
+    assert not any(results)
+    assert source.queries - queries <= 2
+
+
+@pytest.mark.asyncio
+async def test_sequential_misses_share_spaced_refreshes(source: RowSource, clock: FakeClock) -> None:
+    """A scan of one miss after another costs one query per refresh interval, not one per miss."""
+    short_code_filter = ShortCodeFilter(
+        source.load_page,
+        capacity=1_000,
+        false_positive_rate=0.01,
+        refresh_interval_seconds=0.05,
+        wall_clock=clock,
+    )
+    await short_code_filter.rebuild()
+    queries = source.queries
+
+    scan = []
+    for i in range(100):
+        scan.append(asyncio.create_task(short_code_filter.might_contain(f"bot{i:05d}")))
+        await asyncio.sleep(0)
+    results = await asyncio.gather(*scan)
+
+    assert not any(results)
+    assert short_code_filter.rejected == 100
+    assert source.queries - queries == 2
+
+
+@pytest.mark.asyncio
+async def test_guarded_repository_skips_lookup_for_definite_miss(
+    short_code_filter: ShortCodeFilter,
+) -> None:
+    """Unknown codes are answered without reaching the wrapped repository."""
+    inner = CountingRepository()
+    repository = BloomGuardedUrlRepository(inner, short_code_filter)
+    await short_code_filter.rebuild()
+
+    assert await repository.find_long_url("bot00001") is None
+    assert inner.lookups == 0
+
+
+@pytest.mark.asyncio
+async def test_guarded_repository_adds_inserted_codes(
+    short_code_filter: ShortCodeFilter,
+) -> None:
+    """Mappings inserted through the decorator are resolvable right away."""
+    inner = CountingRepository()
+    repository = BloomGuardedUrlRepository(inner, short_code_filter)
+    await short_code_filter.rebuild()
+
+    await repository.insert_if_absent(_mapping("new00001"))
+    await repository.insert_many_if_absent([_mapping("new00002"), _mapping("new00003")])
+
+    assert await repository.find_long_url("new00001") == "https://example.com/new00001"
+    assert await repository.find_long_url("new00003") == "https://example.com/new00003"
+    assert inner.lookups == 2
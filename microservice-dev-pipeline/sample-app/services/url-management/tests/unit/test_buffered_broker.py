@@ -0,0 +1,152 @@
+"""
+Unit tests for BufferedBroker.
+
+Wraps the in-memory broker to verify batching, overflow policies, spill
+replay and draining on close.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Sequence, Tuple
+
+import pytest
+from pydantic import BaseModel
+
+from architecture.contracts.common import UrlAccessedEvent
+
+from app.adapters.buffered_broker import BufferedBroker
+from app.adapters.in_memory_broker import InMemoryBroker
+
+
+class RecordingBroker(InMemoryBroker):
+    """In-memory broker that records batch sizes and can be made to fail."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batch_sizes: List[int] = []
+        self.fail = False
+
+    async def publish_batch(self, events: Sequence[Tuple[BaseModel, str]]) -> None:
+        if self.fail:
+            raise RuntimeError("Message broker is not connected. Call connect() first.")
+        self.batch_sizes.append(len(events))
+        await super().publish_batch(events)
+
+
+def _event(short_code: str) -> UrlAccessedEvent:
+    return UrlAccessedEvent(
+        short_code=short_code,
+        long_url=f"https://example.com/{short_code}",
+        accessed_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+def inner() -> RecordingBroker:
+    """Provide a recording in-memory broker."""
+    return RecordingBroker()
+
+
+@pytest.mark.asyncio
+async def test_events_are_published_in_batches(inner: RecordingBroker) -> None:
+    """Events enqueued together should be published in batches of flush_size."""
+    broker = BufferedBroker(inner, max_queue_size=100, flush_size=4, flush_interval_seconds=0.01)
+    await broker.connect()
+
+    for i in range(10):
+        await broker.publish(_event(f"code{i}"), routing_key="url.accessed")
+    await broker.close()
+
+    assert [event.short_code for event, _ in inner.published_events] == [
+        f"code{i}" for i in range(10)
+    ]
+    assert inner.batch_sizes == [4, 4, 2]
+    assert broker.published == 10
+
+
+@pytest.mark.asyncio
+async def test_publish_does_not_wait_for_broker(inner: RecordingBroker) -> None:
+    """publish() returns before the event reaches the wrapped broker."""
+    broker = BufferedBroker(inner, max_queue_size=100, flush_size=10, flush_interval_seconds=0.01)
+    await broker.connect()
+
+    await broker.publish(_event("async1"), routing_key="url.accessed")
+    assert inner.published_events == []
+
+    await asyncio.sleep(0.05)
+    assert len(inner.published_events) == 1
+    await broker.close()
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_discards_overflow(inner: RecordingBroker) -> None:
+    """With the drop policy, events beyond the queue capacity are counted and discarded."""
+    broker = BufferedBroker(
+        inner, max_queue_size=2, flush_size=10, flush_interval_seconds=0.01, overflow_policy="drop"
+    )
+    broker.start()
+
+    for i in range(5):
+        await broker.publish(_event(f"drop{i}"), routing_key="url.accessed")
+    await broker.close()
+
+    assert broker.dropped == 3
+    assert len(inner.published_events) == 2
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_space(inner: RecordingBroker) -> None:
+    """With the block policy, no event is lost when the queue is full."""
+    broker = BufferedBroker(
+        inner, max_queue_size=2, flush_size=2, flush_interval_seconds=0.01, overflow_policy="block"
+    )
+    broker.start()
+
+    for i in range(6):
+        await broker.publish(_event(f"block{i}"), routing_key="url.accessed")
+    await broker.close()
+
+    assert broker.dropped == 0
+    assert len(inner.published_events) == 6
+
+
+@pytest.mark.asyncio
+async def test_spill_policy_replays_failed_batches(inner: RecordingBroker, tmp_path) -> None:
+    """Events that cannot be published are spilled to disk and replayed in order."""
+    spill_path = str(tmp_path / "events.spill")
+    broker = BufferedBroker(
+        inner,
+        max_queue_size=10,
+        flush_size=10,
+        flush_interval_seconds=0.01,
+        overflow_policy="spill",
+        spill_path=spill_path,
+    )
+    await broker.connect()
+
+    inner.fail = True
+    for i in range(3):
+        await broker.publish(_event(f"spill{i}"), routing_key="url.accessed")
+    await asyncio.sleep(0.05)
+    assert broker.spilled == 3
+
+    inner.fail = False
+    await asyncio.sleep(0.1)
+    await broker.close()
+
+    assert [event.short_code for event, _ in inner.published_events] == [
+        "spill0",
+        "spill1",
+        "spill2",
+    ]
+    assert isinstance(inner.published_events[0][0], UrlAccessedEvent)
+    assert not (tmp_path / "events.spill").exists()
+    assert not (tmp_path / "events.spill.replay").exists()
+
+
+def test_unknown_overflow_policy_is_rejected(inner: RecordingBroker) -> None:
+    """Only drop, block and spill are valid overflow policies."""
+    with pytest.raises(ValueError):
+        BufferedBroker(
+            inner, max_queue_size=1, flush_size=1, flush_interval_seconds=0.01, overflow_policy="ignore"
+        )
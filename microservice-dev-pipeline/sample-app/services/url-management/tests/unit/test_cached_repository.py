@@ -0,0 +1,136 @@
+"""
+Unit tests for the short code cache and the caching repository decorator.
+
+Uses a fake clock to control entry expiry deterministically.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.adapters.cached_repository import CachedUrlRepository, ShortCodeCache
+from app.adapters.in_memory_repository import InMemoryUrlRepository
+from app.models.url_mapping import UrlMapping
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingRepository(InMemoryUrlRepository):
+    """In-memory repository that counts long URL lookups."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+
+    async def find_long_url(self, short_code: str):
+        self.lookups += 1
+        return await super().find_long_url(short_code)
+
+
+def _mapping(short_code: str, long_url: str) -> UrlMapping:
+    return UrlMapping(
+        short_code=short_code,
+        long_url=long_url,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Provide a fake clock starting at zero."""
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock: FakeClock) -> ShortCodeCache:
+    """Provide a small cache driven by the fake clock."""
+    return ShortCodeCache(max_size=2, ttl_seconds=60, negative_ttl_seconds=5, clock=clock)
+
+
+@pytest.fixture
+def inner() -> CountingRepository:
+    """Provide a counting in-memory repository."""
+    return CountingRepository()
+
+
+@pytest.fixture
+def repository(inner: CountingRepository, cache: ShortCodeCache) -> CachedUrlRepository:
+    """Provide the caching decorator around the counting repository."""
+    return CachedUrlRepository(inner, cache)
+
+
+@pytest.mark.asyncio
+async def test_repeated_lookup_is_served_from_cache(
+    repository: CachedUrlRepository, inner: CountingRepository, cache: ShortCodeCache
+) -> None:
+    """A second lookup of the same code should not reach the wrapped repository."""
+    await inner.save(_mapping("abc12345", "https://example.com/a"))
+
+    first = await repository.find_long_url("abc12345")
+    second = await repository.find_long_url("abc12345")
+
+    assert first == second == "https://example.com/a"
+    assert inner.lookups == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_code_is_negatively_cached(
+    repository: CachedUrlRepository, inner: CountingRepository, clock: FakeClock
+) -> None:
+    """Unknown codes are cached as misses until the negative TTL expires."""
+    assert await repository.find_long_url("nonexist") is None
+    assert await repository.find_long_url("nonexist") is None
+    assert inner.lookups == 1
+
+    clock.now = 6
+    assert await repository.find_long_url("nonexist") is None
+    assert inner.lookups == 2
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl(
+    repository: CachedUrlRepository, inner: CountingRepository, clock: FakeClock
+) -> None:
+    """Positive entries are refreshed from the repository after their TTL."""
+    await inner.save(_mapping("ttl12345", "https://example.com/ttl"))
+    await repository.find_long_url("ttl12345")
+
+    clock.now = 61
+    await repository.find_long_url("ttl12345")
+
+    assert inner.lookups == 2
+
+
+@pytest.mark.asyncio
+async def test_save_invalidates_negative_entry(
+    repository: CachedUrlRepository, inner: CountingRepository
+) -> None:
+    """Saving a mapping through the decorator clears a cached miss for its code."""
+    assert await repository.find_long_url("new12345") is None
+
+    await repository.save(_mapping("new12345", "https://example.com/new"))
+    assert await repository.find_long_url("new12345") == "https://example.com/new"
+
+
+def test_least_recently_used_entry_is_evicted(cache: ShortCodeCache) -> None:
+    """When full, the cache evicts the least recently used entry."""
+    cache.put("aaa", "https://a.com")
+    cache.put("bbb", "https://b.com")
+    cache.get("aaa")
+    cache.put("ccc", "https://c.com")
+
+    assert cache.get("aaa") is not None
+    assert cache.get("ccc") is not None
+    assert cache.stats()["size"] == 2
+    assert cache.evictions == 1
+    assert "bbb" not in cache._entries
@@ -0,0 +1,224 @@
+"""
+Unit tests for ChannelPool.
+
+Fake connections hand out fake channels whose exchanges record the
+publishes they receive, can be held unconfirmed, and can be closed.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import aio_pika
+import pytest
+from aio_pika.exceptions import ChannelInvalidStateError
+
+from architecture.contracts.common import UrlAccessedEvent
+
+from app.adapters.channel_pool import ChannelPool
+from app.adapters.confirm_pipeline import ConfirmPipeline
+from app.adapters.rabbitmq_broker import RabbitMQBroker
+
+
+class FakeExchange:
+    def __init__(self, channel: "FakeChannel"):
+        self._channel = channel
+        self.published = 0
+        self.close_on_publish = False
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def publish(self, message: aio_pika.Message, routing_key: str, timeout: Optional[float] = None) -> object:
+        if self.close_on_publish:
+            self._channel.is_closed = True
+        if self._channel.is_closed:
+            raise ChannelInvalidStateError("channel closed")
+        await self.release.wait()
+        self.published += 1
+        return True
+
+
+class FakeChannel:
+    def __init__(self) -> None:
+        self.is_closed = False
+        self.exchange = FakeExchange(self)
+
+    async def declare_exchange(self, name: str, kind: aio_pika.ExchangeType, durable: bool) -> FakeExchange:
+        return self.exchange
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.channels: List[FakeChannel] = []
+        self.closed = False
+
+    async def channel(self, publisher_confirms: bool) -> FakeChannel:
+        channel = FakeChannel()
+        self.channels.append(channel)
+        return channel
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+async def _pool(connections: int = 1, channels_per_connection: int = 2, selection: str = "round_robin") -> ChannelPool:
+    async def connect(url: str) -> FakeConnection:
+        return FakeConnection()
+
+    pool = ChannelPool(
+        "amqp://unused",
+        "url_shortener",
+        connections=connections,
+        channels_per_connection=channels_per_connection,
+        selection=selection,
+        recovery_backoff_seconds=0,
+        connect=connect,  # type: ignore[arg-type]
+    )
+    await pool.connect()
+    return pool
+
+
+def _message() -> aio_pika.Message:
+    return aio_pika.Message(body=b"{}")
+
+
+def _published(pool: ChannelPool) -> List[int]:
+    return [channel["published"] for channel in pool.stats()["channels"]]
+
+
+@pytest.mark.asyncio
+async def test_round_robin_spreads_publishes_over_connections_and_channels() -> None:
+    """Every channel of every connection takes its turn."""
+    pool = await _pool(connections=2, channels_per_connection=2)
+
+    for _ in range(8):
+        await pool.publish(_message(), "url.accessed")
+
+    stats = pool.stats()
+    assert stats["connections"] == 2
+    assert [channel["connection"] for channel in stats["channels"]] == [0, 0, 1, 1]
+    assert _published(pool) == [2, 2, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_least_busy_avoids_a_slow_channel() -> None:
+    """Publishes go to channels with fewer outstanding confirms than a stalled one."""
+    pool = await _pool(channels_per_connection=3, selection="least_busy")
+    slow = pool._channels[0].exchange
+    slow.release.clear()  # type: ignore[union-attr]
+    stalled = asyncio.create_task(pool.publish(_message(), "url.accessed"))
+    await asyncio.sleep(0)
+
+    for _ in range(6):
+        await pool.publish(_message(), "url.accessed")
+
+    assert pool.stats()["channels"][0]["in_flight"] == 1
+    published = _published(pool)
+    assert published[0] == 0
+    assert sum(published) == 6
+    slow.release.set()  # type: ignore[union-attr]
+    await stalled
+
+
+@pytest.mark.asyncio
+async def test_closed_channel_is_skipped_and_recovered_in_background() -> None:
+    """Publishers move on from a closed channel while it is reopened behind them."""
+    pool = await _pool(channels_per_connection=2)
+    connection = pool._channels[0].connection
+    connection.channels[0].is_closed = True  # type: ignore[attr-defined]
+
+    for _ in range(4):
+        await pool.publish(_message(), "url.accessed")
+    assert _published(pool) == [0, 4]
+
+    await asyncio.sleep(0)
+    channel = pool.stats()["channels"][0]
+    assert (channel["open"], channel["recoveries"]) == (True, 1)
+    assert len(connection.channels) == 3  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_publish_fails_when_no_channel_is_open() -> None:
+    """An unconnected pool, or one whose channels are all closed, refuses publishes."""
+    unconnected = ChannelPool("amqp://unused", "url_shortener")
+    with pytest.raises(RuntimeError):
+        await unconnected.publish(_message(), "url.accessed")
+
+    pool = await _pool(channels_per_connection=1)
+    pool._channels[0].channel.is_closed = True  # type: ignore[union-attr]
+    pool._closing = True  # keep it closed
+    with pytest.raises(RuntimeError):
+        await pool.publish(_message(), "url.accessed")
+
+
+@pytest.mark.asyncio
+async def test_broker_retries_on_another_channel_when_one_closes() -> None:
+    """A publish whose channel closed under it is retried by the confirm pipeline on a sibling."""
+    pool = await _pool(channels_per_connection=2)
+    broker = RabbitMQBroker(
+        "amqp://unused",
+        "url_shortener",
+        confirm_pipeline=ConfirmPipeline(retry_backoff_seconds=0),
+        channel_pool=pool,
+    )
+    pool._channels[0].exchange.close_on_publish = True  # type: ignore[union-attr]
+    event = UrlAccessedEvent(
+        short_code="abc12345", long_url="https://example.com", accessed_at=datetime.now(timezone.utc)
+    )
+
+    await broker.publish(event, "url.accessed")
+
+    assert _published(pool) == [0, 1]
+    assert broker.confirms.stats()["retried"] == 1
+    connections = list(pool._connections)
+    await broker.close()
+    assert all(connection.closed for connection in connections)  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_failed_connect_closes_what_it_opened_and_can_be_retried() -> None:
+    """A connect that fails part way closes its connections; a later connect starts afresh."""
+    opened: List[FakeConnection] = []
+    refuse_second = True
+
+    async def connect(url: str) -> FakeConnection:
+        if refuse_second and len(opened) == 1:
+            raise ConnectionError("Connection refused")
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    pool = ChannelPool(
+        "amqp://unused",
+        "url_shortener",
+        connections=2,
+        channels_per_connection=2,
+        connect=connect,  # type: ignore[arg-type]
+    )
+    with pytest.raises(ConnectionError):
+        await pool.connect()
+    assert not pool.connected
+    assert opened[0].closed
+
+    refuse_second = False
+    await pool.connect()
+    await pool.connect()
+    stats = pool.stats()
+    assert stats["connections"] == 2
+    assert len(stats["channels"]) == 4
+    assert len(opened) == 3
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_cancelled_recoveries() -> None:
+    """Recovery tasks have finished by the time the connections are closed."""
+    pool = await _pool(channels_per_connection=2)
+    pooled = pool._channels[0]
+    pooled.channel.is_closed = True  # type: ignore[union-attr]
+    await pool.publish(_message(), "url.accessed")
+    recovery = pooled.recovery
+    assert recovery is not None
+
+    await pool.close()
+
+    assert recovery.done()
+    assert not pool.connected
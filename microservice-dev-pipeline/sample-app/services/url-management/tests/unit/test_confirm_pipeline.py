@@ -0,0 +1,188 @@
+"""
+Unit tests for ConfirmPipeline and confirm-mode publishing in RabbitMQBroker.
+
+A fake exchange stands in for RabbitMQ, confirming or nacking each publish
+when the test says so.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import aio_pika
+import pytest
+from aio_pika.exceptions import DeliveryError
+from pamqp.commands import Basic
+
+from architecture.contracts.common import UrlAccessedEvent
+
+from app.adapters.confirm_pipeline import ConfirmPipeline
+from app.adapters.rabbitmq_broker import RabbitMQBroker
+from app.metrics import broker_publish_errors, broker_publish_nacks
+
+
+class FakeExchange:
+    """Exchange whose publishes stay unconfirmed until released, and can be nacked."""
+
+    def __init__(self, nacks: Optional[Dict[str, int]] = None):
+        self.nacks = nacks or {}
+        self.outstanding = 0
+        self.max_outstanding = 0
+        self.confirmed: List[str] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def publish(self, message: aio_pika.Message, routing_key: str, timeout: Optional[float] = None) -> object:
+        short_code = UrlAccessedEvent.model_validate_json(message.body).short_code
+        self.outstanding += 1
+        self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        try:
+            await self.release.wait()
+        finally:
+            self.outstanding -= 1
+        if self.nacks.get(short_code, 0) > 0:
+            self.nacks[short_code] -= 1
+            raise DeliveryError(None, Basic.Nack(delivery_tag=1))
+        self.confirmed.append(short_code)
+        return Basic.Ack(delivery_tag=1)
+
+
+class FakeChannelPool:
+    """Connected channel pool that publishes everything on the fake exchange."""
+
+    connected = True
+
+    def __init__(self, exchange: FakeExchange):
+        self._exchange = exchange
+
+    async def publish(self, message: aio_pika.Message, routing_key: str, timeout: Optional[float] = None) -> object:
+        return await self._exchange.publish(message, routing_key, timeout)
+
+    async def close(self) -> None:
+        pass
+
+
+def _event(short_code: str) -> UrlAccessedEvent:
+    return UrlAccessedEvent(
+        short_code=short_code,
+        long_url=f"https://example.com/{short_code}",
+        accessed_at=datetime.now(timezone.utc),
+    )
+
+
+def _broker(exchange: FakeExchange, confirm_mode: str = "wait", **pipeline: float) -> RabbitMQBroker:
+    return RabbitMQBroker(
+        "amqp://unused",
+        "url_shortener",
+        confirm_mode=confirm_mode,
+        confirm_pipeline=ConfirmPipeline(retry_backoff_seconds=0, **pipeline),
+        channel_pool=FakeChannelPool(exchange),  # type: ignore[arg-type]
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_publishes_are_pipelined_up_to_the_limit() -> None:
+    """A batch keeps up to max_in_flight publishes outstanding instead of one at a time."""
+    exchange = FakeExchange()
+    exchange.release.clear()
+    broker = _broker(exchange, max_in_flight=4)
+
+    batch = asyncio.create_task(
+        broker.publish_batch([(_event(f"code{i:04d}"), "url.accessed") for i in range(10)])
+    )
+    await asyncio.sleep(0.01)
+    assert exchange.outstanding == 4
+    assert broker.confirms.stats()["in_flight"] == 4
+
+    exchange.release.set()
+    await batch
+
+    assert exchange.max_outstanding == 4
+    assert len(exchange.confirmed) == 10
+    assert broker.confirms.stats()["confirmed"] == 10
+
+
+@pytest.mark.asyncio
+async def test_nacked_publish_is_retried() -> None:
+    """A nacked message is sent again and counts as nacked, retried and then confirmed."""
+    nacks = broker_publish_nacks.labels("url.accessed")
+    nacks_before = nacks.value
+    exchange = FakeExchange(nacks={"abc12345": 2})
+    broker = _broker(exchange)
+
+    await broker.publish(_event("abc12345"), "url.accessed")
+
+    assert exchange.confirmed == ["abc12345"]
+    assert nacks.value == nacks_before + 2
+    stats = broker.confirms.stats()
+    assert (stats["nacked"], stats["retried"], stats["confirmed"], stats["failed"]) == (2, 2, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_batch_raises_after_retries_are_exhausted() -> None:
+    """A message nacked beyond the retry limit fails the batch once the others are confirmed."""
+    exchange = FakeExchange(nacks={"bad00000": 10})
+    broker = _broker(exchange, max_retries=1)
+
+    with pytest.raises(DeliveryError):
+        await broker.publish_batch(
+            [(_event("good0000"), "url.accessed"), (_event("bad00000"), "url.accessed")]
+        )
+
+    assert exchange.confirmed == ["good0000"]
+    assert broker.confirms.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_mode_returns_before_the_confirm() -> None:
+    """In async mode publish() returns at once, close() waits for the confirms and failures are handed back."""
+    errors = broker_publish_errors.labels("url.accessed")
+    errors_before = errors.value
+    exchange = FakeExchange(nacks={"bad00000": 10})
+    exchange.release.clear()
+    broker = _broker(exchange, confirm_mode="async", max_retries=0)
+    undelivered: List[str] = []
+    broker.on_undelivered(lambda event, routing_key, error: undelivered.append(event.short_code))
+
+    await broker.publish(_event("good0000"), "url.accessed")
+    await broker.publish(_event("bad00000"), "url.accessed")
+    await asyncio.sleep(0)
+    assert exchange.confirmed == []
+    assert broker.confirms.stats()["background"] == 2
+
+    exchange.release.set()
+    await broker.close()
+
+    assert exchange.confirmed == ["good0000"]
+    assert undelivered == ["bad00000"]
+    assert errors.value == errors_before + 1
+    assert broker.confirms.stats()["background"] == 0
+
+
+@pytest.mark.asyncio
+async def test_async_mode_waits_without_an_undelivered_handler() -> None:
+    """Without a handler to take back failed events, async mode waits for the confirm."""
+    exchange = FakeExchange()
+    broker = _broker(exchange, confirm_mode="async")
+
+    await broker.publish(_event("good0000"), "url.accessed")
+
+    assert exchange.confirmed == ["good0000"]
+    assert broker.confirms.stats()["background"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unconfirmed_publish_times_out_and_is_retried() -> None:
+    """A publish not confirmed in time is treated like a nack."""
+    attempts: List[int] = []
+
+    async def send() -> None:
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            raise asyncio.TimeoutError()
+
+    pipeline = ConfirmPipeline(retry_backoff_seconds=0)
+    await pipeline.publish(send, "url.accessed")
+
+    assert len(attempts) == 2
+    assert pipeline.stats()["confirmed"] == 1
@@ -0,0 +1,61 @@
+"""
+Unit tests for the delegating base class of the repository decorators.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.adapters.delegating_repository import DelegatingUrlRepository
+from app.adapters.in_memory_repository import InMemoryUrlRepository
+from app.models.url_mapping import UrlMapping
+
+
+class CountingRepository(InMemoryUrlRepository):
+    """In-memory repository that counts long URL lookups."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+
+    async def find_long_url(self, short_code: str):
+        self.lookups += 1
+        return await super().find_long_url(short_code)
+
+
+def _mapping(short_code: str, long_url: str) -> UrlMapping:
+    return UrlMapping(
+        short_code=short_code,
+        long_url=long_url,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.mark.asyncio
+async def test_writes_and_lookups_reach_the_wrapped_repository():
+    """Every operation is passed through to the wrapped repository."""
+    inner = CountingRepository()
+    repository = DelegatingUrlRepository(inner)
+
+    await repository.save(_mapping("abc123", "https://example.com/a"))
+    _, inserted = await repository.insert_if_absent(_mapping("def456", "https://example.com/b"))
+    await repository.commit()
+
+    assert inserted is True
+    assert (await repository.find_by_short_code("abc123")).long_url == "https://example.com/a"
+    assert (await repository.find_by_long_url("https://example.com/b")).short_code == "def456"
+    assert set(await repository.find_many_by_short_codes(["abc123", "def456", "nope"])) == {
+        "abc123",
+        "def456",
+    }
+
+
+@pytest.mark.asyncio
+async def test_find_long_url_uses_the_wrapped_override():
+    """find_long_url is delegated rather than falling back to the port default."""
+    inner = CountingRepository()
+    repository = DelegatingUrlRepository(inner)
+    await repository.save(_mapping("abc123", "https://example.com/a"))
+
+    assert await repository.find_long_url("abc123") == "https://example.com/a"
+    assert inner.lookups == 1
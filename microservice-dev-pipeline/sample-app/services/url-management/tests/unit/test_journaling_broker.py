@@ -0,0 +1,191 @@
+"""
+Unit tests for JournalingBroker and SpillJournal.
+
+Wraps an in-memory broker that can be taken down to verify that events
+are journaled during outages and replayed in order once it recovers.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import pytest
+from pydantic import BaseModel
+
+from architecture.contracts.common import UrlAccessedEvent
+
+from app.adapters.in_memory_broker import InMemoryBroker
+from app.adapters.journaling_broker import JournalingBroker
+from app.adapters.spill_journal import SpillJournal
+
+
+class FlakyBroker(InMemoryBroker):
+    """In-memory broker that refuses connections and publishes while down."""
+
+    def __init__(self, down: bool = False) -> None:
+        super().__init__()
+        self.down = down
+        self.connects = 0
+
+    async def connect(self) -> None:
+        if self.down:
+            raise ConnectionError("Connection refused")
+        self.connects += 1
+
+    async def publish(self, event: BaseModel, routing_key: str) -> None:
+        if self.down:
+            raise RuntimeError("No open RabbitMQ channel is available")
+        await super().publish(event, routing_key)
+
+    async def publish_batch(self, events: Sequence[Tuple[BaseModel, str]]) -> None:
+        if self.down:
+            raise RuntimeError("No open RabbitMQ channel is available")
+        for event, routing_key in events:
+            await super().publish(event, routing_key)
+
+
+def _event(short_code: str) -> UrlAccessedEvent:
+    return UrlAccessedEvent(
+        short_code=short_code,
+        long_url=f"https://example.com/{short_code}",
+        accessed_at=datetime.now(timezone.utc),
+    )
+
+
+def _published(inner: InMemoryBroker) -> List[str]:
+    return [event.short_code for event, _ in inner.published_events]
+
+
+def _journaling(inner: FlakyBroker, path: Path) -> JournalingBroker:
+    return JournalingBroker(
+        inner,
+        SpillJournal(str(path), sync_interval_seconds=0.01),
+        replay_batch_size=2,
+        retry_interval_seconds=0.01,
+    )
+
+
+@pytest.mark.asyncio
+async def test_broker_down_at_startup_journals_then_replays(tmp_path: Path) -> None:
+    """Startup survives an unreachable broker, and accesses are replayed in order once it is up."""
+    inner = FlakyBroker(down=True)
+    broker = _journaling(inner, tmp_path / "events.journal")
+
+    await broker.connect()
+    for i in range(5):
+        await broker.publish(_event(f"down{i:04d}"), "url.accessed")
+    assert not broker.available
+    assert inner.published_events == []
+
+    inner.down = False
+    await asyncio.sleep(0.05)
+    await broker.publish(_event("upagain0"), "url.accessed")
+
+    assert broker.available
+    assert _published(inner) == [f"down{i:04d}" for i in range(5)] + ["upagain0"]
+    assert broker.stats()["replayed"] == 5
+    await broker.close()
+    assert not (tmp_path / "events.journal").exists()
+    assert not (tmp_path / "events.journal.replay").exists()
+
+
+@pytest.mark.asyncio
+async def test_failed_publish_switches_to_journal_until_recovered(tmp_path: Path) -> None:
+    """Events published after an outage begins are not sent directly until the journal has been replayed."""
+    inner = FlakyBroker()
+    broker = _journaling(inner, tmp_path / "events.journal")
+    await broker.connect()
+    await broker.publish(_event("before00"), "url.accessed")
+
+    inner.down = True
+    await broker.publish(_event("during00"), "url.accessed")
+    await broker.publish_batch([(_event("during01"), "url.accessed"), (_event("during02"), "url.accessed")])
+    assert broker.stats()["outages"] == 1
+
+    inner.down = False
+    await asyncio.sleep(0.05)
+    await broker.publish(_event("after000"), "url.accessed")
+    await broker.close()
+
+    assert _published(inner) == ["before00", "during00", "during01", "during02", "after000"]
+
+
+@pytest.mark.asyncio
+async def test_journal_survives_restart(tmp_path: Path) -> None:
+    """Events journaled before shutdown are replayed by the next process before anything else."""
+    path = tmp_path / "events.journal"
+    first = _journaling(FlakyBroker(down=True), path)
+    await first.connect()
+    await first.publish(_event("stored00"), "url.accessed")
+    await first.close()
+    assert path.exists()
+
+    inner = FlakyBroker()
+    second = _journaling(inner, path)
+    await second.connect()
+    assert not second.available
+    await second.publish(_event("fresh000"), "url.accessed")
+    await asyncio.sleep(0.05)
+    await second.close()
+
+    assert _published(inner) == ["stored00", "fresh000"]
+
+
+@pytest.mark.asyncio
+async def test_undelivered_events_are_journaled_and_replayed(tmp_path: Path) -> None:
+    """An event handed back after its publish returned is journaled, and replayed before later events."""
+    inner = FlakyBroker()
+    broker = _journaling(inner, tmp_path / "events.journal")
+    await broker.connect()
+
+    broker.journal_undelivered(_event("nacked00"), "url.accessed", RuntimeError("Nacked"))
+    assert not broker.available
+    await broker.publish(_event("later000"), "url.accessed")
+    await asyncio.sleep(0.05)
+    await broker.close()
+
+    assert _published(inner) == ["nacked00", "later000"]
+    assert broker.stats()["journaled"] == 2
+
+
+@pytest.mark.asyncio
+async def test_torn_journal_line_is_skipped(tmp_path: Path) -> None:
+    """A line torn by a crash is skipped, and the events around it are still replayed."""
+    path = tmp_path / "events.journal"
+    first = SpillJournal(str(path))
+    first.append([(_event("before00"), "url.accessed")])
+    await first.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"event_type": "UrlAccessedEvent", "routing_key": "url.acc')
+
+    inner = FlakyBroker(down=True)
+    broker = _journaling(inner, path)
+    await broker.connect()
+    await broker.publish(_event("after000"), "url.accessed")
+    inner.down = False
+    await asyncio.sleep(0.05)
+    await broker.close()
+
+    assert broker.available
+    assert _published(inner) == ["before00", "after000"]
+    assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_journal_batches_fsyncs(tmp_path: Path) -> None:
+    """Appends within one sync interval share an fsync; a full batch is synced at once."""
+    journal = SpillJournal(str(tmp_path / "events.journal"), sync_interval_seconds=10, sync_batch_size=3)
+
+    journal.append([(_event("sync0000"), "url.accessed"), (_event("sync0001"), "url.accessed")])
+    await asyncio.sleep(0.01)
+    assert journal.stats()["syncs"] == 0
+    assert journal.stats()["unsynced"] == 2
+
+    journal.append([(_event("sync0002"), "url.accessed")])
+    await asyncio.sleep(0.01)
+    assert journal.stats()["syncs"] == 1
+    assert journal.stats()["unsynced"] == 0
+
+    await journal.close()
+    assert len((tmp_path / "events.journal").read_text().splitlines()) == 3
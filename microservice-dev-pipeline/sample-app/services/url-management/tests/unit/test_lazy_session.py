@@ -0,0 +1,137 @@
+"""
+Unit tests for lazy session acquisition.
+
+Uses a fake session factory that records opens, commits and closes, and an
+in-memory repository standing in for the session-bound Postgres repository.
+"""
+
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+
+from architecture.contracts.url_management_service import ShortenUrlRequest
+
+from app.adapters.in_memory_broker import InMemoryBroker
+from app.adapters.in_memory_repository import InMemoryUrlRepository
+from app.adapters.lazy_session import LazySession, LazySessionUrlRepository
+from app.exceptions.url_exceptions import InvalidUrlError, UrlNotFoundError
+from app.models.url_mapping import UrlMapping
+from app.services.url_service import UrlManagementService
+
+
+class FakeSession:
+    """Stand-in for AsyncSession that records its lifecycle."""
+
+    def __init__(self, events: List[str]) -> None:
+        self._events = events
+        self._events.append("open")
+
+    async def commit(self) -> None:
+        self._events.append("commit")
+
+    async def close(self) -> None:
+        self._events.append("close")
+
+
+@pytest.fixture
+def events() -> List[str]:
+    """Provide the list of recorded session events."""
+    return []
+
+
+@pytest.fixture
+def store() -> InMemoryUrlRepository:
+    """Provide the in-memory store shared by all sessions."""
+    return InMemoryUrlRepository()
+
+
+@pytest.fixture
+def lazy_session(events: List[str]) -> LazySession:
+    """Provide a lazy session over the fake session factory."""
+    return LazySession(lambda: FakeSession(events))  # type: ignore[arg-type, return-value]
+
+
+@pytest.fixture
+def repository(lazy_session: LazySession, store: InMemoryUrlRepository) -> LazySessionUrlRepository:
+    """Provide a lazy repository whose sessions all see the same store."""
+    return LazySessionUrlRepository(lazy_session, lambda session: store)
+
+
+@pytest.fixture
+def service(repository: LazySessionUrlRepository) -> UrlManagementService:
+    """Provide the service wired to the lazy repository."""
+    return UrlManagementService(
+        repository=repository,
+        message_broker=InMemoryBroker(),
+        base_url="http://short.url",
+    )
+
+
+@pytest.mark.asyncio
+async def test_invalid_url_never_opens_a_session(
+    service: UrlManagementService, events: List[str]
+) -> None:
+    """Requests rejected before reaching the repository cost no session."""
+    with pytest.raises(InvalidUrlError):
+        await service.shorten_url(ShortenUrlRequest(long_url="not-a-url"))
+
+    assert events == []
+
+
+@pytest.mark.asyncio
+async def test_read_releases_session_immediately(
+    service: UrlManagementService, lazy_session: LazySession, events: List[str]
+) -> None:
+    """A lookup closes its session as soon as it returns."""
+    with pytest.raises(UrlNotFoundError):
+        await service.resolve_url("nonexist")
+
+    assert events == ["open", "close"]
+    assert not lazy_session.active
+
+
+@pytest.mark.asyncio
+async def test_write_keeps_session_until_commit(
+    service: UrlManagementService, lazy_session: LazySession, events: List[str]
+) -> None:
+    """A created mapping holds the session until the commit, then releases it."""
+    _, created = await service.shorten_url_with_status(
+        ShortenUrlRequest(long_url="https://example.com/lazy")
+    )
+
+    assert created
+    assert events == ["open", "commit", "close"]
+    assert not lazy_session.active
+
+
+@pytest.mark.asyncio
+async def test_existing_mapping_releases_without_commit(
+    service: UrlManagementService,
+    store: InMemoryUrlRepository,
+    events: List[str],
+) -> None:
+    """When the insert finds the mapping already stored, nothing is left to commit."""
+    request = ShortenUrlRequest(long_url="https://example.com/existing")
+    await service.shorten_url(request)
+    events.clear()
+
+    _, created = await service.shorten_url_with_status(request)
+
+    assert not created
+    assert events == ["open", "close"]
+
+
+@pytest.mark.asyncio
+async def test_batch_commits_once(
+    repository: LazySessionUrlRepository, events: List[str]
+) -> None:
+    """Writes and reads of one unit of work share a single session."""
+    now = datetime.now(timezone.utc)
+    await repository.insert_many_if_absent(
+        [UrlMapping(short_code="lazy0001", long_url="https://example.com/1", created_at=now)]
+    )
+    await repository.find_many_by_short_codes(["lazy0001"])
+    await repository.commit()
+
+    assert events == ["open", "commit", "close"]
@@ -0,0 +1,154 @@
+"""
+Unit tests for the metrics primitives, the request metrics middleware and
+the instrumented repository and broker decorators.
+"""
+
+from datetime import datetime, timezone
+from typing import AsyncGenerator
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response
+
+from app.adapters.in_memory_broker import InMemoryBroker
+from app.adapters.in_memory_repository import InMemoryUrlRepository
+from app.adapters.instrumented_broker import InstrumentedBroker
+from app.adapters.instrumented_repository import InstrumentedUrlRepository
+from app.api.metrics_middleware import MetricsMiddleware
+from app.api.redirect_fast_path import RedirectFastPathMiddleware
+from app.api.urls import router
+from app.metrics import (
+    CONTENT_TYPE,
+    MetricsRegistry,
+    broker_publish_duration,
+    events_published,
+    http_request_duration,
+    registry,
+    repository_call_duration,
+)
+from app.models.url_mapping import UrlMapping
+from app.services.url_service import UrlManagementService
+from architecture.contracts.common import UrlAccessedEvent
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    """Observations land in the first bucket whose bound is not below them."""
+    metrics = MetricsRegistry()
+    histogram = metrics.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    child = histogram.labels("/a")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        child.observe(value)
+
+    lines = metrics.render().splitlines()
+
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.65' in lines
+
+
+def test_counter_renders_total_and_escapes_labels() -> None:
+    """Counters get the _total suffix and label values are escaped."""
+    metrics = MetricsRegistry()
+    counter = metrics.counter("errors", "Errors.", ("detail",))
+    counter.labels('say "hi"\n').inc(2)
+
+    assert 'errors_total{detail="say \\"hi\\"\\n"} 2' in metrics.render().splitlines()
+
+
+def test_gauge_goes_up_and_down() -> None:
+    """Gauges render their current value without a suffix."""
+    metrics = MetricsRegistry()
+    gauge = metrics.gauge("in_flight", "In flight.").labels()
+    gauge.inc(3)
+    gauge.dec()
+
+    assert "# TYPE in_flight gauge" in metrics.render().splitlines()
+    assert "in_flight 2" in metrics.render().splitlines()
+
+
+def test_labels_are_cached_and_checked() -> None:
+    """The same label values return the same child; a wrong arity is rejected."""
+    metrics = MetricsRegistry()
+    counter = metrics.counter("calls", "Calls.", ("operation",))
+
+    assert counter.labels("save") is counter.labels("save")
+    with pytest.raises(ValueError):
+        counter.labels("save", "extra")
+
+
+def _count(route: str, status: str) -> int:
+    return http_request_duration.labels("GET", route, status).count
+
+
+@pytest.mark.asyncio
+async def test_middleware_labels_requests_by_route_template() -> None:
+    """Routed, fast-path and unmatched requests are recorded under their route template."""
+    repository = InMemoryUrlRepository()
+    await repository.save(
+        UrlMapping(
+            short_code="abc12345", long_url="https://example.com", created_at=datetime.now(timezone.utc)
+        )
+    )
+
+    async def provide_service() -> AsyncGenerator[UrlManagementService, None]:
+        yield UrlManagementService(
+            repository=repository, message_broker=InMemoryBroker(), base_url="http://short.url"
+        )
+
+    app = FastAPI()
+
+    @app.get("/metrics")
+    async def metrics() -> Response:
+        return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+    app.include_router(router)
+    app.add_middleware(RedirectFastPathMiddleware, service_provider=provide_service)
+    app.add_middleware(MetricsMiddleware)
+
+    before = (_count("/{short_code}", "301"), _count("/metrics", "200"), _count("unmatched", "404"))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/abc12345")
+        await client.get("/no/such/route")
+        response = await client.get("/metrics")
+
+    after = (_count("/{short_code}", "301"), _count("/metrics", "200"), _count("unmatched", "404"))
+    assert [a - b for a, b in zip(after, before)] == [1, 1, 1]
+    assert response.headers["content-type"] == CONTENT_TYPE
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/{short_code}",status="301"}'
+        in response.text
+    )
+
+
+@pytest.mark.asyncio
+async def test_instrumented_repository_times_calls() -> None:
+    """Every repository call is observed under its operation."""
+    repository = InstrumentedUrlRepository(InMemoryUrlRepository())
+    before = repository_call_duration.labels("find_long_url").count
+
+    assert await repository.find_long_url("missing1") is None
+
+    assert repository_call_duration.labels("find_long_url").count == before + 1
+
+
+@pytest.mark.asyncio
+async def test_instrumented_broker_counts_published_events() -> None:
+    """Single and batched publishes are timed and counted per routing key."""
+    inner = InMemoryBroker()
+    broker = InstrumentedBroker(inner)
+    event = UrlAccessedEvent(
+        short_code="abc12345", long_url="https://example.com", accessed_at=datetime.now(timezone.utc)
+    )
+    before = (events_published.labels("url.accessed").value, broker_publish_duration.labels("url.accessed").count)
+
+    await broker.publish(event, "url.accessed")
+    await broker.publish_batch([(event, "url.accessed"), (event, "url.accessed")])
+
+    assert events_published.labels("url.accessed").value == before[0] + 3
+    assert broker_publish_duration.labels("url.accessed").count == before[1] + 2
+    assert len(inner.published_events) == 3
@@ -0,0 +1,132 @@
+"""
+Unit tests for the pure-ASGI redirect fast path.
+
+Each test app mounts the real router; the fast path and the redirect route
+are wired to the same in-memory service, so their responses can be compared.
+"""
+
+from datetime import datetime, timezone
+from typing import AsyncGenerator
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.adapters.in_memory_broker import InMemoryBroker
+from app.adapters.in_memory_repository import InMemoryUrlRepository
+from app.api.redirect_fast_path import RedirectFastPathMiddleware
+from app.api.urls import router
+from app.dependencies import get_url_service
+from app.exceptions.url_exceptions import UrlNotFoundError
+from app.models.url_mapping import UrlMapping
+from app.services.url_service import UrlManagementService
+
+
+@pytest.fixture
+async def repository() -> InMemoryUrlRepository:
+    """Provide a repository holding one mapping with characters that need quoting."""
+    repository = InMemoryUrlRepository()
+    await repository.save(
+        UrlMapping(
+            short_code="abc12345",
+            long_url="https://example.com/a path?q=é",
+            created_at=datetime.now(timezone.utc),
+        )
+    )
+    return repository
+
+
+@pytest.fixture
+def broker() -> InMemoryBroker:
+    """Provide a fresh in-memory broker for each test."""
+    return InMemoryBroker()
+
+
+def _build_app(repository: InMemoryUrlRepository, broker: InMemoryBroker, fast_path: bool) -> FastAPI:
+    async def provide_service() -> AsyncGenerator[UrlManagementService, None]:
+        yield UrlManagementService(repository=repository, message_broker=broker, base_url="http://short.url")
+
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health_check() -> dict:
+        return {"status": "healthy"}
+
+    app.include_router(router)
+
+    @app.exception_handler(UrlNotFoundError)
+    async def url_not_found_handler(request: Request, exc: UrlNotFoundError) -> JSONResponse:
+        return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+    if fast_path:
+        # The route keeps the real database-backed provider, so a redirect
+        # that reached it instead of the fast path would fail
+        app.add_middleware(RedirectFastPathMiddleware, service_provider=provide_service)
+    else:
+        app.dependency_overrides[get_url_service] = provide_service
+    return app
+
+
+async def _get(app: FastAPI, path: str) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path, follow_redirects=False)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/abc12345", "/unknown1"])
+async def test_fast_path_matches_route(
+    repository: InMemoryUrlRepository, broker: InMemoryBroker, path: str
+) -> None:
+    """Status, headers and body are identical to those of the redirect route."""
+    routed = await _get(_build_app(repository, broker, fast_path=False), path)
+    fast = await _get(_build_app(repository, broker, fast_path=True), path)
+
+    assert fast.status_code == routed.status_code
+    assert fast.headers.raw == routed.headers.raw
+    assert fast.content == routed.content
+
+
+@pytest.mark.asyncio
+async def test_fast_path_redirects_and_publishes_event(
+    repository: InMemoryUrlRepository, broker: InMemoryBroker
+) -> None:
+    """A known short code is redirected with 301 and emits a UrlAccessedEvent."""
+    response = await _get(_build_app(repository, broker, fast_path=True), "/abc12345")
+
+    assert response.status_code == 301
+    assert response.headers["location"] == "https://example.com/a%20path?q=%C3%A9"
+    assert [routing_key for _, routing_key in broker.published_events] == ["url.accessed"]
+    assert broker.published_events[0][0].short_code == "abc12345"
+
+
+@pytest.mark.asyncio
+async def test_fast_path_leaves_other_routes_alone(
+    repository: InMemoryUrlRepository, broker: InMemoryBroker
+) -> None:
+    """Static routes and multi-segment paths are served by the router."""
+    app = _build_app(repository, broker, fast_path=True)
+
+    assert (await _get(app, "/health")).json() == {"status": "healthy"}
+    assert (await _get(app, "/api/v1/urls")).status_code == 405
+    assert broker.published_events == []
+
+
+@pytest.mark.asyncio
+async def test_fast_path_honours_dependency_overrides(
+    repository: InMemoryUrlRepository, broker: InMemoryBroker
+) -> None:
+    """An override of the service provider applies to the fast path as it does to the route."""
+    async def provide_service() -> AsyncGenerator[UrlManagementService, None]:
+        yield UrlManagementService(repository=repository, message_broker=broker, base_url="http://short.url")
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(RedirectFastPathMiddleware, service_provider=get_url_service)
+    app.dependency_overrides[get_url_service] = provide_service
+
+    response = await _get(app, "/abc12345")
+
+    assert response.status_code == 301
+    assert len(broker.published_events) == 1
@@ -0,0 +1,235 @@
+"""
+Unit tests for read-replica routing.
+
+Replicas are simulated with in-memory repositories and a settable lag, so
+routing, fallback and health checks can be verified without databases.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+import pytest
+
+from app.adapters.in_memory_repository import InMemoryUrlRepository
+from app.adapters.replica_routing import ReadReplica, ReplicaPool, ReplicaRoutingUrlRepository
+from app.models.url_mapping import UrlMapping
+from app.ports.repository import IUrlRepository
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeReplica(ReadReplica):
+    """Replica backed by an in-memory repository with a settable lag."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name, session_maker=None)  # type: ignore[arg-type]
+        self.store = InMemoryUrlRepository()
+        self.lag: float = 0.0
+        self.error: Optional[Exception] = None
+
+    @asynccontextmanager
+    async def repository(self) -> AsyncIterator[IUrlRepository]:
+        if self.error is not None:
+            raise self.error
+        yield self.store
+
+    async def measure_lag(self) -> float:
+        if self.error is not None:
+            raise self.error
+        return self.lag
+
+
+class FailingRepository(InMemoryUrlRepository):
+    """Primary whose long URL lookups fail, counting attempts."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+
+    async def find_long_url(self, short_code: str) -> Optional[str]:
+        self.lookups += 1
+        raise ConnectionError("primary unavailable")
+
+
+def _mapping(short_code: str) -> UrlMapping:
+    return UrlMapping(
+        short_code=short_code,
+        long_url=f"https://example.com/{short_code}",
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+async def _replicated(*short_codes: str) -> FakeReplica:
+    replica = FakeReplica("replica")
+    for short_code in short_codes:
+        await replica.store.save(_mapping(short_code))
+    return replica
+
+
+@pytest.mark.asyncio
+async def test_reads_are_balanced_across_healthy_replicas() -> None:
+    """Lookups rotate over the replicas and never reach the primary when they hit."""
+    replicas = [await _replicated("code0001"), await _replicated("code0001")]
+    pool = ReplicaPool(replicas, max_lag_seconds=5)
+    await pool.check_all()
+    primary = InMemoryUrlRepository()
+
+    for _ in range(4):
+        repository = ReplicaRoutingUrlRepository(primary, pool)
+        assert await repository.find_long_url("code0001") == "https://example.com/code0001"
+
+    assert [replica.reads for replica in replicas] == [2, 2]
+    assert pool.primary_reads == 0
+
+
+@pytest.mark.asyncio
+async def test_replica_miss_is_confirmed_on_primary_while_lagging() -> None:
+    """A mapping that has not replicated yet is still found on the primary."""
+    replica = await _replicated()
+    replica.lag = 1
+    pool = ReplicaPool([replica], max_lag_seconds=5)
+    await pool.check_all()
+    primary = InMemoryUrlRepository()
+    await primary.save(_mapping("fresh001"))
+
+    repository = ReplicaRoutingUrlRepository(primary, pool)
+
+    found = await repository.find_by_short_code("fresh001")
+    assert found is not None
+    assert pool.miss_confirmations == 1
+    assert pool.primary_reads == 0
+
+
+@pytest.mark.asyncio
+async def test_replica_miss_is_confirmed_after_a_recent_write() -> None:
+    """A trusted caught-up replica's miss is confirmed while a write of this process may still be replicating."""
+    clock = FakeClock()
+    pool = ReplicaPool([await _replicated()], max_lag_seconds=5, trust_caught_up_misses=True, clock=clock)
+    await pool.check_all()
+    primary = InMemoryUrlRepository()
+
+    await ReplicaRoutingUrlRepository(primary, pool).insert_if_absent(_mapping("fresh001"))
+    clock.now = 1.0
+    assert await ReplicaRoutingUrlRepository(primary, pool).find_long_url("fresh001") is not None
+
+    clock.now = 10.0
+    assert await ReplicaRoutingUrlRepository(primary, pool).find_long_url("unknown1") is None
+    assert pool.miss_confirmations == 1
+
+
+@pytest.mark.asyncio
+async def test_miss_on_caught_up_replica_is_confirmed_unless_trusted() -> None:
+    """Misses are confirmed on the primary by default; trusted, a replica with no lag answers them alone."""
+    replica = await _replicated("code0001")
+    pool = ReplicaPool([replica])
+    await pool.check_all()
+    elsewhere = InMemoryUrlRepository()
+    await elsewhere.save(_mapping("other001"))
+
+    assert await ReplicaRoutingUrlRepository(elsewhere, pool).find_long_url("other001") is not None
+    assert pool.miss_confirmations == 1
+
+    pool = ReplicaPool([replica], trust_caught_up_misses=True)
+    await pool.check_all()
+    primary = InMemoryUrlRepository()
+
+    repository = ReplicaRoutingUrlRepository(primary, pool)
+
+    assert await repository.find_long_url("unknown1") is None
+    assert set(await repository.find_many_by_short_codes(["code0001", "unknown2"])) == {"code0001"}
+    assert pool.miss_confirmations == 0
+    assert pool.primary_reads == 0
+
+
+@pytest.mark.asyncio
+async def test_reads_after_write_stay_on_primary() -> None:
+    """Once a repository has written, its lookups go to the primary."""
+    replica = await _replicated("code0001")
+    pool = ReplicaPool([replica])
+    await pool.check_all()
+    primary = InMemoryUrlRepository()
+    await primary.save(_mapping("code0001"))
+
+    repository = ReplicaRoutingUrlRepository(primary, pool)
+    await repository.insert_if_absent(_mapping("code0002"))
+    await repository.find_by_short_code("code0001")
+
+    assert replica.reads == 0
+    assert pool.primary_reads == 1
+
+
+@pytest.mark.asyncio
+async def test_lagging_and_failing_replicas_leave_rotation() -> None:
+    """Replicas over the lag limit or raising errors are skipped until they recover."""
+    lagging = await _replicated("code0001")
+    failing = await _replicated("code0001")
+    pool = ReplicaPool([lagging, failing], max_lag_seconds=5)
+    await pool.check_all()
+
+    lagging.lag = 30
+    failing.error = ConnectionError("connection refused")
+    await pool.check_all()
+    assert pool.choose() is None
+
+    lagging.lag = 0
+    await pool.check_all()
+    assert pool.choose() is lagging
+
+
+@pytest.mark.asyncio
+async def test_replica_error_falls_back_to_primary() -> None:
+    """A lookup that fails on a replica is answered by the primary."""
+    replica = await _replicated("code0001")
+    pool = ReplicaPool([replica])
+    await pool.check_all()
+    replica.error = ConnectionError("connection reset")
+    primary = InMemoryUrlRepository()
+    await primary.save(_mapping("code0001"))
+
+    repository = ReplicaRoutingUrlRepository(primary, pool)
+
+    assert await repository.find_long_url("code0001") == "https://example.com/code0001"
+    assert not replica.healthy
+    assert replica.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_primary_error_during_miss_confirmation_is_not_blamed_on_the_replica() -> None:
+    """A primary failure while confirming a miss is raised once, and the replica stays in rotation."""
+    replica = await _replicated()
+    pool = ReplicaPool([replica])
+    await pool.check_all()
+    primary = FailingRepository()
+
+    with pytest.raises(ConnectionError):
+        await ReplicaRoutingUrlRepository(primary, pool).find_long_url("unknown1")
+
+    assert replica.healthy
+    assert primary.lookups == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_lookup_reads_only_missing_keys_from_primary() -> None:
+    """find_many_by_short_codes combines replica hits with primary reads of the rest."""
+    replica = await _replicated("code0001")
+    replica.lag = 1
+    pool = ReplicaPool([replica], max_lag_seconds=5)
+    await pool.check_all()
+    primary = InMemoryUrlRepository()
+    await primary.save(_mapping("code0001"))
+    await primary.save(_mapping("code0002"))
+
+    repository = ReplicaRoutingUrlRepository(primary, pool)
+    found = await repository.find_many_by_short_codes(["code0001", "code0002", "unknown1"])
+
+    assert set(found) == {"code0001", "code0002"}
+    assert pool.miss_confirmations == 1
@@ -0,0 +1,80 @@
+"""
+Unit tests for the short code generation strategies.
+"""
+
+import hashlib
+
+import pytest
+
+from app.adapters.in_memory_id_allocator import InMemoryIdBlockAllocator
+from app.services.short_code_generators import (
+    BASE62_ALPHABET,
+    CounterShortCodeGenerator,
+    HashShortCodeGenerator,
+)
+
+
+@pytest.mark.asyncio
+async def test_hex_hash_codes_match_legacy_codes() -> None:
+    """The default hash strategy keeps the original 8-character hex codes."""
+    long_url = "https://example.com/legacy"
+    code = await HashShortCodeGenerator().generate(long_url)
+
+    assert code == hashlib.sha256(long_url.encode()).hexdigest()[:8]
+
+
+@pytest.mark.asyncio
+async def test_base62_hash_codes_have_configured_length() -> None:
+    """Base62 hash codes use only base62 characters and the configured length."""
+    generator = HashShortCodeGenerator(length=11, alphabet="base62")
+    code = await generator.generate("https://example.com/base62")
+
+    assert len(code) == 11
+    assert set(code) <= set(BASE62_ALPHABET)
+    assert await generator.generate("https://example.com/base62") == code
+
+
+@pytest.mark.asyncio
+async def test_hash_probes_are_distinct_and_deterministic() -> None:
+    """Each probe attempt yields a different, reproducible code."""
+    generator = HashShortCodeGenerator(length=10, alphabet="base62")
+    probes = [await generator.generate("https://example.com/probe", attempt) for attempt in range(5)]
+
+    assert len(set(probes)) == 5
+    assert probes[3] == await generator.generate("https://example.com/probe", 3)
+
+
+@pytest.mark.asyncio
+async def test_counter_codes_are_unique_across_blocks() -> None:
+    """Counter codes never repeat, and blocks are leased only when exhausted."""
+    allocator = InMemoryIdBlockAllocator()
+    generator = CounterShortCodeGenerator(allocator, length=4, block_size=100)
+
+    codes = [await generator.generate("https://example.com/same") for _ in range(250)]
+
+    assert len(set(codes)) == 250
+    assert all(len(code) == 4 for code in codes)
+    assert allocator.blocks_allocated == 3
+
+
+@pytest.mark.asyncio
+async def test_counter_workers_lease_disjoint_blocks() -> None:
+    """Two workers sharing an allocator never generate the same code."""
+    allocator = InMemoryIdBlockAllocator()
+    worker_a = CounterShortCodeGenerator(allocator, length=5, block_size=10)
+    worker_b = CounterShortCodeGenerator(allocator, length=5, block_size=10)
+
+    codes = []
+    for _ in range(30):
+        codes.append(await worker_a.generate("https://a.com"))
+        codes.append(await worker_b.generate("https://b.com"))
+
+    assert len(set(codes)) == 60
+
+
+def test_invalid_length_is_rejected() -> None:
+    """Codes must fit the short_code column."""
+    with pytest.raises(ValueError):
+        HashShortCodeGenerator(length=17)
+    with pytest.raises(ValueError):
+        CounterShortCodeGenerator(InMemoryIdBlockAllocator(), length=0)
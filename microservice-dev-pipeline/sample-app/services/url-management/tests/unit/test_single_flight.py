@@ -0,0 +1,117 @@
+"""
+Unit tests for single-flight lookup coalescing.
+
+Uses a repository whose lookups block on an event, so that concurrent
+callers are guaranteed to overlap.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+import pytest
+
+from app.adapters.in_memory_repository import InMemoryUrlRepository
+from app.adapters.single_flight import SingleFlight, SingleFlightUrlRepository
+from app.models.url_mapping import UrlMapping
+
+
+class GatedRepository(InMemoryUrlRepository):
+    """In-memory repository whose long URL lookups wait for a gate and can fail."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = asyncio.Event()
+        self.lookups = 0
+        self.error: Optional[Exception] = None
+
+    async def find_long_url(self, short_code: str):
+        self.lookups += 1
+        await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return await super().find_long_url(short_code)
+
+
+@pytest.fixture
+async def inner() -> GatedRepository:
+    """Provide a gated repository holding one mapping."""
+    repository = GatedRepository()
+    await repository.save(
+        UrlMapping(
+            short_code="viral001",
+            long_url="https://example.com/viral",
+            created_at=datetime.now(timezone.utc),
+        )
+    )
+    return repository
+
+
+async def _resolve_concurrently(inner: GatedRepository, single_flight: SingleFlight, count: int):
+    tasks = [
+        asyncio.create_task(SingleFlightUrlRepository(inner, single_flight).find_long_url("viral001"))
+        for _ in range(count)
+    ]
+    await asyncio.sleep(0)
+    inner.gate.set()
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_call(inner: GatedRepository) -> None:
+    """Concurrent lookups of the same code reach the repository once."""
+    single_flight = SingleFlight()
+
+    results = await _resolve_concurrently(inner, single_flight, 50)
+
+    assert results == ["https://example.com/viral"] * 50
+    assert inner.lookups == 1
+    assert single_flight.stats() == {"leaders": 1, "coalesced": 49, "inflight": 0}
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared(inner: GatedRepository) -> None:
+    """Followers receive the leader's error."""
+    single_flight = SingleFlight()
+    inner.error = ConnectionError("database unavailable")
+
+    results = await _resolve_concurrently(inner, single_flight, 5)
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert inner.lookups == 1
+
+
+@pytest.mark.asyncio
+async def test_sequential_lookups_are_not_coalesced(inner: GatedRepository) -> None:
+    """Once a call has finished, the next lookup starts a new one."""
+    single_flight = SingleFlight()
+    inner.gate.set()
+    repository = SingleFlightUrlRepository(inner, single_flight)
+
+    await repository.find_long_url("viral001")
+    await repository.find_long_url("viral001")
+
+    assert inner.lookups == 2
+    assert single_flight.coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_hands_over_to_follower(inner: GatedRepository) -> None:
+    """A follower of a cancelled leader retries instead of being cancelled."""
+    single_flight = SingleFlight()
+    leader = asyncio.create_task(
+        SingleFlightUrlRepository(inner, single_flight).find_long_url("viral001")
+    )
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(
+        SingleFlightUrlRepository(inner, single_flight).find_long_url("viral001")
+    )
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    inner.gate.set()
+
+    assert await follower == "https://example.com/viral"
+    assert leader.cancelled()
+    assert single_flight.leaders == 2
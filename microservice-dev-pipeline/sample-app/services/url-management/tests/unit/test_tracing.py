@@ -0,0 +1,158 @@
+"""
+Unit tests for span recording and trace context propagation.
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import pytest
+
+from architecture.contracts.common import UrlAccessedEvent
+from architecture.contracts.url_management_service import ShortenUrlRequest
+
+from app.adapters.aggregating_broker import AggregatingBroker
+from app.adapters.buffered_broker import BufferedBroker
+from app.adapters.in_memory_broker import InMemoryBroker
+from app.adapters.in_memory_repository import InMemoryUrlRepository
+from app.adapters.rabbitmq_broker import RabbitMQBroker
+from app.exceptions.url_exceptions import UrlNotFoundError
+from app.adapters.spill_journal import SpillJournal
+from app.services.url_service import UrlManagementService
+from app.tracing import SpanContext, parse_traceparent, tracer
+
+
+@pytest.fixture
+def span_file(tmp_path: Path) -> Iterator[Path]:
+    """Enable tracing into a temporary JSON lines file for one test."""
+    path = tmp_path / "spans.jsonl"
+    tracer.configure("url-management", str(path))
+    yield path
+    tracer.shutdown()
+
+
+def _access() -> UrlAccessedEvent:
+    return UrlAccessedEvent(
+        short_code="abc12345", long_url="https://example.com", accessed_at=datetime.now(timezone.utc)
+    )
+
+
+def _spans(path: Path) -> Dict[str, Dict[str, object]]:
+    tracer.shutdown()  # flushes the exporter
+    lines: List[str] = path.read_text().splitlines()
+    return {span["name"]: span for span in map(json.loads, lines)}
+
+
+def test_traceparent_round_trip() -> None:
+    """A span context survives formatting and parsing; malformed values are ignored."""
+    context = SpanContext("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True)
+
+    parsed = parse_traceparent(context.traceparent)
+
+    assert context.traceparent == "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    assert (parsed.trace_id, parsed.span_id, parsed.sampled) == (context.trace_id, context.span_id, True)
+    assert parse_traceparent(context.traceparent.encode()).span_id == context.span_id
+    assert parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent(None) is None
+
+
+def test_disabled_tracer_records_nothing() -> None:
+    """Without an export path spans are no-ops and no context is propagated."""
+    with tracer.start_span("resolve") as span:
+        span.set_attribute("found", True)
+        assert tracer.current_traceparent() is None
+        assert RabbitMQBroker._trace_headers() is None
+
+
+def test_nested_spans_share_trace(span_file: Path) -> None:
+    """Spans opened inside another become its children, and errors are recorded."""
+    with pytest.raises(RuntimeError):
+        with tracer.start_span("resolve", attributes={"short_code": "abc12345"}):
+            with tracer.start_span("publish"):
+                raise RuntimeError("broker down")
+
+    spans = _spans(span_file)
+
+    assert spans["publish"]["trace_id"] == spans["resolve"]["trace_id"]
+    assert spans["publish"]["parent_span_id"] == spans["resolve"]["span_id"]
+    assert spans["resolve"]["parent_span_id"] is None
+    assert spans["publish"]["status"] == "error"
+    assert spans["resolve"]["attributes"]["short_code"] == "abc12345"
+    assert spans["resolve"]["service"] == "url-management"
+
+
+def test_message_headers_carry_publish_span(span_file: Path) -> None:
+    """Messages built inside a span carry its traceparent and the publish time."""
+    with tracer.start_span("publish") as span:
+        message = RabbitMQBroker._build_message(
+            ShortenUrlRequest(long_url="https://example.com"), RabbitMQBroker._trace_headers()
+        )
+
+    assert message.headers["traceparent"] == span.context.traceparent
+    assert float(message.headers["x-published-at"]) >= span.start_time
+
+
+@pytest.mark.asyncio
+async def test_background_publishes_carry_the_trace_they_were_published_in(
+    span_file: Path, tmp_path: Path
+) -> None:
+    """Buffered, aggregated and journaled events keep the traceparent of the request that published them."""
+    inner = InMemoryBroker()
+    buffered = BufferedBroker(inner, max_queue_size=100, flush_size=10, flush_interval_seconds=0.01)
+    aggregating = AggregatingBroker(InMemoryBroker(), window_seconds=10)
+    journal = SpillJournal(str(tmp_path / "events.journal"))
+    with tracer.start_span("resolve") as span:
+        await buffered.publish(_access(), "url.accessed")
+        await aggregating.publish(_access(), "url.accessed")
+        journal.append([(_access(), "url.accessed")])
+    await buffered.close()
+
+    replayed = InMemoryBroker()
+    await journal.replay(replayed.publish_batch, chunk_size=10)
+    await journal.close()
+    await aggregating.flush()
+    published = [
+        inner.published_events[0][0],
+        aggregating._inner.published_events[0][0],  # type: ignore[attr-defined]
+        replayed.published_events[0][0],
+    ]
+    with tracer.start_span("publish_batch"):
+        headers = [RabbitMQBroker._trace_headers(published_event) for published_event in published]
+
+    assert [header["traceparent"] for header in headers] == [span.context.traceparent] * 3
+    assert "traceparent" not in published[0].model_dump_json()
+    await aggregating.close()
+
+
+def test_unsampled_traces_propagate_without_export(tmp_path: Path) -> None:
+    """A sample rate of zero still propagates context but exports no spans."""
+    path = tmp_path / "spans.jsonl"
+    tracer.configure("url-management", str(path), sample_rate=0.0)
+    with tracer.start_span("resolve"):
+        traceparent = tracer.current_traceparent()
+
+    assert traceparent is not None and traceparent.endswith("-00")
+    assert _spans(path) == {}
+
+
+@pytest.mark.asyncio
+async def test_resolve_is_traced(span_file: Path) -> None:
+    """Resolving a short code records a resolve span, including misses."""
+    service = UrlManagementService(
+        repository=InMemoryUrlRepository(), message_broker=InMemoryBroker(), base_url="http://short.url"
+    )
+    created = await service.shorten_url(ShortenUrlRequest(long_url="https://example.com"))
+    await service.resolve_long_url(created.short_code)
+    with pytest.raises(UrlNotFoundError):
+        await service.resolve_long_url("missing1")
+
+    tracer.shutdown()
+    lines = [json.loads(line) for line in span_file.read_text().splitlines()]
+
+    assert [(span["name"], span["attributes"]["found"]) for span in lines] == [
+        ("resolve", True),
+        ("resolve", False),
+    ]
+    assert lines[0]["attributes"]["short_code"] == created.short_code
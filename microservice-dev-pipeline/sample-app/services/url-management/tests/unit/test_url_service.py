@@ -4,14 +4,31 @@ Unit tests for UrlManagementService.
 Uses in-memory adapters to test business logic without external dependencies.
 """
 
+import logging
+from datetime import datetime, timezone
+
 import pytest
 
 from architecture.contracts.common import UrlAccessedEvent
-from architecture.contracts.url_management_service import ShortenUrlRequest
+from architecture.contracts.url_management_service import (
+    BatchShortenUrlRequest,
+    ShortenUrlRequest,
+)
 
 from app.adapters.in_memory_broker import InMemoryBroker
+from app.adapters.in_memory_id_allocator import InMemoryIdBlockAllocator
 from app.adapters.in_memory_repository import InMemoryUrlRepository
-from app.exceptions.url_exceptions import InvalidUrlError, UrlNotFoundError
+from app.exceptions.url_exceptions import (
+    BatchTooLargeError,
+    InvalidUrlError,
+    ShortCodeCollisionError,
+    UrlNotFoundError,
+)
+from app.models.url_mapping import UrlMapping
+from app.services.short_code_generators import (
+    CounterShortCodeGenerator,
+    HashShortCodeGenerator,
+)
 from app.services.url_service import UrlManagementService
 
 
@@ -122,3 +139,200 @@ async def test_different_urls_produce_different_codes(service: UrlManagementServ
     result2 = await service.shorten_url(ShortenUrlRequest(long_url="https://example.com/two"))
 
     assert result1.short_code != result2.short_code
+
+
+@pytest.mark.asyncio
+async def test_shorten_reports_created_then_existing(service: UrlManagementService) -> None:
+    """Test that the first shorten creates the mapping and the second finds it."""
+    request = ShortenUrlRequest(long_url="https://example.com/status")
+
+    first, first_created = await service.shorten_url_with_status(request)
+    second, second_created = await service.shorten_url_with_status(request)
+
+    assert first_created is True
+    assert second_created is False
+    assert first.short_code == second.short_code
+
+
+@pytest.mark.asyncio
+async def test_batch_shorten_reports_created_and_existing(service: UrlManagementService) -> None:
+    """Test that a batch returns per-URL results in order with created/existing status."""
+    await service.shorten_url(ShortenUrlRequest(long_url="https://example.com/already"))
+
+    result = await service.shorten_urls_batch(
+        BatchShortenUrlRequest(
+            long_urls=[
+                "https://example.com/new",
+                "https://example.com/already",
+                "https://example.com/new",
+            ]
+        )
+    )
+
+    assert [item.long_url for item in result.results] == [
+        "https://example.com/new",
+        "https://example.com/already",
+        "https://example.com/new",
+    ]
+    assert [item.status for item in result.results] == ["created", "existing", "existing"]
+    assert result.results[0].short_code == result.results[2].short_code
+    resolved = await service.resolve_url(result.results[0].short_code)
+    assert resolved.long_url == "https://example.com/new"
+
+
+@pytest.mark.asyncio
+async def test_service_logs_at_info_level(
+    service: UrlManagementService, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test that the info logs of the service can be emitted (no reserved `extra` keys)."""
+    caplog.set_level(logging.INFO, logger="app.services.url_service")
+
+    result = await service.shorten_urls_batch(
+        BatchShortenUrlRequest(long_urls=["https://example.com/logged"])
+    )
+    await service.resolve_url(result.results[0].short_code)
+
+    assert "Shortened URL batch" in caplog.messages
+    assert "Resolved short URL" in caplog.messages
+
+
+@pytest.mark.asyncio
+async def test_batch_shorten_is_chunked(
+    repository: InMemoryUrlRepository, broker: InMemoryBroker
+) -> None:
+    """Test that distinct URLs are inserted in chunks of the configured size."""
+    chunk_sizes = []
+    insert_many = repository.insert_many_if_absent
+
+    async def recording_insert_many(url_mappings):
+        chunk_sizes.append(len(url_mappings))
+        return await insert_many(url_mappings)
+
+    repository.insert_many_if_absent = recording_insert_many
+    service = UrlManagementService(
+        repository=repository,
+        message_broker=broker,
+        base_url="http://short.url",
+        batch_chunk_size=2,
+    )
+
+    result = await service.shorten_urls_batch(
+        BatchShortenUrlRequest(long_urls=[f"https://example.com/{i}" for i in range(5)])
+    )
+
+    assert chunk_sizes == [2, 2, 1]
+    assert all(item.status == "created" for item in result.results)
+
+
+@pytest.mark.asyncio
+async def test_batch_with_invalid_url_stores_nothing(
+    service: UrlManagementService, repository: InMemoryUrlRepository
+) -> None:
+    """Test that one invalid URL rejects the whole batch before anything is stored."""
+    with pytest.raises(InvalidUrlError):
+        await service.shorten_urls_batch(
+            BatchShortenUrlRequest(long_urls=["https://example.com/ok", "not-a-valid-url"])
+        )
+
+    assert await repository.find_by_long_url("https://example.com/ok") is None
+
+
+@pytest.mark.asyncio
+async def test_batch_too_large_raises_error(
+    repository: InMemoryUrlRepository, broker: InMemoryBroker
+) -> None:
+    """Test that batches above the configured maximum are rejected."""
+    service = UrlManagementService(
+        repository=repository,
+        message_broker=broker,
+        base_url="http://short.url",
+        batch_max_size=2,
+    )
+
+    with pytest.raises(BatchTooLargeError):
+        await service.shorten_urls_batch(
+            BatchShortenUrlRequest(long_urls=[f"https://example.com/{i}" for i in range(3)])
+        )
+
+
+@pytest.mark.asyncio
+async def test_short_code_collision_probes_next_code(
+    service: UrlManagementService, repository: InMemoryUrlRepository
+) -> None:
+    """Test that a code taken by another URL is skipped, idempotently."""
+    long_url = "https://example.com/collides"
+    taken_code = await HashShortCodeGenerator().generate(long_url)
+    await repository.save(
+        UrlMapping(
+            short_code=taken_code,
+            long_url="https://example.com/other",
+            created_at=datetime.now(timezone.utc),
+        )
+    )
+
+    first, created = await service.shorten_url_with_status(ShortenUrlRequest(long_url=long_url))
+    second = await service.shorten_url(ShortenUrlRequest(long_url=long_url))
+    batch = await service.shorten_urls_batch(BatchShortenUrlRequest(long_urls=[long_url]))
+
+    assert created is True
+    assert first.short_code != taken_code
+    assert second.short_code == first.short_code
+    assert batch.results[0].short_code == first.short_code
+    assert batch.results[0].status == "existing"
+    assert (await service.resolve_url(first.short_code)).long_url == long_url
+
+
+@pytest.mark.asyncio
+async def test_collision_beyond_probe_limit_raises_error(
+    repository: InMemoryUrlRepository, broker: InMemoryBroker
+) -> None:
+    """Test that running out of probes raises ShortCodeCollisionError."""
+    service = UrlManagementService(
+        repository=repository,
+        message_broker=broker,
+        base_url="http://short.url",
+        max_collision_attempts=1,
+    )
+    long_url = "https://example.com/collides"
+    await repository.save(
+        UrlMapping(
+            short_code=await HashShortCodeGenerator().generate(long_url),
+            long_url="https://example.com/other",
+            created_at=datetime.now(timezone.utc),
+        )
+    )
+
+    with pytest.raises(ShortCodeCollisionError):
+        await service.shorten_url(ShortenUrlRequest(long_url=long_url))
+
+
+@pytest.mark.asyncio
+async def test_counter_codes_are_idempotent_per_url(
+    repository: InMemoryUrlRepository, broker: InMemoryBroker
+) -> None:
+    """Test that non-deterministic generators still return the existing code for a URL."""
+    service = UrlManagementService(
+        repository=repository,
+        message_broker=broker,
+        base_url="http://short.url",
+        short_code_generator=CounterShortCodeGenerator(InMemoryIdBlockAllocator(), length=7),
+    )
+
+    first, first_created = await service.shorten_url_with_status(
+        ShortenUrlRequest(long_url="https://example.com/counter")
+    )
+    second, second_created = await service.shorten_url_with_status(
+        ShortenUrlRequest(long_url="https://example.com/counter")
+    )
+    batch = await service.shorten_urls_batch(
+        BatchShortenUrlRequest(
+            long_urls=["https://example.com/counter", "https://example.com/counter-2"]
+        )
+    )
+
+    assert (first_created, second_created) == (True, False)
+    assert len(first.short_code) == 7
+    assert second.short_code == first.short_code
+    assert [item.status for item in batch.results] == ["existing", "created"]
+    assert batch.results[0].short_code == first.short_code
+    assert batch.results[1].short_code != first.short_code
@@ -0,0 +1,139 @@
+"""
+Unit tests for the memory-mapped URL snapshot.
+
+Writes snapshot files to a temporary directory and serves lookups through
+the snapshot repository decorator around an in-memory repository.
+"""
+
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from app.adapters.in_memory_repository import InMemoryUrlRepository
+from app.adapters.url_snapshot import SnapshotUrlRepository, SnapshotWriter, UrlSnapshotIndex
+from app.models.url_mapping import UrlMapping
+
+CREATED_AT = datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingRepository(InMemoryUrlRepository):
+    """In-memory repository that counts long URL lookups."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+
+    async def find_long_url(self, short_code: str):
+        self.lookups += 1
+        return await super().find_long_url(short_code)
+
+
+def _write(path: str, short_codes) -> None:
+    writer = SnapshotWriter(path)
+    for i, short_code in enumerate(sorted(short_codes)):
+        writer.add(short_code, f"https://example.com/{short_code}/é", i + 1, CREATED_AT)
+    writer.close()
+
+
+@pytest.fixture
+def snapshot_path(tmp_path) -> str:
+    """Provide the path of a snapshot holding a few hundred mappings."""
+    path = str(tmp_path / "url_mappings.snapshot")
+    _write(path, [f"code{i:04d}" for i in range(500)] + ["a", "Zz", "max16charsxxxxxx"])
+    return path
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Provide a fake clock starting at zero."""
+    return FakeClock()
+
+
+@pytest.fixture
+def index(snapshot_path: str, clock: FakeClock):
+    """Provide an index with the snapshot file loaded, as at application startup."""
+    index = UrlSnapshotIndex(snapshot_path, check_interval_seconds=5, clock=clock)
+    index.reload_if_changed()
+    yield index
+    index.close()
+
+
+def test_lookup_finds_every_mapping(index: UrlSnapshotIndex) -> None:
+    """Every exported short code is found with its id, creation time and long URL."""
+    assert index.count == 503
+    for short_code in ["a", "Zz", "max16charsxxxxxx", "code0000", "code0499"]:
+        record = index.lookup(short_code)
+        assert record is not None
+        _, created_at, long_url = record
+        assert created_at == CREATED_AT
+        assert long_url == f"https://example.com/{short_code}/é"
+
+
+def test_lookup_misses_unknown_codes(index: UrlSnapshotIndex) -> None:
+    """Unknown, too long and non-ASCII codes are reported as missing."""
+    assert index.lookup("code9999") is None
+    assert index.lookup("") is None
+    assert index.lookup("x" * 17) is None
+    assert index.lookup("cödé") is None
+    assert index.misses == 4
+
+
+def test_writer_rejects_unsorted_input(tmp_path) -> None:
+    """Short codes must be added in ascending byte order."""
+    writer = SnapshotWriter(str(tmp_path / "bad.snapshot"))
+    writer.add("b", "https://example.com/b", 1, CREATED_AT)
+    with pytest.raises(ValueError):
+        writer.add("a", "https://example.com/a", 2, CREATED_AT)
+
+
+def test_replaced_snapshot_is_reloaded(
+    index: UrlSnapshotIndex, snapshot_path: str, clock: FakeClock
+) -> None:
+    """A new snapshot file is picked up after the check interval."""
+    assert index.lookup("fresh001") is None
+
+    _write(snapshot_path, ["fresh001"])
+    assert index.lookup("fresh001") is None
+
+    clock.now = 6
+    assert index.lookup("fresh001") is not None
+    assert index.lookup("code0000") is None
+    assert index.reloads == 2
+
+
+def test_missing_file_serves_nothing(tmp_path) -> None:
+    """Without a snapshot file every lookup misses."""
+    index = UrlSnapshotIndex(str(tmp_path / "absent.snapshot"))
+    assert index.lookup("code0000") is None
+    assert not os.path.exists(tmp_path / "absent.snapshot")
+
+
+@pytest.mark.asyncio
+async def test_repository_serves_snapshot_and_falls_back(index: UrlSnapshotIndex) -> None:
+    """Snapshot hits skip the wrapped repository; newer codes are read from it."""
+    inner = CountingRepository()
+    await inner.save(
+        UrlMapping(short_code="newer001", long_url="https://example.com/newer", created_at=CREATED_AT)
+    )
+    repository = SnapshotUrlRepository(inner, index)
+
+    assert await repository.find_long_url("code0042") == "https://example.com/code0042/é"
+    assert inner.lookups == 0
+
+    assert await repository.find_long_url("newer001") == "https://example.com/newer"
+    assert inner.lookups == 1
+
+    found = await repository.find_many_by_short_codes(["code0001", "newer001", "unknown1"])
+    assert set(found) == {"code0001", "newer001"}
+    assert found["code0001"].created_at == CREATED_AT
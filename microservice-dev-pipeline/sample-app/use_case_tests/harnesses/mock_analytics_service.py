@@ -1,12 +1,13 @@
 """
 Mock implementation of IAnalyticsService for use case testing.
 
-Uses in-memory storage and subscribes to UrlAccessedEvent via MockEventBus.
+Uses in-memory storage and subscribes to UrlAccessedEvent and
+UrlAccessCountedEvent via MockEventBus.
 """
 
 from typing import Dict
 
-from architecture.contracts.common import UrlAccessedEvent
+from architecture.contracts.common import UrlAccessCountedEvent, UrlAccessedEvent
 from architecture.contracts.analytics_service import (
     IAnalyticsService,
     UrlAccessStatsResponse,
@@ -24,21 +25,33 @@ class MockAnalyticsService(IAnalyticsService):
 
         # Subscribe to events
         self._event_bus.subscribe(UrlAccessedEvent, self._handle_url_accessed_sync)
+        self._event_bus.subscribe(UrlAccessCountedEvent, self._handle_url_access_counted_sync)
 
-    def _handle_url_accessed_sync(self, event: UrlAccessedEvent):
-        """Synchronous handler for MockEventBus dispatch."""
-        if event.short_code in self._access_stats:
-            self._access_stats[event.short_code]["access_count"] += 1
+    def _increment(self, short_code: str, long_url: str, count: int) -> None:
+        if short_code in self._access_stats:
+            self._access_stats[short_code]["access_count"] += count
         else:
-            self._access_stats[event.short_code] = {
-                "long_url": event.long_url,
-                "access_count": 1,
+            self._access_stats[short_code] = {
+                "long_url": long_url,
+                "access_count": count,
             }
 
+    def _handle_url_accessed_sync(self, event: UrlAccessedEvent):
+        """Synchronous handler for MockEventBus dispatch."""
+        self._increment(event.short_code, event.long_url, 1)
+
+    def _handle_url_access_counted_sync(self, event: UrlAccessCountedEvent):
+        """Synchronous handler for MockEventBus dispatch."""
+        self._increment(event.short_code, event.long_url, event.count)
+
     async def handle_url_accessed(self, event: UrlAccessedEvent) -> None:
         """Async interface method — in mock, already handled via event bus subscription."""
         self._handle_url_accessed_sync(event)
 
+    async def handle_url_access_counted(self, event: UrlAccessCountedEvent) -> None:
+        """Async interface method — in mock, already handled via event bus subscription."""
+        self._handle_url_access_counted_sync(event)
+
     async def get_top_urls(self, limit: int = 10) -> TopUrlsResponse:
         """Return the most accessed URLs ranked by access count descending."""
         sorted_stats = sorted(
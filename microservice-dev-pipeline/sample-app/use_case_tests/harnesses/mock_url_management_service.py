@@ -11,6 +11,9 @@ from typing import Dict
 
 from architecture.contracts.common import UrlAccessedEvent
 from architecture.contracts.url_management_service import (
+    BatchShortenUrlItem,
+    BatchShortenUrlRequest,
+    BatchShortenUrlResponse,
     IUrlManagementService,
     ShortenUrlRequest,
     ShortenUrlResponse,
@@ -57,6 +60,24 @@ class MockUrlManagementService(IUrlManagementService):
             long_url=long_url,
         )
 
+    async def shorten_urls_batch(
+        self, request: BatchShortenUrlRequest
+    ) -> BatchShortenUrlResponse:
+        """Shorten several URLs, reporting whether each mapping was created."""
+        results = []
+        for long_url in request.long_urls:
+            status = "existing" if long_url in self._reverse_mappings else "created"
+            shortened = await self.shorten_url(ShortenUrlRequest(long_url=long_url))
+            results.append(
+                BatchShortenUrlItem(
+                    short_code=shortened.short_code,
+                    short_url=shortened.short_url,
+                    long_url=long_url,
+                    status=status,
+                )
+            )
+        return BatchShortenUrlResponse(results=results)
+
     async def resolve_url(self, short_code: str) -> ResolveUrlResponse:
         """Resolve a short code to the original long URL and publish access event."""
         if short_code not in self._url_mappings: